@@ -0,0 +1,245 @@
+"""
+Módulo: archivo_ventas.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y mueve las ventas históricas, junto con sus
+arrepentimientos, de las tablas 'ventas' y 'arrepentimientos' a 'ventas_archivo' y
+'arrepentimientos_archivo'. Así la tabla de ventas en uso conserva solo las ventas recientes y
+las consultas por cliente no se vuelven más lentas a medida que se acumula historia.
+
+Se archivan las ventas anuladas con más de DIAS_ANULADAS días y las cerradas con más de
+DIAS_DE_HISTORIAL días. Las ventas activas nunca se archivan. El traslado se hace por lotes de
+'tamanio_lote' ventas, con una transacción corta por lote (copia, borrado y confirmación): si el
+proceso se interrumpe, basta con volver a ejecutarlo.
+
+Con MySQL las tablas de archivo están particionadas por mes de compra. Antes de trasladar, el
+archivador agrega las particiones mensuales que falten a partir de la última existente; los
+meses anteriores a ella quedan en la primera partición que los cubre.
+
+Las consultas de ventas leen el archivo solo si se les pide ('incluir_archivo=True' en
+'ventas.consultar_ventas').
+
+Uso:
+    python archivo_ventas.py --dias 365 --dias-anuladas 30 --lote 1000
+"""
+
+import argparse
+import time
+from datetime import date
+
+from conexion_base_de_datos import motor_actual, obtener_conexion
+from modelos import Venta
+
+
+# Antigüedad, en días, a partir de la cual se archivan las ventas cerradas y las anuladas.
+DIAS_DE_HISTORIAL = 365
+DIAS_ANULADAS = 30
+
+TAMANIO_LOTE_ARCHIVO = 1000
+
+TABLAS_PARTICIONADAS = ("ventas_archivo", "arrepentimientos_archivo")
+
+# Consultas de este módulo; 'verificar_planes' revisa sus planes de ejecución.
+_ACTUALIZAR_DNI = "UPDATE ventas_archivo SET dni_cliente = %s WHERE dni_cliente = %s;"
+_CONSULTA_RANGO = """
+    SELECT MIN(fecha_de_compra), MAX(fecha_de_compra) FROM ventas
+    WHERE (estado_de_venta = 'Anulada' AND fecha_de_compra < NOW() - INTERVAL %s DAY)
+       OR (estado_de_venta = 'Cerrada' AND fecha_de_compra < NOW() - INTERVAL %s DAY);
+"""
+_CONSULTA_LOTE = """
+    SELECT id_venta FROM ventas
+    WHERE estado_de_venta = %s AND fecha_de_compra < NOW() - INTERVAL %s DAY
+    ORDER BY fecha_de_compra
+    LIMIT %s
+    FOR UPDATE;
+"""
+
+
+def _nombre_particion(mes):
+    return f"p{mes.year:04d}{mes.month:02d}"
+
+
+def _mes_siguiente(mes):
+    return date(mes.year + mes.month // 12, mes.month % 12 + 1, 1)
+
+
+def particiones_de_archivo(tabla="ventas_archivo", conexion=None):
+    """
+    Devuelve las particiones mensuales de una tabla de archivo (solo MySQL).
+
+    Returns:
+        list[str]: Nombres de las particiones en orden ('p202501', ...), sin 'p_futuro'.
+    """
+    if motor_actual() != "mysql":
+        return []
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        cursor.execute("""
+            SELECT partition_name FROM information_schema.partitions
+            WHERE table_schema = DATABASE() AND table_name = %s AND partition_name <> 'p_futuro'
+            ORDER BY partition_ordinal_position;
+        """, (tabla,))
+        return [fila[0] for fila in cursor.fetchall()]
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+def asegurar_particiones(desde, hasta, conexion):
+    """
+    Agrega a las tablas de archivo una partición por cada mes entre 'desde' y 'hasta' (inclusive)
+    posterior a la última partición existente. Con SQLite no hace nada.
+
+    Args:
+        desde (date | datetime), hasta (date | datetime): Meses extremos a cubrir.
+
+    Returns:
+        int: Particiones agregadas por tabla.
+    """
+    if motor_actual() != "mysql":
+        return 0
+
+    existentes = particiones_de_archivo(conexion=conexion)
+    mes = date(desde.year, desde.month, 1)
+    if existentes:
+        ultima = existentes[-1]
+        mes = max(mes, _mes_siguiente(date(int(ultima[1:5]), int(ultima[5:7]), 1)))
+
+    nuevas = []
+    while mes <= date(hasta.year, hasta.month, 1):
+        siguiente = _mes_siguiente(mes)
+        nuevas.append(f"PARTITION {_nombre_particion(mes)} VALUES LESS THAN ('{siguiente.isoformat()}')")
+        mes = siguiente
+    if not nuevas:
+        return 0
+
+    cursor = conexion.cursor()
+    try:
+        for tabla in TABLAS_PARTICIONADAS:
+            # Las filas que ya estuvieran en 'p_futuro' se reparten entre las particiones nuevas.
+            cursor.execute(f"""
+                ALTER TABLE {tabla} REORGANIZE PARTITION p_futuro INTO (
+                    {', '.join(nuevas)}, PARTITION p_futuro VALUES LESS THAN (MAXVALUE));
+            """)
+    finally:
+        cursor.close()
+    return len(nuevas)
+
+
+def actualizar_dni_archivado(conexion, dni_anterior, dni_nuevo):
+    """
+    Cambia el DNI de las ventas archivadas de un cliente, dentro de la transacción en curso.
+    Las tablas de archivo no tienen claves foráneas que propaguen el cambio, como en 'ventas'.
+    """
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(_ACTUALIZAR_DNI, (dni_nuevo, dni_anterior))
+    finally:
+        cursor.close()
+
+
+def _consulta_arrepentimientos(cantidad):
+    """Arrepentimientos de 'cantidad' ventas, por ID, con la fecha de compra de su venta."""
+    return f"""
+        SELECT a.id_arrepentimiento, a.fecha_hora_arrepentimiento, a.motivo_arrepentimiento, a.id_venta,
+               v.fecha_de_compra
+        FROM arrepentimientos a
+        JOIN ventas v ON v.id_venta = a.id_venta
+        WHERE a.id_venta IN ({", ".join(["%s"] * cantidad)})
+    """
+
+
+def _archivar_lote(cursor, estado, dias, tamanio_lote):
+    """Traslada un lote de ventas con el estado y la antigüedad indicados. Devuelve (ventas, arrepentimientos)."""
+    cursor.execute(_CONSULTA_LOTE, (estado, dias, tamanio_lote))
+    ids = [fila[0] for fila in cursor.fetchall()]
+    if not ids:
+        return 0, 0
+
+    marcadores = ", ".join(["%s"] * len(ids))
+    cursor.execute(f"""
+        INSERT INTO arrepentimientos_archivo
+            (id_arrepentimiento, fecha_hora_arrepentimiento, motivo_arrepentimiento, id_venta, fecha_de_compra)
+        {_consulta_arrepentimientos(len(ids))}
+    """, ids)
+    arrepentimientos = cursor.rowcount
+    cursor.execute(f"""
+        INSERT INTO ventas_archivo ({Venta.COLUMNAS})
+        SELECT {Venta.COLUMNAS} FROM ventas WHERE id_venta IN ({marcadores});
+    """, ids)
+    cursor.execute(f"DELETE FROM arrepentimientos WHERE id_venta IN ({marcadores});", ids)
+    cursor.execute(f"DELETE FROM ventas WHERE id_venta IN ({marcadores});", ids)
+    return len(ids), arrepentimientos
+
+
+def archivar_ventas(dias=DIAS_DE_HISTORIAL, dias_anuladas=DIAS_ANULADAS, tamanio_lote=TAMANIO_LOTE_ARCHIVO,
+                    pausa=0.0, conexion=None):
+    """
+    Traslada al archivo las ventas anuladas y cerradas antiguas, con sus arrepentimientos.
+
+    Args:
+        dias (int): Antigüedad mínima de las ventas cerradas a archivar.
+        dias_anuladas (int): Antigüedad mínima de las ventas anuladas a archivar.
+        tamanio_lote (int): Ventas trasladadas por transacción.
+        pausa (float): Segundos de espera entre lotes, para dar paso a las ventas en curso.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        dict: Ventas y arrepentimientos archivados.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    archivados = {"ventas": 0, "arrepentimientos": 0}
+
+    try:
+        cursor.execute(_CONSULTA_RANGO, (dias_anuladas, dias))
+        desde, hasta = cursor.fetchone()
+        if desde is None:
+            return archivados
+        asegurar_particiones(desde, hasta, conexion)
+
+        for estado, antiguedad in (("Anulada", dias_anuladas), ("Cerrada", dias)):
+            while True:
+                ventas, arrepentimientos = _archivar_lote(cursor, estado, antiguedad, tamanio_lote)
+                conexion.commit()
+                archivados["ventas"] += ventas
+                archivados["arrepentimientos"] += arrepentimientos
+                if ventas < tamanio_lote:
+                    break
+                if pausa:
+                    time.sleep(pausa)
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    return archivados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Archiva las ventas cerradas y anuladas antiguas.")
+    parser.add_argument("--dias", type=int, default=DIAS_DE_HISTORIAL,
+                        help="Antigüedad mínima, en días, de las ventas cerradas a archivar.")
+    parser.add_argument("--dias-anuladas", type=int, default=DIAS_ANULADAS,
+                        help="Antigüedad mínima, en días, de las ventas anuladas a archivar.")
+    parser.add_argument("--lote", type=int, default=TAMANIO_LOTE_ARCHIVO, help="Ventas por transacción.")
+    parser.add_argument("--pausa", type=float, default=0.0, help="Segundos de espera entre lotes.")
+    argumentos = parser.parse_args()
+
+    try:
+        resultado = archivar_ventas(argumentos.dias, argumentos.dias_anuladas, argumentos.lote, argumentos.pausa)
+    except Exception as e:
+        print(f"Error al archivar las ventas: {e}")
+        raise SystemExit(1)
+
+    print(f"Ventas archivadas: {resultado['ventas']}. Arrepentimientos archivados: {resultado['arrepentimientos']}.")
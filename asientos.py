@@ -0,0 +1,285 @@
+"""
+Módulo: asientos.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y administra el cupo de asientos de cada
+destino, para que las ventas no superen la capacidad disponible.
+
+El cupo de un destino se reparte en tramos (filas de la tabla 'asientos'). Cada venta descuenta
+sus asientos de un tramo elegido al azar con un UPDATE condicional
+('... SET disponibles = disponibles - n WHERE ... AND disponibles >= n'), que la base de datos
+evalúa y aplica de forma atómica: nunca se vende un asiento de más. Como cada venta bloquea solo
+la fila de su tramo, hasta TRAMOS_POR_DESTINO ventas del mismo destino avanzan a la vez, en lugar
+de esperar todas detrás de una única fila.
+
+Si el tramo elegido no alcanza (el destino está por agotarse), se bloquean todos los tramos del
+destino y los asientos se toman de varios; cada UPDATE se comprueba, y si otra transacción tomó
+los asientos de un tramo entre la lectura y el descuento, se devuelven los ya tomados y se vuelve
+a leer. Un destino sin tramos no tiene límite de asientos, y se recuerda por TTL_SIN_CUPO segundos
+para que sus ventas no consulten los tramos cada vez.
+
+Las funciones 'reservar_asientos', 'reservar_asientos_lote' y 'liberar_asientos' trabajan dentro
+de la transacción de quien las llama (una venta, un lote importado o una anulación) y no
+confirman: si la operación se deshace, el cupo vuelve a quedar como estaba.
+"""
+
+import random
+import threading
+import time
+
+from conexion_base_de_datos import obtener_conexion
+from sentencias import ejecutar, obtener_todos, obtener_uno
+
+
+# Cantidad de tramos en que se reparte el cupo de un destino.
+TRAMOS_POR_DESTINO = 8
+
+# Veces que se vuelven a leer los tramos si otra transacción los modificó antes del descuento.
+INTENTOS_DE_REPARTO = 3
+
+# Segundos durante los cuales se recuerda que un destino no tiene límite de asientos, para no
+# consultar sus tramos en cada venta. Un cupo asignado desde otro proceso se aplica, como mucho,
+# después de este tiempo; 'asignar_asientos' lo aplica enseguida en el proceso que lo llama.
+TTL_SIN_CUPO = 30
+
+# Consultas de este módulo; 'verificar_planes' revisa sus planes de ejecución.
+_CONSULTA_DISPONIBLES = "SELECT COUNT(*), SUM(disponibles) FROM asientos WHERE id_destino = %s;"
+
+_bloqueo = threading.Lock()
+_sin_cupo = {}
+_estadisticas = {"reservas": 0, "reservas_repartidas": 0, "reservas_en_lote": 0, "rechazos": 0, "liberaciones": 0}
+
+
+class AsientosInsuficientesError(Exception):
+    """Se lanza cuando un destino no tiene asientos suficientes para una venta."""
+
+    def __init__(self, id_destino, solicitados, disponibles):
+        super().__init__(f"El destino con ID {id_destino} tiene {disponibles} asiento(s) disponible(s) "
+                         f"y se solicitaron {solicitados}.")
+        self.id_destino = id_destino
+        self.solicitados = solicitados
+        self.disponibles = disponibles
+
+
+def _contar(clave):
+    with _bloqueo:
+        _estadisticas[clave] += 1
+
+
+def _sin_limite(id_destino):
+    """Indica si hace menos de TTL_SIN_CUPO segundos se vio que el destino no tiene tramos."""
+    with _bloqueo:
+        visto_en = _sin_cupo.get(id_destino)
+        return visto_en is not None and time.monotonic() - visto_en < TTL_SIN_CUPO
+
+
+def _recordar_sin_limite(id_destino):
+    with _bloqueo:
+        _sin_cupo[id_destino] = time.monotonic()
+
+
+def _descontar(conexion, id_destino, tramos, cantidad):
+    """
+    Toma 'cantidad' asientos de los tramos leídos con 'tramos_de_destino', empezando por los que
+    tienen más asientos.
+
+    Returns:
+        list[tuple] | None: (tramo, asientos tomados) de cada tramo usado, o None si algún tramo
+        ya no tenía los asientos leídos; en ese caso se devuelven los asientos ya tomados.
+    """
+    tomados_por_tramo = []
+    for tramo, disponibles_en_tramo in sorted(tramos, key=lambda fila: fila[1], reverse=True):
+        if not cantidad:
+            break
+        tomados = min(cantidad, disponibles_en_tramo)
+        # Con SQLite el 'FOR UPDATE' no bloquea los tramos: otra transacción pudo tomarlos
+        # después de leerlos, y entonces el UPDATE condicional no modifica ninguna fila.
+        if ejecutar(conexion, "reservar_asientos", (tomados, id_destino, tramo, tomados)).rowcount != 1:
+            for tramo_usado, cantidad_tomada in tomados_por_tramo:
+                ejecutar(conexion, "liberar_asientos", (cantidad_tomada, id_destino, tramo_usado))
+            return None
+        tomados_por_tramo.append((tramo, tomados))
+        cantidad -= tomados
+    return tomados_por_tramo
+
+
+def reservar_asientos(conexion, id_destino, cantidad):
+    """
+    Descuenta asientos del cupo de un destino, dentro de la transacción en curso (sin confirmar).
+
+    Returns:
+        bool: True si se descontaron asientos, False si el destino no tiene límite de asientos.
+
+    Raises:
+        AsientosInsuficientesError: Si los asientos disponibles no alcanzan. La transacción
+            queda sin cambios en el cupo; quien llama decide si deshacerla.
+    """
+    if _sin_limite(id_destino):
+        return False
+
+    tramo = random.randrange(TRAMOS_POR_DESTINO)
+    if ejecutar(conexion, "reservar_asientos", (cantidad, id_destino, tramo, cantidad)).rowcount == 1:
+        _contar("reservas")
+        return True
+
+    # El tramo elegido no alcanza (o no existe): se bloquean todos los tramos del destino,
+    # siempre en el mismo orden, y se reparten los asientos entre ellos.
+    for _ in range(INTENTOS_DE_REPARTO):
+        tramos = obtener_todos(conexion, "tramos_de_destino", (id_destino,))
+        if not tramos:
+            _recordar_sin_limite(id_destino)
+            return False
+        disponibles = sum(fila[1] for fila in tramos)
+        if disponibles < cantidad:
+            break
+        if _descontar(conexion, id_destino, tramos, cantidad) is not None:
+            _contar("reservas_repartidas")
+            return True
+    else:
+        disponibles = sum(fila[1] for fila in obtener_todos(conexion, "tramos_de_destino", (id_destino,)))
+
+    _contar("rechazos")
+    raise AsientosInsuficientesError(id_destino, cantidad, disponibles)
+
+
+def reservar_asientos_lote(conexion, id_destino, cantidades):
+    """
+    Descuenta del cupo de un destino los asientos de varias ventas a la vez, dentro de la
+    transacción en curso (sin confirmar). Se bloquean todos los tramos del destino una sola vez y
+    las ventas se aceptan en el orden dado mientras alcancen los asientos.
+
+    Args:
+        cantidades (list[int]): Tickets de cada venta.
+
+    Returns:
+        tuple: (lista con None por cada venta aceptada o un AsientosInsuficientesError por cada
+        rechazada, tramo del que se tomaron los asientos o None si no se tomó ninguno).
+    """
+    if _sin_limite(id_destino):
+        return [None] * len(cantidades), None
+
+    for _ in range(INTENTOS_DE_REPARTO):
+        tramos = obtener_todos(conexion, "tramos_de_destino", (id_destino,))
+        if not tramos:
+            _recordar_sin_limite(id_destino)
+            return [None] * len(cantidades), None
+
+        disponibles = sum(fila[1] for fila in tramos)
+        errores = []
+        for cantidad in cantidades:
+            if cantidad <= disponibles:
+                errores.append(None)
+                disponibles -= cantidad
+            else:
+                errores.append(AsientosInsuficientesError(id_destino, cantidad, disponibles))
+
+        restantes = sum(cantidad for cantidad, error in zip(cantidades, errores) if error is None)
+        tomados_por_tramo = _descontar(conexion, id_destino, tramos, restantes)
+        if tomados_por_tramo is not None:
+            break
+    else:
+        # Los tramos siguen cambiando entre la lectura y el descuento: se rechaza el lote completo.
+        tomados_por_tramo = []
+        disponibles = sum(fila[1] for fila in obtener_todos(conexion, "tramos_de_destino", (id_destino,)))
+        errores = [AsientosInsuficientesError(id_destino, cantidad, disponibles) for cantidad in cantidades]
+
+    with _bloqueo:
+        _estadisticas["rechazos"] += sum(error is not None for error in errores)
+        _estadisticas["reservas_en_lote"] += 1
+    return errores, tomados_por_tramo[0][0] if tomados_por_tramo else None
+
+
+def liberar_asientos(conexion, id_destino, cantidad):
+    """
+    Devuelve asientos al cupo de un destino, dentro de la transacción en curso (sin confirmar).
+    No tiene efecto si el destino no tiene límite de asientos o si se está eliminando (ver 'purga').
+    """
+    if obtener_uno(conexion, "purga_pendiente", ("destino", str(id_destino))):
+        return
+    tramo = random.randrange(TRAMOS_POR_DESTINO)
+    if ejecutar(conexion, "liberar_asientos", (cantidad, id_destino, tramo)).rowcount != 1:
+        # El destino tiene menos tramos que TRAMOS_POR_DESTINO, o ninguno.
+        tramos = obtener_todos(conexion, "tramos_de_destino", (id_destino,))
+        if not tramos:
+            return
+        ejecutar(conexion, "liberar_asientos", (cantidad, id_destino, tramos[0][0]))
+    _contar("liberaciones")
+
+
+def asignar_asientos(id_destino, cantidad, tramos=TRAMOS_POR_DESTINO, conexion=None):
+    """
+    Fija el cupo de asientos disponibles de un destino, repartido en tramos iguales.
+
+    Args:
+        id_destino (int): ID del destino.
+        cantidad (int | None): Asientos disponibles, o None para quitar el límite.
+        tramos (int): Cantidad de tramos en que se reparte el cupo.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Raises:
+        ValueError: Si la cantidad es negativa o la de tramos es menor a 1.
+    """
+    if cantidad is not None and cantidad < 0:
+        raise ValueError("La cantidad de asientos no puede ser negativa.")
+    if tramos < 1:
+        raise ValueError("La cantidad de tramos debe ser al menos 1.")
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        cursor.execute("DELETE FROM asientos WHERE id_destino = %s;", (id_destino,))
+        if cantidad is not None:
+            base, resto = divmod(cantidad, tramos)
+            cursor.executemany("INSERT INTO asientos (id_destino, tramo, disponibles) VALUES (%s, %s, %s);",
+                               [(id_destino, tramo, base + (1 if tramo < resto else 0)) for tramo in range(tramos)])
+        conexion.commit()
+        with _bloqueo:
+            _sin_cupo.pop(id_destino, None)
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+def asientos_disponibles(id_destino, conexion=None):
+    """
+    Devuelve los asientos disponibles de un destino.
+
+    Returns:
+        int | None: Asientos disponibles, o None si el destino no tiene límite.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(_CONSULTA_DISPONIBLES, (id_destino,))
+        tramos, disponibles = cursor.fetchone()
+        return int(disponibles) if tramos else None
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+def estadisticas_asientos():
+    """
+    Devuelve los contadores de reservas.
+
+    Returns:
+        dict: Reservas resueltas en un tramo, reservas repartidas entre varios tramos, reservas
+        de lotes importados, rechazos por falta de asientos y liberaciones.
+    """
+    with _bloqueo:
+        return dict(_estadisticas)
+
+
+def reiniciar_estadisticas():
+    with _bloqueo:
+        for clave in _estadisticas:
+            _estadisticas[clave] = 0
@@ -0,0 +1,77 @@
+-- Script de creación de base de datos para el motor embebido SQLite: SkyRoute S.A.
+-- Autor: Juan Pablo Mercado
+-- Equivalente a estructura_tablas.sql. Diferencias con MySQL:
+--   * AUTO_INCREMENT se expresa como INTEGER PRIMARY KEY AUTOINCREMENT.
+--   * SQLite no crea índices para las claves foráneas; se crean explícitamente,
+--     igual que los que MySQL genera de forma implícita.
+
+-- Tabla CLIENTES
+CREATE TABLE IF NOT EXISTS clientes (
+    id_cliente INTEGER PRIMARY KEY AUTOINCREMENT,
+    dni_cliente VARCHAR(50) NOT NULL UNIQUE,
+    dir_cliente VARCHAR(50),
+    nombre_cliente VARCHAR(100),
+    apellido_cliente VARCHAR(100),
+    email_cliente VARCHAR(100),
+    estado_de_cliente VARCHAR(10) DEFAULT 'Activo'
+);
+
+-- Tabla TELEFONOS
+CREATE TABLE IF NOT EXISTS telefonos (
+    id_telefono INTEGER PRIMARY KEY AUTOINCREMENT,
+    tel_cliente VARCHAR(50) NOT NULL,
+    dni_cliente VARCHAR(50),
+    CONSTRAINT fk_dni_cliente FOREIGN KEY (dni_cliente) REFERENCES clientes(dni_cliente)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+CREATE INDEX IF NOT EXISTS fk_telefonos_dni_cliente ON telefonos (dni_cliente);
+
+-- Tabla CIUDADES
+CREATE TABLE IF NOT EXISTS ciudades (
+    id_ciudad INTEGER PRIMARY KEY AUTOINCREMENT,
+    nombre_ciudad VARCHAR(50) NOT NULL,
+    provincia VARCHAR(50),
+    pais VARCHAR(50),
+    costo_base FLOAT
+);
+
+-- Tabla DESTINOS
+CREATE TABLE IF NOT EXISTS destinos (
+    id_destino INTEGER PRIMARY KEY AUTOINCREMENT,
+    id_ciudad INT NOT NULL,
+    FOREIGN KEY(id_ciudad) REFERENCES ciudades(id_ciudad)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+CREATE INDEX IF NOT EXISTS fk_destinos_id_ciudad ON destinos (id_ciudad);
+
+-- Tabla VENTAS
+CREATE TABLE IF NOT EXISTS ventas (
+    id_venta INTEGER PRIMARY KEY AUTOINCREMENT,
+    fecha_de_compra DATETIME NOT NULL,
+    id_destino INT NOT NULL,
+    cantidad_de_tickets INT,
+    estado_de_venta VARCHAR(10) DEFAULT 'Activa',
+    dni_cliente VARCHAR(50) NOT NULL,
+    FOREIGN KEY(id_destino) REFERENCES destinos(id_destino)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE,
+    FOREIGN KEY(dni_cliente) REFERENCES clientes(dni_cliente)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+CREATE INDEX IF NOT EXISTS fk_ventas_id_destino ON ventas (id_destino);
+CREATE INDEX IF NOT EXISTS fk_ventas_dni_cliente ON ventas (dni_cliente);
+
+-- Tabla ARREPENTIMIENTOS
+CREATE TABLE IF NOT EXISTS arrepentimientos (
+    id_arrepentimiento INTEGER PRIMARY KEY AUTOINCREMENT,
+    fecha_hora_arrepentimiento DATETIME NOT NULL,
+    motivo_arrepentimiento TEXT,
+    id_venta INT NOT NULL,
+    FOREIGN KEY(id_venta) REFERENCES ventas(id_venta)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+CREATE INDEX IF NOT EXISTS fk_arrepentimientos_id_venta ON arrepentimientos (id_venta);
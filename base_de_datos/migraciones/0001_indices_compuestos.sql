@@ -0,0 +1,8 @@
+-- Migración 0001: índices compuestos para las consultas más frecuentes.
+-- Autor: Juan Pablo Mercado
+
+-- Ventas de un cliente filtradas por estado (anular_venta, listar_ventas).
+CREATE INDEX idx_ventas_dni_estado ON ventas (dni_cliente, estado_de_venta);
+
+-- Búsqueda de una ciudad existente al registrar un destino (registrar_destino).
+CREATE INDEX idx_ciudades_nombre_provincia_pais ON ciudades (nombre_ciudad, provincia, pais);
@@ -0,0 +1,10 @@
+-- Migración 0002: índices para la ventana de anulación de ventas.
+-- Autor: Juan Pablo Mercado
+
+-- Ventas anulables de un cliente: activas y dentro de la ventana (anular_venta, cancelar_venta).
+-- Reemplaza al índice (dni_cliente, estado_de_venta) de la migración 0001, que queda cubierto.
+CREATE INDEX idx_ventas_dni_estado_fecha ON ventas (dni_cliente, estado_de_venta, fecha_de_compra);
+DROP INDEX idx_ventas_dni_estado;
+
+-- Ventas activas cuya ventana ya venció (cerrar_ventas_vencidas).
+CREATE INDEX idx_ventas_estado_fecha ON ventas (estado_de_venta, fecha_de_compra);
@@ -0,0 +1,6 @@
+-- Migración 0003: total cobrado en cada venta.
+-- Autor: Juan Pablo Mercado
+
+-- Total calculado por el módulo de tarifas al registrar la venta (temporada, volumen e impuestos).
+-- Las ventas anteriores a esta migración quedan sin total.
+ALTER TABLE ventas ADD COLUMN total_venta DECIMAL(12, 2);
@@ -0,0 +1,15 @@
+-- Migración 0004: cupo de asientos por destino.
+-- Autor: Juan Pablo Mercado
+
+-- Asientos disponibles de cada destino, repartidos en tramos (ver 'asientos.py').
+-- Un destino sin tramos no tiene límite de asientos.
+CREATE TABLE asientos (
+    id_destino INT NOT NULL,
+    tramo INT NOT NULL,
+    disponibles INT NOT NULL,
+    PRIMARY KEY (id_destino, tramo),
+    CONSTRAINT chk_asientos_disponibles CHECK (disponibles >= 0),
+    FOREIGN KEY (id_destino) REFERENCES destinos(id_destino)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
@@ -0,0 +1,39 @@
+-- Migración 0005: tablas de archivo para ventas y arrepentimientos históricos.
+-- Autor: Juan Pablo Mercado
+
+-- Ventas cerradas o anuladas que el archivador (archivo_ventas.py) saca de 'ventas'.
+-- Se particionan por mes de compra: las consultas por período leen solo sus particiones y un mes
+-- completo puede descartarse con DROP PARTITION. MySQL no admite claves foráneas en tablas
+-- particionadas y exige la columna de partición en la clave primaria; la integridad con
+-- clientes y destinos la mantienen los módulos que los modifican o eliminan.
+-- Las particiones mensuales las agrega el archivador; 'p_futuro' recibe lo que no tenga una propia.
+CREATE TABLE ventas_archivo (
+    id_venta INT NOT NULL,
+    fecha_de_compra DATETIME NOT NULL,
+    id_destino INT NOT NULL,
+    cantidad_de_tickets INT,
+    estado_de_venta VARCHAR(10),
+    dni_cliente VARCHAR(50) NOT NULL,
+    total_venta DECIMAL(12, 2),
+    PRIMARY KEY (id_venta, fecha_de_compra),
+    INDEX idx_ventas_archivo_dni_estado (dni_cliente, estado_de_venta),
+    INDEX idx_ventas_archivo_destino (id_destino)
+)
+PARTITION BY RANGE COLUMNS (fecha_de_compra) (
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+);
+
+-- Arrepentimientos de las ventas archivadas, con la fecha de compra de su venta para
+-- particionarlos igual que 'ventas_archivo'.
+CREATE TABLE arrepentimientos_archivo (
+    id_arrepentimiento INT NOT NULL,
+    fecha_hora_arrepentimiento DATETIME NOT NULL,
+    motivo_arrepentimiento TEXT,
+    id_venta INT NOT NULL,
+    fecha_de_compra DATETIME NOT NULL,
+    PRIMARY KEY (id_arrepentimiento, fecha_de_compra),
+    INDEX idx_arrepentimientos_archivo_venta (id_venta)
+)
+PARTITION BY RANGE COLUMNS (fecha_de_compra) (
+    PARTITION p_futuro VALUES LESS THAN (MAXVALUE)
+);
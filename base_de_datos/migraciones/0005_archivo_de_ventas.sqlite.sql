@@ -0,0 +1,28 @@
+-- Migración 0005: tablas de archivo para ventas y arrepentimientos históricos.
+-- Autor: Juan Pablo Mercado
+
+-- Ventas cerradas o anuladas que el archivador (archivo_ventas.py) saca de 'ventas'.
+-- SQLite no tiene particiones: son tablas comunes con los mismos índices que en MySQL.
+CREATE TABLE ventas_archivo (
+    id_venta INT NOT NULL,
+    fecha_de_compra DATETIME NOT NULL,
+    id_destino INT NOT NULL,
+    cantidad_de_tickets INT,
+    estado_de_venta VARCHAR(10),
+    dni_cliente VARCHAR(50) NOT NULL,
+    total_venta DECIMAL(12, 2),
+    PRIMARY KEY (id_venta, fecha_de_compra)
+);
+CREATE INDEX idx_ventas_archivo_dni_estado ON ventas_archivo (dni_cliente, estado_de_venta);
+CREATE INDEX idx_ventas_archivo_destino ON ventas_archivo (id_destino);
+
+-- Arrepentimientos de las ventas archivadas, con la fecha de compra de su venta.
+CREATE TABLE arrepentimientos_archivo (
+    id_arrepentimiento INT NOT NULL,
+    fecha_hora_arrepentimiento DATETIME NOT NULL,
+    motivo_arrepentimiento TEXT,
+    id_venta INT NOT NULL,
+    fecha_de_compra DATETIME NOT NULL,
+    PRIMARY KEY (id_arrepentimiento, fecha_de_compra)
+);
+CREATE INDEX idx_arrepentimientos_archivo_venta ON arrepentimientos_archivo (id_venta);
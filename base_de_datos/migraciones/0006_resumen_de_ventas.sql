@@ -0,0 +1,56 @@
+-- Migración 0006: resúmenes de ventas por cliente y por destino.
+-- Autor: Juan Pablo Mercado
+
+-- Ventas y tickets vigentes (Activa o Cerrada) y anulados de cada cliente, incluidas las archivadas.
+-- Se actualizan en la misma transacción que cada venta, anulación o importación (resumen_ventas.py).
+CREATE TABLE resumen_ventas_cliente (
+    dni_cliente VARCHAR(50) NOT NULL,
+    ventas_vigentes INT NOT NULL DEFAULT 0,
+    ventas_anuladas INT NOT NULL DEFAULT 0,
+    tickets_vigentes INT NOT NULL DEFAULT 0,
+    tickets_anulados INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (dni_cliente),
+    FOREIGN KEY (dni_cliente) REFERENCES clientes(dni_cliente)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- Lo mismo por destino, repartido en tramos como el cupo de asientos: cada venta suma en un tramo
+-- al azar, para que las ventas simultáneas de un destino no esperen todas por la misma fila.
+CREATE TABLE resumen_ventas_destino (
+    id_destino INT NOT NULL,
+    tramo INT NOT NULL,
+    ventas_vigentes INT NOT NULL DEFAULT 0,
+    ventas_anuladas INT NOT NULL DEFAULT 0,
+    tickets_vigentes INT NOT NULL DEFAULT 0,
+    tickets_anulados INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (id_destino, tramo),
+    FOREIGN KEY (id_destino) REFERENCES destinos(id_destino)
+        ON DELETE CASCADE
+        ON UPDATE CASCADE
+);
+
+-- Resúmenes iniciales, a partir de las ventas existentes.
+INSERT INTO resumen_ventas_cliente (dni_cliente, ventas_vigentes, ventas_anuladas, tickets_vigentes, tickets_anulados)
+SELECT v.dni_cliente,
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 0 ELSE 1 END),
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 0 ELSE COALESCE(v.cantidad_de_tickets, 0) END),
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN COALESCE(v.cantidad_de_tickets, 0) ELSE 0 END)
+FROM (SELECT dni_cliente, estado_de_venta, cantidad_de_tickets FROM ventas
+      UNION ALL
+      SELECT dni_cliente, estado_de_venta, cantidad_de_tickets FROM ventas_archivo) v
+JOIN clientes c ON c.dni_cliente = v.dni_cliente
+GROUP BY v.dni_cliente;
+
+INSERT INTO resumen_ventas_destino (id_destino, tramo, ventas_vigentes, ventas_anuladas, tickets_vigentes, tickets_anulados)
+SELECT v.id_destino, 0,
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 0 ELSE 1 END),
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 1 ELSE 0 END),
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 0 ELSE COALESCE(v.cantidad_de_tickets, 0) END),
+       SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN COALESCE(v.cantidad_de_tickets, 0) ELSE 0 END)
+FROM (SELECT id_destino, estado_de_venta, cantidad_de_tickets FROM ventas
+      UNION ALL
+      SELECT id_destino, estado_de_venta, cantidad_de_tickets FROM ventas_archivo) v
+JOIN destinos d ON d.id_destino = v.id_destino
+GROUP BY v.id_destino;
@@ -0,0 +1,12 @@
+-- Migración 0007: registro de las eliminaciones por lotes en curso.
+-- Autor: Juan Pablo Mercado
+
+-- Clientes y destinos cuya eliminación comenzó y todavía no terminó (purga.py). Si el proceso
+-- se interrumpe, 'python purga.py --reanudar' completa las que quedaron aquí.
+CREATE TABLE purgas_pendientes (
+    tipo VARCHAR(10) NOT NULL,
+    clave VARCHAR(50) NOT NULL,
+    fecha_inicio DATETIME NOT NULL,
+    ventas_eliminadas INT NOT NULL DEFAULT 0,
+    PRIMARY KEY (tipo, clave)
+);
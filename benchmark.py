@@ -0,0 +1,317 @@
+"""
+Módulo: benchmark.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y mide el rendimiento de las operaciones de
+clientes, destinos y ventas sobre una base de datos local cargada con datos sintéticos.
+
+Para cada operación informa la latencia (percentiles 50, 95 y 99) y las operaciones por segundo.
+Los resultados pueden guardarse en JSON y compararse con una ejecución anterior: si alguna
+operación empeora más allá de la tolerancia, el programa termina con código de salida 1.
+
+Uso:
+    python benchmark.py --clientes 10000 --destinos 200 --ventas 50000 --salida actual.json
+    python benchmark.py --comparar base.json --tolerancia 0.2
+
+Por defecto se usa una base SQLite temporal. Con '--motor mysql' se usa la base configurada en
+'config.py', que debe ser una base dedicada y vacía.
+"""
+
+import argparse
+import itertools
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import conexion_base_de_datos
+from conexion_base_de_datos import obtener_conexion
+from cache_destinos import invalidar_catalogo, obtener_catalogo
+from clientes import actualizar_cliente, iterar_clientes, registrar_cliente
+from destinos import crear_destino
+from tarifas import cotizar_lote
+from resumen_ventas import reconstruir_resumenes
+from ventas import ESTADOS_VIGENTES, cancelar_venta, consultar_ventas, registrar_venta
+
+
+TAMANIO_LOTE_CARGA = 5000
+
+# Cotizaciones por ejecución de la operación 'cotizar_lote'.
+TAMANIO_LOTE_COTIZACION = 1000
+
+
+def formatear_dni(numero):
+    """Convierte un número en un DNI con formato 111.111.111."""
+    texto = f"{numero:09d}"
+    return f"{texto[:3]}.{texto[3:6]}.{texto[6:]}"
+
+
+def percentil(valores_ordenados, porcentaje):
+    """
+    Calcula un percentil por interpolación lineal sobre una lista ya ordenada.
+
+    Args:
+        valores_ordenados (list[float]): Valores en orden ascendente (no vacía).
+        porcentaje (float): Percentil buscado, entre 0 y 100.
+    """
+    posicion = (len(valores_ordenados) - 1) * porcentaje / 100
+    inferior = int(posicion)
+    superior = min(inferior + 1, len(valores_ordenados) - 1)
+    fraccion = posicion - inferior
+    return valores_ordenados[inferior] * (1 - fraccion) + valores_ordenados[superior] * fraccion
+
+
+def resumir_tiempos(tiempos):
+    """
+    Resume una lista de duraciones en segundos.
+
+    Returns:
+        dict: Cantidad de mediciones, percentiles 50/95/99 en milisegundos y operaciones por segundo.
+    """
+    ordenados = sorted(tiempos)
+    total = sum(ordenados)
+    return {
+        "mediciones": len(ordenados),
+        "p50_ms": percentil(ordenados, 50) * 1000,
+        "p95_ms": percentil(ordenados, 95) * 1000,
+        "p99_ms": percentil(ordenados, 99) * 1000,
+        "ops_por_segundo": len(ordenados) / total if total > 0 else 0.0,
+    }
+
+
+def sembrar_base(cantidad_clientes, cantidad_destinos, cantidad_ventas, semilla=0):
+    """
+    Carga datos sintéticos en la base: clientes con un teléfono cada uno, destinos (uno por ciudad)
+    y ventas históricas repartidas al azar.
+
+    Returns:
+        tuple: (lista de DNI, lista de id_destino) cargados.
+    """
+    aleatorio = random.Random(semilla)
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        cursor.execute("SELECT COUNT(*) FROM clientes;")
+        if cursor.fetchone()[0]:
+            raise RuntimeError("La base de datos del benchmark debe estar vacía.")
+
+        dnis = [formatear_dni(numero) for numero in range(1, cantidad_clientes + 1)]
+        for inicio in range(0, cantidad_clientes, TAMANIO_LOTE_CARGA):
+            lote = dnis[inicio:inicio + TAMANIO_LOTE_CARGA]
+            cursor.executemany("""
+                INSERT INTO clientes (dni_cliente, dir_cliente, nombre_cliente, apellido_cliente, email_cliente)
+                VALUES (%s, %s, %s, %s, %s);
+            """, [(dni, f"Calle {i}", f"Nombre{i}", f"Apellido{i}", f"cliente{i}@correo.com")
+                  for i, dni in enumerate(lote, start=inicio)])
+            cursor.executemany("INSERT INTO telefonos (tel_cliente, dni_cliente) VALUES (%s, %s);",
+                               [(f"351-{i:07d}", dni) for i, dni in enumerate(lote, start=inicio)])
+            conexion.commit()
+
+        cursor.executemany("""
+            INSERT INTO ciudades (nombre_ciudad, provincia, pais, costo_base)
+            VALUES (%s, %s, %s, %s);
+        """, [(f"Ciudad{i}", f"Provincia{i % 24}", "Argentina", float(aleatorio.randint(50, 500)))
+              for i in range(cantidad_destinos)])
+        cursor.execute("SELECT id_ciudad FROM ciudades ORDER BY id_ciudad;")
+        ids_ciudad = [fila[0] for fila in cursor.fetchall()]
+        cursor.executemany("INSERT INTO destinos (id_ciudad) VALUES (%s);", [(i,) for i in ids_ciudad])
+        conexion.commit()
+        cursor.execute("SELECT id_destino FROM destinos ORDER BY id_destino;")
+        ids_destino = [fila[0] for fila in cursor.fetchall()]
+
+        ahora = datetime.now()
+        for inicio in range(0, cantidad_ventas, TAMANIO_LOTE_CARGA):
+            cantidad = min(TAMANIO_LOTE_CARGA, cantidad_ventas - inicio)
+            cursor.executemany("""
+                INSERT INTO ventas (fecha_de_compra, id_destino, cantidad_de_tickets, estado_de_venta, dni_cliente)
+                VALUES (%s, %s, %s, %s, %s);
+            """, [(ahora - timedelta(minutes=aleatorio.randint(10, 525600)),
+                   aleatorio.choice(ids_destino), aleatorio.randint(1, 5),
+                   "Anulada" if aleatorio.random() < 0.1 else "Activa", aleatorio.choice(dnis))
+                  for _ in range(cantidad)])
+            conexion.commit()
+        # Las ventas históricas se insertan directamente: los resúmenes se calculan al final.
+        reconstruir_resumenes(conexion)
+    finally:
+        cursor.close()
+        conexion.close()
+
+    return dnis, ids_destino
+
+
+def medir(operacion, repeticiones, calentamiento=5):
+    """
+    Ejecuta una operación varias veces y devuelve la duración de cada ejecución en segundos.
+    Las primeras 'calentamiento' ejecuciones no se miden.
+    """
+    for _ in range(calentamiento):
+        operacion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        operacion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def preparar_operaciones(dnis, ids_destino, repeticiones, semilla=0):
+    """
+    Arma las operaciones a medir. Cada una es una función sin argumentos que ejecuta una vez
+    la operación correspondiente con datos elegidos al azar (con semilla fija).
+
+    Returns:
+        dict: nombre de la operación -> función.
+    """
+    aleatorio = random.Random(semilla)
+    nuevos_dni = (formatear_dni(numero) for numero in itertools.count(len(dnis) + 1))
+    contador = itertools.count()
+    ventas_a_anular = []
+
+    def agregar_cliente():
+        i = next(contador)
+        registrar_cliente(next(nuevos_dni), f"Nuevo{i}", "Benchmark", f"Calle {i}",
+                          f"nuevo{i}@correo.com", f"351-{i % 10000000:07d}")
+
+    def modificar_cliente():
+        actualizar_cliente(aleatorio.choice(dnis), "direccion", f"Calle {next(contador)}")
+
+    def listar_clientes():
+        clientes = iterar_clientes()
+        for _ in itertools.islice(clientes, 500):
+            pass
+        clientes.close()
+
+    def registrar_destino():
+        crear_destino(f"Ciudad Nueva {next(contador)}", "Provincia", "Argentina", 100.0)
+
+    def listar_destinos():
+        invalidar_catalogo()
+        obtener_catalogo()
+
+    def agregar_venta():
+        registrar_venta(aleatorio.choice(dnis), aleatorio.choice(ids_destino), aleatorio.randint(1, 4))
+
+    def anular_venta():
+        if not ventas_a_anular:
+            # Las ventas a anular se crean por adelantado, fuera de la medición de cada anulación.
+            for _ in range(repeticiones + 10):
+                dni = aleatorio.choice(dnis)
+                ventas_a_anular.append((dni, registrar_venta(dni, aleatorio.choice(ids_destino), 1)))
+        dni, id_venta = ventas_a_anular.pop()
+        cancelar_venta(dni, id_venta, "Benchmark")
+
+    def listar_ventas():
+        consultar_ventas(aleatorio.choice(dnis), ESTADOS_VIGENTES)
+
+    cotizaciones = ([aleatorio.choice(ids_destino) for _ in range(TAMANIO_LOTE_COTIZACION)],
+                    [aleatorio.randint(1, 25) for _ in range(TAMANIO_LOTE_COTIZACION)],
+                    [datetime(2025, aleatorio.randint(1, 12), 1) for _ in range(TAMANIO_LOTE_COTIZACION)])
+
+    def cotizar():
+        cotizar_lote(*cotizaciones)
+
+    return {
+        "agregar_cliente": agregar_cliente,
+        "modificar_cliente": modificar_cliente,
+        "listar_clientes": listar_clientes,
+        "registrar_destino": registrar_destino,
+        "listar_destinos": listar_destinos,
+        "agregar_venta": agregar_venta,
+        "anular_venta": anular_venta,
+        "listar_ventas": listar_ventas,
+        "cotizar_lote": cotizar,
+    }
+
+
+def ejecutar_benchmark(clientes, destinos, ventas, repeticiones, operaciones=None, semilla=0):
+    """
+    Carga la base y mide cada operación.
+
+    Returns:
+        dict: Metadatos de la ejecución y, en 'resultados', el resumen de cada operación.
+    """
+    inicio = time.perf_counter()
+    dnis, ids_destino = sembrar_base(clientes, destinos, ventas, semilla)
+    print(f"Base cargada en {time.perf_counter() - inicio:.1f} s.")
+
+    resultados = {}
+    for nombre, operacion in preparar_operaciones(dnis, ids_destino, repeticiones, semilla).items():
+        if operaciones and nombre not in operaciones:
+            continue
+        resumen = resumir_tiempos(medir(operacion, repeticiones))
+        resultados[nombre] = resumen
+        print(f"{nombre:<18} p50 {resumen['p50_ms']:8.3f} ms  p95 {resumen['p95_ms']:8.3f} ms  "
+              f"p99 {resumen['p99_ms']:8.3f} ms  {resumen['ops_por_segundo']:10.1f} ops/s")
+
+    return {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "motor": conexion_base_de_datos.motor_actual(),
+        "tamanios": {"clientes": clientes, "destinos": destinos, "ventas": ventas},
+        "repeticiones": repeticiones,
+        "resultados": resultados,
+    }
+
+
+def comparar_resultados(actual, base, tolerancia):
+    """
+    Compara dos ejecuciones del benchmark.
+
+    Una operación presenta una regresión si su p95 crece, o sus operaciones por segundo caen,
+    más que la tolerancia relativa indicada.
+
+    Returns:
+        list[str]: Descripción de cada regresión encontrada.
+    """
+    regresiones = []
+    for nombre, resumen in actual["resultados"].items():
+        anterior = base["resultados"].get(nombre)
+        if anterior is None:
+            continue
+        if resumen["p95_ms"] > anterior["p95_ms"] * (1 + tolerancia):
+            regresiones.append(f"{nombre}: p95 {anterior['p95_ms']:.3f} ms -> {resumen['p95_ms']:.3f} ms")
+        if resumen["ops_por_segundo"] < anterior["ops_por_segundo"] * (1 - tolerancia):
+            regresiones.append(f"{nombre}: {anterior['ops_por_segundo']:.1f} ops/s -> "
+                               f"{resumen['ops_por_segundo']:.1f} ops/s")
+    return regresiones
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark de las operaciones de SkyRoute.")
+    parser.add_argument("--motor", choices=conexion_base_de_datos.MOTORES, default="sqlite")
+    parser.add_argument("--ruta", help="Archivo SQLite a usar (por defecto, uno temporal).")
+    parser.add_argument("--clientes", type=int, default=10000)
+    parser.add_argument("--destinos", type=int, default=200)
+    parser.add_argument("--ventas", type=int, default=50000)
+    parser.add_argument("--repeticiones", type=int, default=500)
+    parser.add_argument("--operaciones", nargs="*", help="Medir solo estas operaciones.")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados.")
+    parser.add_argument("--comparar", help="Archivo JSON de una ejecución anterior.")
+    parser.add_argument("--tolerancia", type=float, default=0.2,
+                        help="Empeoramiento relativo admitido antes de considerar una regresión.")
+    argumentos = parser.parse_args()
+
+    if argumentos.motor == "sqlite":
+        ruta = argumentos.ruta or os.path.join(tempfile.mkdtemp(prefix="skyroute_"), "benchmark.db")
+        conexion_base_de_datos.configurar_motor("sqlite", ruta)
+    else:
+        conexion_base_de_datos.configurar_motor("mysql")
+
+    resultado = ejecutar_benchmark(argumentos.clientes, argumentos.destinos, argumentos.ventas,
+                                   argumentos.repeticiones, argumentos.operaciones)
+
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, indent=2)
+
+    if argumentos.comparar:
+        with open(argumentos.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar_resultados(resultado, base, argumentos.tolerancia)
+        if regresiones:
+            print("\nRegresiones detectadas:")
+            for regresion in regresiones:
+                print(f"  {regresion}")
+            raise SystemExit(1)
+        print("\nSin regresiones respecto de la ejecución anterior.")
@@ -0,0 +1,126 @@
+"""
+Módulo: benchmark_contencion.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y mide cómo se comportan las ventas cuando
+muchos compradores compiten a la vez por los asientos de un mismo destino.
+
+Para cada cantidad de compradores concurrentes (hilos), se fija el cupo del destino, cada
+comprador registra ventas de un ticket durante el tiempo indicado y se informan las ventas por
+segundo, la latencia (p50/p95/p99) y los rechazos. Al terminar cada ronda se verifica que no se
+haya vendido de más: ventas registradas + asientos restantes = cupo inicial.
+
+Con '--tramos 1' todo el cupo queda en una sola fila, lo que permite comparar con el reparto
+en tramos. Con SQLite las escrituras se serializan en la propia base, por lo que la escala
+solo es representativa con '--motor mysql'.
+
+Uso:
+    python benchmark_contencion.py --compradores 1 2 4 8 16 32 --segundos 5
+    python benchmark_contencion.py --motor mysql --tramos 1
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+
+import conexion_base_de_datos
+from asientos import TRAMOS_POR_DESTINO, asientos_disponibles, asignar_asientos, estadisticas_asientos, \
+    reiniciar_estadisticas
+from benchmark import resumir_tiempos, sembrar_base
+from ventas import VentaRechazadaError, registrar_venta
+
+
+def ejecutar_ronda(compradores, dnis, id_destino, cupo, tramos, segundos):
+    """
+    Hace competir a 'compradores' hilos por el cupo de un destino durante 'segundos'.
+
+    Returns:
+        dict: Ventas, rechazos, errores, ventas por segundo, latencias y si el cupo cerró.
+    """
+    asignar_asientos(id_destino, cupo, tramos)
+    reiniciar_estadisticas()
+    tiempos = []
+    contadores = {"ventas": 0, "rechazos": 0, "errores": 0}
+    bloqueo = threading.Lock()
+    inicio_ronda = threading.Barrier(compradores + 1)
+    fin = []
+
+    def comprador(semilla):
+        aleatorio = random.Random(semilla)
+        propios = []
+        ventas = rechazos = errores = 0
+        inicio_ronda.wait()
+        while not fin:
+            inicio = time.perf_counter()
+            try:
+                registrar_venta(aleatorio.choice(dnis), id_destino, 1)
+                ventas += 1
+            except VentaRechazadaError:
+                rechazos += 1
+            except Exception:
+                errores += 1
+            propios.append(time.perf_counter() - inicio)
+        with bloqueo:
+            tiempos.extend(propios)
+            contadores["ventas"] += ventas
+            contadores["rechazos"] += rechazos
+            contadores["errores"] += errores
+
+    hilos = [threading.Thread(target=comprador, args=(numero,)) for numero in range(compradores)]
+    for hilo in hilos:
+        hilo.start()
+    inicio_ronda.wait()
+    inicio = time.perf_counter()
+    time.sleep(segundos)
+    fin.append(True)
+    for hilo in hilos:
+        hilo.join()
+    duracion = time.perf_counter() - inicio
+
+    restantes = asientos_disponibles(id_destino)
+    resultado = dict(contadores)
+    resultado.update(resumir_tiempos(tiempos) if tiempos else {})
+    resultado["ventas_por_segundo"] = contadores["ventas"] / duracion
+    resultado["restantes"] = restantes
+    resultado["cupo_consistente"] = contadores["ventas"] + restantes == cupo and restantes >= 0
+    resultado["reservas_repartidas"] = estadisticas_asientos()["reservas_repartidas"]
+    return resultado
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Contención de compradores sobre un mismo destino.")
+    parser.add_argument("--motor", choices=conexion_base_de_datos.MOTORES, default="sqlite")
+    parser.add_argument("--ruta", help="Archivo SQLite a usar (por defecto, uno temporal).")
+    parser.add_argument("--compradores", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--segundos", type=float, default=5.0, help="Duración de cada ronda.")
+    parser.add_argument("--cupo", type=int, default=1000000,
+                        help="Asientos del destino al comenzar cada ronda (uno bajo prueba el agotamiento).")
+    parser.add_argument("--tramos", type=int, default=TRAMOS_POR_DESTINO)
+    parser.add_argument("--clientes", type=int, default=1000)
+    argumentos = parser.parse_args()
+
+    if argumentos.motor == "sqlite":
+        ruta = argumentos.ruta or os.path.join(tempfile.mkdtemp(prefix="skyroute_"), "contencion.db")
+        conexion_base_de_datos.configurar_motor("sqlite", ruta)
+    else:
+        conexion_base_de_datos.configurar_motor("mysql")
+    conexion_base_de_datos.configurar_pool(tamanio=max(argumentos.compradores) + 1)
+
+    dnis, ids_destino = sembrar_base(argumentos.clientes, 1, 0)
+    id_destino = ids_destino[0]
+
+    print(f"Destino {id_destino}, cupo {argumentos.cupo} en {argumentos.tramos} tramo(s).")
+    inconsistencias = 0
+    for compradores in argumentos.compradores:
+        r = ejecutar_ronda(compradores, dnis, id_destino, argumentos.cupo, argumentos.tramos, argumentos.segundos)
+        inconsistencias += not r["cupo_consistente"]
+        print(f"{compradores:>4} compradores  {r['ventas_por_segundo']:9.1f} ventas/s  "
+              f"p50 {r.get('p50_ms', 0):8.3f} ms  p95 {r.get('p95_ms', 0):8.3f} ms  p99 {r.get('p99_ms', 0):8.3f} ms  "
+              f"ventas {r['ventas']}  rechazos {r['rechazos']}  errores {r['errores']}  "
+              f"repartidas {r['reservas_repartidas']}  restantes {r['restantes']}"
+              f"{'' if r['cupo_consistente'] else '  ¡CUPO INCONSISTENTE!'}")
+
+    if inconsistencias:
+        raise SystemExit(1)
@@ -0,0 +1,104 @@
+"""
+Módulo: benchmark_memoria.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y compara la memoria que ocupa un resultado
+grande de la tabla 'ventas' según cómo se lo guarde:
+
+- tuplas: las filas tal como las devuelve el cursor (fetchall);
+- diccionarios: una fila por diccionario columna -> valor;
+- modelos: un objeto 'Venta' (con '__slots__') por fila;
+- columnas: 'VentasEnColumnas', con arreglos compactos por columna.
+
+Las filas se generan con la misma forma que las del cursor (id, datetime, id de destino,
+cantidad, estado, DNI y total, cada valor como objeto nuevo) y se consumen a medida que se
+generan, como al leer de la base. Para cada representación se informa la memoria retenida al
+terminar, el pico durante la construcción (medidos con 'tracemalloc') y el tiempo de construcción.
+
+Uso:
+    python benchmark_memoria.py --filas 1000000 --clientes 100000
+"""
+
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from modelos import Venta, VentasEnColumnas
+
+
+COLUMNAS_VENTA = Venta.__slots__
+
+
+def generar_filas(cantidad, cantidad_clientes, semilla=0):
+    """Genera filas de 'ventas' con la forma de las que devuelve el cursor."""
+    aleatorio = random.Random(semilla)
+    inicio = datetime(2025, 1, 1)
+    for id_venta in range(1, cantidad + 1):
+        numero = f"{aleatorio.randrange(cantidad_clientes):09d}"
+        cantidad_de_tickets = aleatorio.randint(1, 5)
+        yield (id_venta,
+               inicio + timedelta(seconds=aleatorio.randrange(31536000)),
+               aleatorio.randint(1, 200),
+               cantidad_de_tickets,
+               "Anulada" if aleatorio.random() < 0.1 else "Activa",
+               f"{numero[:3]}.{numero[3:6]}.{numero[6:]}",
+               round(cantidad_de_tickets * aleatorio.uniform(50, 500), 2))
+
+
+REPRESENTACIONES = {
+    "tuplas": list,
+    "diccionarios": lambda filas: [dict(zip(COLUMNAS_VENTA, fila)) for fila in filas],
+    "modelos": Venta.desde_filas,
+    "columnas": VentasEnColumnas,
+}
+
+
+def medir(construir, cantidad, cantidad_clientes):
+    """
+    Construye una representación y mide su memoria.
+
+    Returns:
+        dict: Memoria retenida y pico en MB, bytes por fila y segundos de construcción.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        inicio = time.perf_counter()
+        resultado = construir(generar_filas(cantidad, cantidad_clientes))
+        duracion = time.perf_counter() - inicio
+        gc.collect()
+        retenida, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del resultado
+    return {
+        "retenida_mb": retenida / 2**20,
+        "pico_mb": pico / 2**20,
+        "bytes_por_fila": retenida / cantidad,
+        "segundos": duracion,
+    }
+
+
+def ejecutar_benchmark(cantidad, cantidad_clientes, representaciones=None):
+    resultados = {}
+    for nombre, construir in REPRESENTACIONES.items():
+        if representaciones and nombre not in representaciones:
+            continue
+        resumen = resultados[nombre] = medir(construir, cantidad, cantidad_clientes)
+        print(f"{nombre:<13} retenida {resumen['retenida_mb']:9.1f} MB  pico {resumen['pico_mb']:9.1f} MB  "
+              f"{resumen['bytes_por_fila']:7.1f} B/fila  {resumen['segundos']:6.2f} s")
+    return resultados
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memoria de las representaciones de un resultado de ventas.")
+    parser.add_argument("--filas", type=int, default=1000000)
+    parser.add_argument("--clientes", type=int, default=100000,
+                        help="Cantidad de DNI distintos entre las ventas generadas.")
+    parser.add_argument("--representaciones", nargs="*", choices=list(REPRESENTACIONES),
+                        help="Medir solo estas representaciones.")
+    argumentos = parser.parse_args()
+
+    ejecutar_benchmark(argumentos.filas, argumentos.clientes, argumentos.representaciones)
@@ -0,0 +1,350 @@
+"""
+Módulo: busqueda_clientes.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y permite buscar clientes por nombre, apellido,
+email o teléfono, tolerando errores de tipeo y sin recorrer la tabla 'clientes' en cada búsqueda.
+
+La búsqueda usa un índice de trigramas en memoria: cada palabra de esos campos se descompone en
+secuencias de tres caracteres ('perez' -> '$pe', 'per', 'ere', 'rez', 'ez$'), y para cada trigrama
+se guarda la lista ordenada de clientes que lo contienen (un arreglo compacto de enteros). Una
+consulta se descompone de la misma forma y se puntúan los clientes según cuántos de sus trigramas
+comparten; el prefijo '$' permite encontrar también palabras incompletas ('Gonz').
+
+El índice se carga la primera vez que se busca, página por página, y luego se mantiene al día:
+'registrar_cliente', 'actualizar_cliente' y 'eliminar_cliente' lo actualizan al confirmar cada
+cambio, y antes de cada búsqueda (como mucho una vez cada INTERVALO_ACTUALIZACION segundos)
+'actualizar_indice()' incorpora los clientes agregados por otros procesos (importaciones, otras
+terminales). Los cambios hechos por otros procesos sobre clientes ya indexados se reflejan al
+reconstruirlo con 'reconstruir_indice()'.
+
+Modificar o eliminar un cliente deja obsoleta su entrada anterior. Cuando las entradas obsoletas
+superan FRACCION_OBSOLETOS_MAXIMA del índice, se compacta en memoria, sin volver a leer la base.
+"""
+
+import heapq
+import math
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+
+from conexion_base_de_datos import obtener_conexion
+from normalizacion import PATRON_PALABRA, normalizar_texto
+
+
+# Fracción mínima de los trigramas de la consulta que debe compartir un cliente para ser resultado.
+SIMILITUD_MINIMA = 0.5
+
+# Los trigramas presentes en más de esta fracción de los clientes ('com', 'ail' de los emails,
+# 'ez$' de los apellidos) casi no distinguen a un cliente de otro: se ignoran en la consulta
+# siempre que queden otros trigramas más selectivos.
+FRECUENCIA_MAXIMA = 0.05
+
+# Cantidad de resultados por defecto y de clientes leídos por página al cargar el índice.
+LIMITE_RESULTADOS = 10
+TAMANIO_PAGINA_CARGA = 5000
+
+# Segundos mínimos entre dos lecturas de los clientes nuevos antes de una búsqueda.
+INTERVALO_ACTUALIZACION = 2.0
+
+# Fracción de entradas obsoletas a partir de la cual se compacta el índice.
+FRACCION_OBSOLETOS_MAXIMA = 0.25
+
+# Consultas de este módulo; 'verificar_planes' revisa sus planes de ejecución.
+_CONSULTA_PAGINA = """
+    SELECT c.id_cliente, c.dni_cliente, c.nombre_cliente, c.apellido_cliente,
+           c.email_cliente, t.tel_cliente
+    FROM (SELECT id_cliente, dni_cliente, nombre_cliente, apellido_cliente, email_cliente
+          FROM clientes
+          WHERE id_cliente > %s
+          ORDER BY id_cliente
+          LIMIT %s) c
+    LEFT JOIN telefonos t ON c.dni_cliente = t.dni_cliente
+    ORDER BY c.id_cliente;
+"""
+_CONSULTA_CLIENTE = """
+    SELECT c.nombre_cliente, c.apellido_cliente, c.email_cliente, t.tel_cliente
+    FROM clientes c
+    LEFT JOIN telefonos t ON c.dni_cliente = t.dni_cliente
+    WHERE c.dni_cliente = %s;
+"""
+
+_bloqueo = threading.RLock()
+_cargado = False
+_ultimo_id = 0        # mayor id_cliente leído de la base
+_ultima_actualizacion = 0.0  # time.monotonic() de la última llamada a 'actualizar_indice'
+_documentos = []      # posición -> DNI del cliente, o None si la entrada quedó obsoleta
+_trigramas_por_doc = array("H")  # posición -> cantidad de trigramas distintos del cliente
+_posicion_por_dni = {}
+_indice = {}          # trigrama -> array('I') de posiciones, en orden creciente
+
+
+def trigramas(*textos):
+    """
+    Devuelve el conjunto de trigramas de los textos indicados.
+    Los teléfonos se indexan sin guiones, por lo que '351-1234567' y '3511234567' coinciden.
+    """
+    resultado = set()
+    for texto in textos:
+        if not texto:
+            continue
+        for palabra in PATRON_PALABRA.findall(normalizar_texto(texto).replace("-", "")):
+            marcada = f"${palabra}$"
+            for inicio in range(len(marcada) - 2):
+                resultado.add(marcada[inicio:inicio + 3])
+    return resultado
+
+
+def _agregar_documento(dni, nombre, apellido, email, telefonos):
+    """Indexa un cliente. Si el DNI ya estaba indexado, la entrada anterior queda obsoleta."""
+    _quitar_documento(dni)
+    posicion = len(_documentos)
+    claves = trigramas(nombre, apellido, email, *telefonos)
+    _documentos.append(dni)
+    _trigramas_por_doc.append(min(len(claves), 0xFFFF))
+    _posicion_por_dni[dni] = posicion
+    for clave in claves:
+        lista = _indice.get(clave)
+        if lista is None:
+            lista = _indice[clave] = array("I")
+        lista.append(posicion)
+
+
+def _quitar_documento(dni):
+    posicion = _posicion_por_dni.pop(dni, None)
+    if posicion is not None:
+        _documentos[posicion] = None
+        if len(_documentos) - len(_posicion_por_dni) > FRACCION_OBSOLETOS_MAXIMA * len(_documentos):
+            _compactar()
+
+
+def _compactar():
+    """
+    Descarta las entradas obsoletas y renumera las posiciones. La renumeración conserva el orden,
+    por lo que cada lista del índice sigue ordenada.
+    """
+    global _trigramas_por_doc
+    nuevas = array("I")
+    documentos = []
+    trigramas_por_doc = array("H")
+    for posicion, dni in enumerate(_documentos):
+        nuevas.append(len(documentos))
+        if dni is not None:
+            _posicion_por_dni[dni] = len(documentos)
+            documentos.append(dni)
+            trigramas_por_doc.append(_trigramas_por_doc[posicion])
+
+    for clave, lista in list(_indice.items()):
+        compactada = array("I", (nuevas[posicion] for posicion in lista if _documentos[posicion] is not None))
+        if compactada:
+            _indice[clave] = compactada
+        else:
+            del _indice[clave]
+    _documentos[:] = documentos
+    _trigramas_por_doc = trigramas_por_doc
+
+
+def _leer_clientes(conexion, desde_id):
+    """
+    Lee de a páginas los clientes con id_cliente mayor a 'desde_id', junto con sus teléfonos.
+
+    Yields:
+        tuple: (id_cliente, dni, nombre, apellido, email, [teléfonos]).
+    """
+    cursor = conexion.cursor()
+    try:
+        while True:
+            cursor.execute(_CONSULTA_PAGINA, (desde_id, TAMANIO_PAGINA_CARGA))
+            filas = cursor.fetchall()
+            if not filas:
+                return
+
+            actual = None
+            clientes_en_pagina = 0
+            for id_cliente, dni, nombre, apellido, email, telefono in filas:
+                if actual is None or actual[0] != id_cliente:
+                    if actual is not None:
+                        yield actual
+                    actual = (id_cliente, dni, nombre, apellido, email, [])
+                    clientes_en_pagina += 1
+                if telefono:
+                    actual[5].append(telefono)
+            yield actual
+
+            desde_id = actual[0]
+            if clientes_en_pagina < TAMANIO_PAGINA_CARGA:
+                return
+    finally:
+        cursor.close()
+
+
+def actualizar_indice(conexion=None):
+    """
+    Incorpora al índice los clientes registrados desde la última carga (todos, la primera vez).
+
+    Args:
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        int: Cantidad de clientes incorporados.
+    """
+    global _cargado, _ultimo_id, _ultima_actualizacion
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    incorporados = 0
+    try:
+        with _bloqueo:
+            for id_cliente, dni, nombre, apellido, email, telefonos in _leer_clientes(conexion, _ultimo_id):
+                _agregar_documento(dni, nombre, apellido, email, telefonos)
+                _ultimo_id = id_cliente
+                incorporados += 1
+            _cargado = True
+            _ultima_actualizacion = time.monotonic()
+    finally:
+        if propia:
+            conexion.close()
+    return incorporados
+
+
+def reconstruir_indice(conexion=None):
+    """
+    Descarta el índice y lo vuelve a cargar completo, eliminando las entradas obsoletas.
+
+    Returns:
+        int: Cantidad de clientes indexados.
+    """
+    global _cargado, _ultimo_id, _trigramas_por_doc
+    with _bloqueo:
+        _cargado = False
+        _ultimo_id = 0
+        _documentos.clear()
+        _trigramas_por_doc = array("H")
+        _posicion_por_dni.clear()
+        _indice.clear()
+        return actualizar_indice(conexion)
+
+
+def indexar_cliente(dni, nombre, apellido, email, telefonos=()):
+    """
+    Agrega o reemplaza un cliente en el índice, si el índice ya está cargado.
+    Debe llamarse después de confirmar el alta del cliente.
+    """
+    with _bloqueo:
+        if _cargado:
+            _agregar_documento(dni, nombre, apellido, email, telefonos)
+
+
+def reindexar_cliente(dni, dni_anterior=None, conexion=None):
+    """
+    Vuelve a leer un cliente de la base y actualiza su entrada en el índice, si el índice ya
+    está cargado. Debe llamarse después de confirmar una modificación del cliente.
+
+    Args:
+        dni (str): DNI actual del cliente.
+        dni_anterior (str | None): DNI previo, si la modificación cambió el DNI.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+    """
+    if not _cargado:
+        return
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(_CONSULTA_CLIENTE, (dni,))
+        filas = cursor.fetchall()
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    with _bloqueo:
+        if dni_anterior:
+            _quitar_documento(dni_anterior)
+        if filas:
+            nombre, apellido, email = filas[0][:3]
+            _agregar_documento(dni, nombre, apellido, email, [fila[3] for fila in filas if fila[3]])
+        else:
+            _quitar_documento(dni)
+
+
+def quitar_cliente(dni):
+    """Quita un cliente del índice. Debe llamarse después de confirmar su eliminación."""
+    with _bloqueo:
+        _quitar_documento(dni)
+
+
+def _contiene(lista, posicion):
+    indice = bisect_left(lista, posicion)
+    return indice < len(lista) and lista[indice] == posicion
+
+
+def buscar_clientes(texto, limite=LIMITE_RESULTADOS, conexion=None):
+    """
+    Busca clientes por nombre, apellido, email o teléfono, tolerando errores de tipeo.
+
+    Args:
+        texto (str): Texto a buscar (una o varias palabras, al menos dos caracteres).
+        limite (int): Cantidad máxima de resultados.
+        conexion: Conexión a reutilizar si hay que leer clientes nuevos de la base.
+
+    Returns:
+        list[tuple]: (dni, puntaje) ordenados de mayor a menor puntaje. El puntaje (0 a 1) es la
+        fracción de los trigramas selectivos de la consulta presentes en el cliente.
+    """
+    consulta = trigramas(texto)
+    if not consulta:
+        return []
+    if not _cargado or time.monotonic() - _ultima_actualizacion >= INTERVALO_ACTUALIZACION:
+        actualizar_indice(conexion)
+
+    with _bloqueo:
+        listas = sorted((_indice.get(clave, array("I")) for clave in consulta), key=len)
+        limite_frecuencia = FRECUENCIA_MAXIMA * len(_posicion_por_dni)
+        selectivas = [lista for lista in listas if len(lista) <= limite_frecuencia]
+        if any(selectivas):
+            listas = selectivas
+        minimo = max(1, math.ceil(len(listas) * SIMILITUD_MINIMA))
+
+        # Todo cliente con al menos 'minimo' coincidencias aparece en alguna de las
+        # len - minimo + 1 listas más cortas: solo esas se recorren completas.
+        cantidad_recorridas = len(listas) - minimo + 1
+        coincidencias = Counter()
+        for lista in listas[:cantidad_recorridas]:
+            coincidencias.update(lista)
+
+        restantes = listas[cantidad_recorridas:]
+        resultados = []
+        for posicion, cantidad in coincidencias.items():
+            dni = _documentos[posicion]
+            if dni is None:
+                continue
+            if cantidad + len(restantes) < minimo:
+                continue
+            cantidad += sum(1 for lista in restantes if _contiene(lista, posicion))
+            if cantidad < minimo:
+                continue
+            puntaje = cantidad / len(listas)
+            # A igual puntaje, primero los clientes con menos trigramas propios (coincidencia más exacta).
+            resultados.append((puntaje, -_trigramas_por_doc[posicion], dni))
+
+    return [(dni, round(puntaje, 3)) for puntaje, _, dni in heapq.nlargest(limite, resultados)]
+
+
+def estadisticas_indice():
+    """
+    Devuelve el tamaño del índice.
+
+    Returns:
+        dict: Clientes indexados, entradas obsoletas, trigramas distintos y posiciones almacenadas.
+    """
+    with _bloqueo:
+        return {
+            "cargado": _cargado,
+            "clientes": len(_posicion_por_dni),
+            "obsoletos": len(_documentos) - len(_posicion_por_dni),
+            "trigramas": len(_indice),
+            "posiciones": sum(len(lista) for lista in _indice.values()),
+        }
@@ -0,0 +1,117 @@
+"""
+Módulo: busqueda_destinos.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y permite encontrar destinos escribiendo el
+comienzo del nombre de la ciudad, la provincia o el país ('cord', 'rio neg', 'arg'), sin
+distinguir mayúsculas ni acentos, y detectar ciudades duplicadas ('Cordoba' y 'Córdoba').
+
+Sobre el catálogo de 'cache_destinos' se arma un índice de prefijos: la lista ordenada de todas
+las palabras de ciudad, provincia y país (normalizadas), con el destino al que pertenece cada una.
+Los destinos cuyas palabras empiezan con un prefijo ocupan un tramo contiguo de esa lista, que se
+ubica con búsqueda binaria ('bisect') sin recorrer el catálogo. El índice se vuelve a armar
+automáticamente cuando el catálogo se recarga o se invalida.
+"""
+
+import heapq
+import threading
+from array import array
+from bisect import bisect_left
+
+from cache_destinos import obtener_catalogo
+from normalizacion import PATRON_PALABRA, normalizar_texto
+
+
+# Cantidad máxima de destinos que devuelve el autocompletado por defecto.
+LIMITE_SUGERENCIAS = 20
+
+_bloqueo = threading.Lock()
+_catalogo_indexado = None
+_palabras = []         # palabras normalizadas, en orden
+_destinos = array("I")  # id_destino de cada palabra de '_palabras'
+_por_ciudad = {}       # (ciudad, provincia, país) normalizados -> [id_destino, ...]
+_clave_por_destino = {}  # id_destino -> (ciudad, provincia, país) normalizados
+
+
+def clave_ciudad(nombre_ciudad, provincia, pais):
+    """Clave de comparación de una ciudad: sin acentos, mayúsculas ni espacios de más."""
+    return tuple(" ".join(PATRON_PALABRA.findall(normalizar_texto(valor or "")))
+                 for valor in (nombre_ciudad, provincia, pais))
+
+
+def _indexar(catalogo):
+    """Arma el índice de prefijos y el de ciudades a partir del catálogo."""
+    global _catalogo_indexado, _palabras, _destinos, _por_ciudad, _clave_por_destino
+    entradas = set()
+    por_ciudad = {}
+    clave_por_destino = {}
+    for destino in catalogo.values():
+        clave = clave_por_destino[destino.id_destino] = clave_ciudad(destino.nombre_ciudad, destino.provincia, destino.pais)
+        por_ciudad.setdefault(clave, []).append(destino.id_destino)
+        for campo in clave:
+            for palabra in campo.split():
+                entradas.add((palabra, destino.id_destino))
+
+    ordenadas = sorted(entradas)
+    _palabras = [palabra for palabra, _ in ordenadas]
+    _destinos = array("I", (id_destino for _, id_destino in ordenadas))
+    _por_ciudad = por_ciudad
+    _clave_por_destino = clave_por_destino
+    _catalogo_indexado = catalogo
+
+
+def _actualizar(conexion):
+    """Rearma el índice si el catálogo se recargó o se invalidó desde la última vez."""
+    catalogo = obtener_catalogo(conexion)
+    with _bloqueo:
+        if catalogo is not _catalogo_indexado:
+            _indexar(catalogo)
+
+
+def _con_prefijo(prefijo):
+    """Conjunto de destinos con alguna palabra que empieza con 'prefijo'."""
+    desde = bisect_left(_palabras, prefijo)
+    hasta = bisect_left(_palabras, prefijo + "\uffff", desde)
+    return set(_destinos[desde:hasta])
+
+
+def autocompletar(texto, limite=LIMITE_SUGERENCIAS, conexion=None):
+    """
+    Busca los destinos cuya ciudad, provincia o país contienen palabras que empiezan con cada una
+    de las palabras escritas ('san ar' encuentra 'San Juan, Argentina' y 'Santa Fe, Argentina').
+
+    Args:
+        texto (str): Comienzo de una o varias palabras.
+        limite (int): Cantidad máxima de destinos a devolver.
+        conexion: Conexión a reutilizar si hay que cargar el catálogo.
+
+    Returns:
+        list[Destino]: Destinos del catálogo, ordenados por ciudad, provincia y país.
+    """
+    prefijos = PATRON_PALABRA.findall(normalizar_texto(texto))
+    if not prefijos:
+        return []
+
+    _actualizar(conexion)
+    with _bloqueo:
+        # Se empieza por el prefijo más largo, que suele ser el más selectivo.
+        prefijos.sort(key=len, reverse=True)
+        ids = _con_prefijo(prefijos[0])
+        for prefijo in prefijos[1:]:
+            if not ids:
+                break
+            ids &= _con_prefijo(prefijo)
+        primeros = heapq.nsmallest(limite, ids, key=lambda id_destino: (_clave_por_destino[id_destino], id_destino))
+        return [_catalogo_indexado[id_destino] for id_destino in primeros]
+
+
+def buscar_duplicados(nombre_ciudad, provincia, pais, conexion=None):
+    """
+    Busca destinos de la misma ciudad, ignorando mayúsculas, acentos y espacios de más.
+
+    Returns:
+        list[Destino]: Destinos de esa ciudad, o una lista vacía si no hay ninguno.
+    """
+    _actualizar(conexion)
+    with _bloqueo:
+        ids = _por_ciudad.get(clave_ciudad(nombre_ciudad, provincia, pais), ())
+        return [_catalogo_indexado[id_destino] for id_destino in ids]
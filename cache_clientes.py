@@ -0,0 +1,107 @@
+"""
+Módulo: cache_clientes.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y mantiene en memoria los registros de clientes
+consultados recientemente, indexados por DNI.
+
+La búsqueda de un cliente por DNI se repite en casi todas las operaciones (venta, modificación,
+cambio de estado, eliminación). La caché es acotada: conserva como máximo TAMANIO_CACHE_CLIENTES
+clientes y descarta primero los menos usados (LRU). Cada registro vence a los TTL_CLIENTES
+segundos, lo que acota el desfase ante cambios hechos por otros procesos (importaciones, otras
+terminales). Los cambios hechos por este proceso invalidan el registro en cuanto se confirman.
+
+Solo se guardan clientes existentes: un DNI no encontrado se vuelve a consultar cada vez, así un
+cliente recién registrado se encuentra de inmediato.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from conexion_base_de_datos import obtener_conexion
+from modelos import Cliente
+from sentencias import obtener_uno
+
+
+# Cantidad máxima de clientes en memoria y segundos durante los cuales un registro es vigente.
+TAMANIO_CACHE_CLIENTES = 10000
+TTL_CLIENTES = 60
+
+_clientes = OrderedDict()  # dni -> (momento de carga, Cliente)
+_generacion = 0
+_bloqueo = threading.Lock()
+_estadisticas = {"aciertos": 0, "fallos": 0, "expirados": 0, "desalojos": 0, "invalidaciones": 0}
+
+
+def obtener_cliente(dni_cliente, conexion=None):
+    """
+    Devuelve el registro de un cliente, consultando la base de datos solo si no está en memoria
+    o si venció su TTL.
+
+    Args:
+        dni_cliente (str): DNI del cliente.
+        conexion: Conexión abierta a reutilizar para la consulta. Si se omite, se toma una del pool.
+
+    Returns:
+        Cliente | None: Registro completo del cliente, o None si no existe.
+    """
+    with _bloqueo:
+        entrada = _clientes.get(dni_cliente)
+        if entrada is not None:
+            if time.monotonic() - entrada[0] < TTL_CLIENTES:
+                _clientes.move_to_end(dni_cliente)
+                _estadisticas["aciertos"] += 1
+                return entrada[1]
+            del _clientes[dni_cliente]
+            _estadisticas["expirados"] += 1
+        _estadisticas["fallos"] += 1
+        generacion = _generacion
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    try:
+        fila = obtener_uno(conexion, "cliente_por_dni", (dni_cliente,))
+    finally:
+        if propia:
+            conexion.close()
+
+    if fila is None:
+        return None
+    cliente = Cliente(*fila)
+    with _bloqueo:
+        # Si hubo una invalidación durante la consulta, lo leído puede estar desactualizado.
+        if generacion == _generacion:
+            _clientes[dni_cliente] = (time.monotonic(), cliente)
+            _clientes.move_to_end(dni_cliente)
+            while len(_clientes) > TAMANIO_CACHE_CLIENTES:
+                _clientes.popitem(last=False)
+                _estadisticas["desalojos"] += 1
+    return cliente
+
+
+def invalidar_cliente(*dnis):
+    """
+    Descarta de la memoria los clientes indicados, para que la próxima consulta los lea de la base.
+    Debe llamarse después de confirmar cualquier cambio sobre esos clientes (con el DNI anterior
+    y el nuevo si el cambio es de DNI).
+    """
+    global _generacion
+    with _bloqueo:
+        _generacion += 1
+        for dni in dnis:
+            _clientes.pop(dni, None)
+        _estadisticas["invalidaciones"] += 1
+
+
+def estadisticas_cache():
+    """
+    Devuelve los contadores de uso de la caché de clientes.
+
+    Returns:
+        dict: Aciertos, fallos, expirados, desalojos, invalidaciones y clientes en memoria.
+    """
+    with _bloqueo:
+        datos = dict(_estadisticas)
+        datos["clientes"] = len(_clientes)
+    return datos
@@ -0,0 +1,162 @@
+"""
+Módulo: cache_destinos.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y mantiene en memoria el catálogo de destinos
+(destinos unidos a sus ciudades), indexado por 'id_destino'.
+
+El catálogo cambia muy poco y se consulta en casi todas las operaciones de destinos y ventas,
+por lo que se lee una sola vez y se reutiliza hasta que vence su tiempo de vida (TTL) o hasta
+que una operación de escritura sobre destinos o ciudades lo invalida explícitamente.
+
+Un destino creado por otro proceso (otra terminal, una importación) no figura en el catálogo
+hasta que este vence. Por eso 'obtener_destino', si no encuentra un ID, lo busca en la base antes
+de darlo por inexistente y, si existe, invalida el catálogo.
+"""
+
+import threading
+import time
+
+from conexion_base_de_datos import obtener_conexion
+from modelos import Destino
+
+
+# Segundos durante los cuales el catálogo en memoria se considera vigente.
+TTL_CATALOGO = 300
+
+_CONSULTA_CATALOGO = f"""
+    SELECT {Destino.COLUMNAS}
+    FROM destinos d
+    JOIN ciudades c ON d.id_ciudad = c.id_ciudad
+    ORDER BY d.id_destino;
+"""
+_CONSULTA_DESTINO = f"""
+    SELECT {Destino.COLUMNAS}
+    FROM destinos d
+    JOIN ciudades c ON d.id_ciudad = c.id_ciudad
+    WHERE d.id_destino = %s;
+"""
+
+_catalogo = None
+_cargado_en = 0.0
+_generacion = 0
+_bloqueo = threading.Lock()
+_estadisticas = {"aciertos": 0, "fallos": 0, "invalidaciones": 0}
+_suscriptores = []
+
+
+def _cargar_catalogo(conexion):
+    """
+    Lee el catálogo completo desde la base de datos.
+
+    Returns:
+        dict: id_destino -> Destino, en orden de id_destino.
+    """
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(_CONSULTA_CATALOGO)
+        return {destino.id_destino: destino for destino in Destino.desde_filas(cursor.fetchall())}
+    finally:
+        cursor.close()
+
+
+def obtener_catalogo(conexion=None):
+    """
+    Devuelve el catálogo de destinos, consultando la base de datos solo si no está en memoria
+    o si venció su TTL.
+
+    Args:
+        conexion: Conexión abierta a reutilizar para la carga. Si se omite, se toma una del pool.
+
+    Returns:
+        dict: id_destino -> Destino.
+    """
+    global _catalogo, _cargado_en
+    with _bloqueo:
+        if _catalogo is not None and time.monotonic() - _cargado_en < TTL_CATALOGO:
+            _estadisticas["aciertos"] += 1
+            return _catalogo
+        _estadisticas["fallos"] += 1
+        generacion = _generacion
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    try:
+        catalogo = _cargar_catalogo(conexion)
+    finally:
+        if propia:
+            conexion.close()
+
+    with _bloqueo:
+        # Si hubo una invalidación durante la carga, lo leído puede estar desactualizado.
+        if generacion == _generacion:
+            _catalogo = catalogo
+            _cargado_en = time.monotonic()
+    return catalogo
+
+
+def _leer_destino(id_destino, conexion):
+    """Lee un único destino desde la base de datos, sin pasar por el catálogo."""
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(_CONSULTA_DESTINO, (id_destino,))
+        destinos = Destino.desde_filas(cursor.fetchall())
+        return destinos[0] if destinos else None
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+def obtener_destino(id_destino, conexion=None):
+    """
+    Busca un destino en el catálogo por su ID. Si no está, lo lee de la base de datos y, si
+    existe (lo creó otro proceso después de cargado el catálogo), invalida el catálogo.
+
+    Returns:
+        Destino | None: El destino, o None si no existe.
+    """
+    destino = obtener_catalogo(conexion).get(id_destino)
+    if destino is None:
+        destino = _leer_destino(id_destino, conexion)
+        if destino is not None:
+            invalidar_catalogo()
+    return destino
+
+
+def invalidar_catalogo():
+    """
+    Descarta el catálogo en memoria para que la próxima consulta lo lea de la base de datos.
+    Debe llamarse después de confirmar cualquier cambio sobre destinos o ciudades.
+    """
+    global _catalogo, _generacion
+    with _bloqueo:
+        _catalogo = None
+        _generacion += 1
+        _estadisticas["invalidaciones"] += 1
+        suscriptores = list(_suscriptores)
+    for funcion in suscriptores:
+        funcion()
+
+
+def al_invalidar(funcion):
+    """Registra una función sin argumentos que se ejecutará cada vez que se invalide el catálogo."""
+    with _bloqueo:
+        _suscriptores.append(funcion)
+    return funcion
+
+
+def estadisticas_cache():
+    """
+    Devuelve los contadores de uso del catálogo en memoria.
+
+    Returns:
+        dict: Aciertos, fallos, invalidaciones y cantidad de destinos cargados.
+    """
+    with _bloqueo:
+        datos = dict(_estadisticas)
+        datos["destinos"] = len(_catalogo) if _catalogo is not None else 0
+    return datos
@@ -0,0 +1,288 @@
+"""
+Módulo: carga_concurrente.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y simula muchos agentes de venta trabajando a
+la vez sobre una base de datos local, para encontrar los límites del sistema antes de una
+temporada alta.
+
+Cada agente es un proceso independiente, con su propio pool de una conexión, que durante el
+tiempo indicado ejecuta al azar operaciones de clientes, destinos y ventas según una mezcla
+ponderada. Las operaciones usan las mismas funciones no interactivas que los menús
+('registrar_cliente', 'actualizar_cliente', 'crear_destino', 'registrar_venta', 'cancelar_venta',
+'consultar_ventas', etc.). Al terminar se informa, por operación, el caudal total, la latencia
+(p50/p95/p99) y cuántas ejecuciones terminaron rechazadas por una regla de negocio, canceladas
+por un bloqueo de la base de datos o con otro error.
+
+Uso:
+    python carga_concurrente.py --agentes 8 --segundos 30
+    python carga_concurrente.py --motor mysql --agentes 200 --mezcla agregar_venta=60 anular_venta=20 listar_ventas=20
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from collections import Counter
+from datetime import datetime
+from threading import BrokenBarrierError
+
+import conexion_base_de_datos
+from cache_clientes import obtener_cliente
+from cache_destinos import obtener_catalogo
+from benchmark import formatear_dni, resumir_tiempos, sembrar_base
+from clientes import actualizar_cliente, registrar_cliente
+from destinos import crear_destino
+from ventas import ESTADOS_VIGENTES, MINUTOS_DE_ANULACION, VentaRechazadaError, cancelar_venta, \
+    consultar_ventas, registrar_venta
+
+
+# Peso relativo de cada operación en la mezcla por defecto.
+MEZCLA_POR_DEFECTO = {
+    "agregar_venta": 35,
+    "anular_venta": 10,
+    "listar_ventas": 20,
+    "consultar_cliente": 15,
+    "modificar_cliente": 10,
+    "agregar_cliente": 5,
+    "listar_destinos": 4,
+    "registrar_destino": 1,
+}
+
+# Errores de MySQL por bloqueos: bloqueo mutuo (ER_LOCK_DEADLOCK) y espera agotada (ER_LOCK_WAIT_TIMEOUT).
+_ERRORES_DE_BLOQUEO = (1213, 1205)
+
+# Mensajes de error distintos que se conservan por operación.
+MAXIMO_MENSAJES = 5
+
+# Segundos que se espera a que todos los agentes estén listos para comenzar.
+TIMEOUT_INICIO = 120
+
+
+def es_bloqueo(error):
+    """Indica si un error corresponde a una transacción cancelada por un bloqueo de la base de datos."""
+    if getattr(error, "errno", None) in _ERRORES_DE_BLOQUEO:
+        return True
+    return isinstance(error, sqlite3.OperationalError) and "locked" in str(error)
+
+
+def preparar_operaciones(numero, dnis, ids_destino, primer_dni_nuevo, aleatorio):
+    """
+    Arma las operaciones de un agente. Cada una es una función sin argumentos que ejecuta una vez
+    la operación correspondiente con datos elegidos al azar.
+
+    Los clientes y las ciudades que crea cada agente llevan su número, para que no choquen con
+    los de otros agentes. Las anulaciones se hacen sobre las ventas que el mismo agente registró
+    dentro de la ventana de anulación; si no tiene ninguna, registra una antes.
+
+    Returns:
+        dict: nombre de la operación -> función.
+    """
+    nuevos = iter(range(primer_dni_nuevo, 10 ** 9))
+    ventas_recientes = []
+    ventana = MINUTOS_DE_ANULACION * 60 - 5
+
+    def agregar_cliente():
+        i = next(nuevos)
+        registrar_cliente(formatear_dni(i), f"Agente{numero}", "Carga", f"Calle {i}",
+                          f"agente{numero}.{i}@correo.com", f"351-{i % 10 ** 7:07d}")
+
+    def consultar_cliente():
+        obtener_cliente(aleatorio.choice(dnis))
+
+    def modificar_cliente():
+        actualizar_cliente(aleatorio.choice(dnis), "direccion", f"Calle {aleatorio.randrange(100000)}")
+
+    def registrar_destino():
+        crear_destino(f"Ciudad Agente{numero} {next(nuevos)}", "Provincia", "Argentina", 100.0)
+
+    def listar_destinos():
+        obtener_catalogo()
+
+    def agregar_venta():
+        dni = aleatorio.choice(dnis)
+        id_venta = registrar_venta(dni, aleatorio.choice(ids_destino), aleatorio.randint(1, 4))
+        ventas_recientes.append((time.monotonic(), dni, id_venta))
+
+    def anular_venta():
+        while ventas_recientes and time.monotonic() - ventas_recientes[0][0] > ventana:
+            ventas_recientes.pop(0)
+        if not ventas_recientes:
+            dni = aleatorio.choice(dnis)
+            ventas_recientes.append((time.monotonic(), dni, registrar_venta(dni, aleatorio.choice(ids_destino), 1)))
+        _, dni, id_venta = ventas_recientes.pop()
+        cancelar_venta(dni, id_venta, "Carga concurrente")
+
+    def listar_ventas():
+        consultar_ventas(aleatorio.choice(dnis), ESTADOS_VIGENTES)
+
+    return {
+        "agregar_cliente": agregar_cliente,
+        "consultar_cliente": consultar_cliente,
+        "modificar_cliente": modificar_cliente,
+        "registrar_destino": registrar_destino,
+        "listar_destinos": listar_destinos,
+        "agregar_venta": agregar_venta,
+        "anular_venta": anular_venta,
+        "listar_ventas": listar_ventas,
+    }
+
+
+def _agente(numero, motor, ruta, mezcla, dnis, ids_destino, primer_dni_nuevo, segundos, inicio, resultados):
+    """
+    Proceso de un agente: se conecta, espera a que todos estén listos y ejecuta operaciones
+    hasta que se cumple el tiempo. Al terminar envía sus mediciones por la cola 'resultados'.
+    """
+    conexion_base_de_datos.configurar_motor(motor, ruta)
+    conexion_base_de_datos.configurar_pool(tamanio=1)
+    aleatorio = random.Random(numero)
+    operaciones = preparar_operaciones(numero, dnis, ids_destino, primer_dni_nuevo, aleatorio)
+    nombres = list(mezcla)
+    pesos = [mezcla[nombre] for nombre in nombres]
+    mediciones = {nombre: {"tiempos": [], "rechazos": 0, "bloqueos": 0, "errores": 0, "mensajes": Counter()}
+                  for nombre in nombres}
+
+    # La primera conexión y la carga del catálogo quedan fuera de la medición.
+    obtener_catalogo()
+    try:
+        inicio.wait(TIMEOUT_INICIO)
+    except BrokenBarrierError:
+        resultados.put((numero, None))
+        return
+
+    fin = time.monotonic() + segundos
+    while time.monotonic() < fin:
+        nombre = aleatorio.choices(nombres, pesos)[0]
+        medicion = mediciones[nombre]
+        comienzo = time.perf_counter()
+        try:
+            operaciones[nombre]()
+        except (VentaRechazadaError, ValueError):
+            medicion["rechazos"] += 1
+        except Exception as error:
+            if es_bloqueo(error):
+                medicion["bloqueos"] += 1
+            else:
+                medicion["errores"] += 1
+                medicion["mensajes"][f"{type(error).__name__}: {error}"] += 1
+        medicion["tiempos"].append(time.perf_counter() - comienzo)
+
+    for medicion in mediciones.values():
+        medicion["mensajes"] = dict(medicion["mensajes"].most_common(MAXIMO_MENSAJES))
+    resultados.put((numero, mediciones))
+
+
+def ejecutar_carga(agentes, segundos, mezcla, dnis, ids_destino):
+    """
+    Lanza los agentes, espera a que terminen y resume sus mediciones.
+
+    Returns:
+        dict: Por operación, cantidad de ejecuciones, ejecuciones por segundo (entre todos los
+        agentes), latencias, rechazos, bloqueos, errores y los mensajes de error más frecuentes.
+    """
+    contexto = multiprocessing.get_context("spawn")
+    inicio = contexto.Barrier(agentes + 1)
+    resultados = contexto.Queue()
+    # Cada agente crea clientes en su propio rango de DNI.
+    rango = (10 ** 9 - len(dnis) - 1) // agentes
+    procesos = [contexto.Process(target=_agente, args=(
+        numero, conexion_base_de_datos.motor_actual(), conexion_base_de_datos.RUTA_SQLITE, mezcla, dnis,
+        ids_destino, len(dnis) + 1 + numero * rango, segundos, inicio, resultados))
+        for numero in range(agentes)]
+    for proceso in procesos:
+        proceso.start()
+
+    try:
+        inicio.wait(TIMEOUT_INICIO)
+    except BrokenBarrierError:
+        for proceso in procesos:
+            proceso.terminate()
+        raise RuntimeError("No todos los agentes pudieron conectarse a la base de datos.")
+    comienzo = time.perf_counter()
+
+    # La cola se vacía antes de esperar a los procesos, que no terminan hasta entregar sus datos.
+    por_agente = [resultados.get() for _ in procesos]
+    duracion = time.perf_counter() - comienzo
+    for proceso in procesos:
+        proceso.join()
+
+    resumen = {}
+    for nombre in mezcla:
+        tiempos = []
+        total = {"rechazos": 0, "bloqueos": 0, "errores": 0}
+        mensajes = Counter()
+        for _, mediciones in por_agente:
+            if mediciones is None:
+                continue
+            medicion = mediciones[nombre]
+            tiempos.extend(medicion["tiempos"])
+            for clave in total:
+                total[clave] += medicion[clave]
+            mensajes.update(medicion["mensajes"])
+        if not tiempos:
+            continue
+        resumen[nombre] = resumir_tiempos(tiempos)
+        resumen[nombre]["ops_por_segundo"] = len(tiempos) / duracion
+        resumen[nombre].update(total)
+        resumen[nombre]["mensajes"] = dict(mensajes.most_common(MAXIMO_MENSAJES))
+    return resumen
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Carga concurrente de agentes de venta sobre SkyRoute.")
+    parser.add_argument("--motor", choices=conexion_base_de_datos.MOTORES, default="sqlite")
+    parser.add_argument("--ruta", help="Archivo SQLite a usar (por defecto, uno temporal).")
+    parser.add_argument("--agentes", type=int, default=8, help="Procesos que operan a la vez.")
+    parser.add_argument("--segundos", type=float, default=30.0)
+    parser.add_argument("--mezcla", nargs="*", metavar="OPERACION=PESO",
+                        help=f"Operaciones y pesos relativos (por defecto: "
+                             f"{' '.join(f'{n}={p}' for n, p in MEZCLA_POR_DEFECTO.items())}).")
+    parser.add_argument("--clientes", type=int, default=10000)
+    parser.add_argument("--destinos", type=int, default=200)
+    parser.add_argument("--ventas", type=int, default=50000)
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados.")
+    argumentos = parser.parse_args()
+
+    mezcla = MEZCLA_POR_DEFECTO
+    if argumentos.mezcla:
+        mezcla = {}
+        for elemento in argumentos.mezcla:
+            nombre, _, peso = elemento.partition("=")
+            if nombre not in MEZCLA_POR_DEFECTO:
+                parser.error(f"Operación desconocida '{nombre}'. Opciones: {', '.join(MEZCLA_POR_DEFECTO)}.")
+            mezcla[nombre] = float(peso or 1)
+
+    if argumentos.motor == "sqlite":
+        ruta = argumentos.ruta or os.path.join(tempfile.mkdtemp(prefix="skyroute_"), "carga.db")
+        conexion_base_de_datos.configurar_motor("sqlite", ruta)
+    else:
+        conexion_base_de_datos.configurar_motor("mysql")
+
+    inicio = time.perf_counter()
+    dnis, ids_destino = sembrar_base(argumentos.clientes, argumentos.destinos, argumentos.ventas)
+    print(f"Base cargada en {time.perf_counter() - inicio:.1f} s. "
+          f"{argumentos.agentes} agente(s) durante {argumentos.segundos:g} s.")
+
+    resumen = ejecutar_carga(argumentos.agentes, argumentos.segundos, mezcla, dnis, ids_destino)
+    for nombre, r in resumen.items():
+        print(f"{nombre:<18} {r['mediciones']:>8}  {r['ops_por_segundo']:9.1f} ops/s  "
+              f"p50 {r['p50_ms']:8.3f} ms  p95 {r['p95_ms']:8.3f} ms  p99 {r['p99_ms']:8.3f} ms  "
+              f"rechazos {r['rechazos']}  bloqueos {r['bloqueos']}  errores {r['errores']}")
+        for mensaje, cantidad in r["mensajes"].items():
+            print(f"    {cantidad} x {mensaje}")
+    print(f"{'total':<18} {sum(r['mediciones'] for r in resumen.values()):>8}  "
+          f"{sum(r['ops_por_segundo'] for r in resumen.values()):9.1f} ops/s")
+
+    if argumentos.salida:
+        with open(argumentos.salida, "w", encoding="utf-8") as archivo:
+            json.dump({
+                "fecha": datetime.now().isoformat(timespec="seconds"),
+                "motor": conexion_base_de_datos.motor_actual(),
+                "agentes": argumentos.agentes,
+                "segundos": argumentos.segundos,
+                "mezcla": mezcla,
+                "resultados": resumen,
+            }, archivo, indent=2)
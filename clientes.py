@@ -3,13 +3,54 @@ Módulo: clientes.py
 
 Este módulo forma parte del sistema SkyRoute S.A. y gestiona todas las operaciones relacionadas
 con los clientes de la aerolínea. Permite registrar, modificar, listar, dar de baja y eliminar clientes
-así como también asociar números de teléfono a cada uno de ellos.
+así como también asociar uno o más números de teléfono a cada uno de ellos.
 
 Las operaciones se realizan mediante conexión a una base de datos relacional.
 """
 
 import re
 from conexion_base_de_datos import obtener_conexion
+from sentencias import ejecutar
+from cache_clientes import obtener_cliente, invalidar_cliente
+from archivo_ventas import actualizar_dni_archivado
+from purga import purgar_cliente
+import busqueda_clientes
+
+
+# Cantidad de clientes por página en el listado paginado.
+TAMANIO_PAGINA_CLIENTES = 500
+
+# Formatos válidos de los datos de contacto de un cliente.
+PATRON_DNI = re.compile(r'^\d{3}\.\d{3}\.\d{3}$')
+PATRON_EMAIL = re.compile(r'^\S+@\S+\.\S+$')
+PATRON_TELEFONO = re.compile(r'^\d{3}-\d{7}$')
+
+# Consultas de este módulo que no están en 'sentencias'; 'verificar_planes' revisa sus planes.
+_CONSULTA_TELEFONOS = "SELECT tel_cliente FROM telefonos WHERE dni_cliente = %s;"
+_CONSULTA_LISTADO = """
+    SELECT c.nombre_cliente, c.apellido_cliente, c.dni_cliente,
+           c.email_cliente, c.dir_cliente, GROUP_CONCAT(t.tel_cliente), c.estado_de_cliente
+    FROM clientes c
+    LEFT JOIN telefonos t ON c.dni_cliente = t.dni_cliente
+    GROUP BY c.id_cliente, c.nombre_cliente, c.apellido_cliente, c.dni_cliente,
+             c.email_cliente, c.dir_cliente, c.estado_de_cliente
+    ORDER BY c.id_cliente;
+"""
+
+
+def es_dni_valido(dni):
+    """Indica si el DNI tiene el formato 111.111.111."""
+    return bool(PATRON_DNI.match(dni))
+
+
+def es_email_valido(email):
+    """Indica si el email tiene el formato ejemplo@correo.com."""
+    return bool(PATRON_EMAIL.match(email))
+
+
+def es_telefono_valido(telefono):
+    """Indica si el teléfono tiene el formato XXX-XXXXXXX."""
+    return bool(PATRON_TELEFONO.match(telefono))
 
 
 def gestion_de_clientes():
@@ -18,76 +59,183 @@ def gestion_de_clientes():
 
     Permite:
     1. Listar clientes registrados
-    2. Agregar un nuevo cliente
-    3. Modificar datos de un cliente
-    4. Marcar a un cliente como 'Inactivo'
-    5. Salir del menú
+    2. Listar clientes por páginas, con filtros opcionales
+    3. Agregar un nuevo cliente
+    4. Modificar datos de un cliente
+    5. Marcar a un cliente como 'Inactivo'
+    6. Buscar clientes por nombre, apellido, email o teléfono
+    7. Agregar teléfonos a un cliente existente
+    8. Salir del menú
 
     Utiliza funciones auxiliares para cada operación específica.
     """
     while True:
         print("GESTION DE CLIENTES")
         print("1. Listado de clientes")
-        print("2. Agregar cliente")
-        print("3. Modificar cliente")
-        print("4. Cambiar estado de cliente a 'Inactivo'")
-        print("5. Salir")
+        print("2. Listado paginado de clientes")
+        print("3. Agregar cliente")
+        print("4. Modificar cliente")
+        print("5. Cambiar estado de cliente a 'Inactivo'")
+        print("6. Buscar cliente")
+        print("7. Agregar teléfonos a un cliente")
+        print("8. Salir")
         opcion = input("Selecciona una opción: ")
 
         try:
             if opcion == "1":
                 listado_clientes()
             elif opcion == "2":
-                agregar_cliente()
+                listado_clientes_paginado()
             elif opcion == "3":
-                modificar_cliente()
+                agregar_cliente()
             elif opcion == "4":
-                cambiar_estado_de_cliente()
+                modificar_cliente()
             elif opcion == "5":
-                print("Saliendo de la gestión de clientes.") 
+                cambiar_estado_de_cliente()
+            elif opcion == "6":
+                buscar_cliente()
+            elif opcion == "7":
+                agregar_telefonos_a_cliente()
+            elif opcion == "8":
+                print("Saliendo de la gestión de clientes.")
                 break
             else:
-                print("Opción no válida. Por favor, selecciona una opción del 1 al 5.")
+                print("Opción no válida. Por favor, selecciona una opción del 1 al 8.")
         except Exception as e:
             print(f"Error en la gestión de clientes: {e}")
 
 
 def agregar_telefono():
     """
-    Solicita y valida un número de teléfono en formato XXX-XXXXXXX.
+    Solicita y valida uno o más números de teléfono en formato XXX-XXXXXXX, hasta que se
+    presiona Enter sin escribir ninguno.
 
     Retorna:
-        str: Número de teléfono validado.
+        list[str]: Números de teléfono validados, sin repetidos (al menos uno).
     """
-    telefono = input("Ingrese el número de teléfono del cliente (formato XXX-XXXXXXX): ").strip()
+    telefonos = []
 
     while True:
-        if re.match(r'^\d{3}-\d{7}$', telefono):
+        fin = ", Enter para terminar" if telefonos else ""
+        telefono = input(f"Ingrese el número de teléfono del cliente (formato XXX-XXXXXXX{fin}): ").strip()
+        if not telefono and telefonos:
             break
-        print("Teléfono inválido. Debe ser en formato XXX-XXXXXXX")
-        telefono = input("Ingrese el número de teléfono del cliente (formato XXX-XXXXXXX): ").strip()
+        if not es_telefono_valido(telefono):
+            print("Teléfono inválido. Debe ser en formato XXX-XXXXXXX")
+        elif telefono not in telefonos:
+            telefonos.append(telefono)
+
+    return telefonos
+
+
+def separar_telefonos(telefonos):
+    """Convierte los teléfonos agrupados con GROUP_CONCAT ('351-1234567,351-7654321') en una lista."""
+    return telefonos.split(",") if telefonos else []
+
+
+def _validar_telefonos(telefonos):
+    """
+    Acepta un teléfono o varios y los devuelve en una lista, sin espacios ni repetidos.
 
-    return telefono
+    Raises:
+        ValueError: Si no hay ningún teléfono o alguno no tiene un formato válido.
+    """
+    if isinstance(telefonos, str):
+        telefonos = [telefonos]
+    telefonos = list(dict.fromkeys(telefono.strip() for telefono in telefonos))
+    if not telefonos:
+        raise ValueError("Debe indicar al menos un teléfono.")
+    for telefono in telefonos:
+        if not es_telefono_valido(telefono):
+            raise ValueError(f"Teléfono inválido '{telefono}'. Debe ser en formato XXX-XXXXXXX")
+    return telefonos
+
+
+def _insertar_telefonos(cursor, dni, telefonos):
+    """Inserta los teléfonos de un cliente con un único INSERT de varias filas, sin confirmar."""
+    cursor.executemany("INSERT INTO telefonos (tel_cliente, dni_cliente) VALUES (%s, %s);",
+                       [(telefono, dni) for telefono in telefonos])
+
+
+def registrar_telefonos(dni_cliente, telefonos, conexion=None):
+    """
+    Agrega uno o más teléfonos a un cliente existente, en una sola transacción. Los teléfonos
+    que el cliente ya tiene registrados se omiten.
+
+    Args:
+        dni_cliente (str): DNI del cliente.
+        telefonos (str | iterable[str]): Teléfono o teléfonos en formato XXX-XXXXXXX.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        list[str]: Teléfonos agregados.
+
+    Raises:
+        ValueError: Si algún teléfono no tiene un formato válido o el cliente no existe.
+    """
+    telefonos = _validar_telefonos(telefonos)
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        if not obtener_cliente(dni_cliente, conexion):
+            raise ValueError(f"No existe un cliente con DNI {dni_cliente}.")
+        cursor.execute(_CONSULTA_TELEFONOS, (dni_cliente,))
+        existentes = {fila[0] for fila in cursor.fetchall()}
+        nuevos = [telefono for telefono in telefonos if telefono not in existentes]
+        if nuevos:
+            _insertar_telefonos(cursor, dni_cliente, nuevos)
+            conexion.commit()
+            busqueda_clientes.reindexar_cliente(dni_cliente, conexion=conexion)
+        return nuevos
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+def agregar_telefonos_a_cliente():
+    """
+    Solicita el DNI de un cliente y uno o más teléfonos, y los agrega a los que ya tiene.
+    """
+    dni_cliente = input("Ingrese el DNI del cliente: ").strip()
+    try:
+        if not obtener_cliente(dni_cliente):
+            print("No se encontró un cliente con ese DNI.")
+            return
+        agregados = registrar_telefonos(dni_cliente, agregar_telefono())
+        if agregados:
+            print(f"Se agregaron {len(agregados)} teléfono(s) al cliente con DNI {dni_cliente}.")
+        else:
+            print("El cliente ya tenía registrados esos teléfonos.")
+    except Exception as e:
+        print(f"Error al agregar los teléfonos: {e}")
 
 
 def listado_clientes():
     """
     Consulta y muestra en consola la lista de clientes registrados,
-    incluyendo su nombre, apellido, DNI, email, dirección, teléfono y estado.
+    incluyendo su nombre, apellido, DNI, email, dirección, teléfonos y estado.
+
+    Los teléfonos se agrupan en la base con GROUP_CONCAT, de modo que se lee una fila por cliente
+    aunque tenga varios teléfonos, y los clientes sin teléfono también aparecen.
     """
     conexion = obtener_conexion()
     cursor = conexion.cursor()
     print("A continuación se muestra la lista de los clientes.")
 
     try:
-        consulta = """SELECT c.nombre_cliente, c.apellido_cliente, c.dni_cliente, 
-                             c.email_cliente, c.dir_cliente, t.tel_cliente, c.estado_de_cliente
-                      FROM clientes c 
-                      JOIN telefonos t ON c.dni_cliente = t.dni_cliente;"""
-        cursor.execute(consulta)
+        cursor.execute(_CONSULTA_LISTADO)
         resultado = cursor.fetchall()
         for cliente in resultado:
-            print(f"Nombre: {cliente[0]}, Apellido: {cliente[1]}, DNI: {cliente[2]}, Email: {cliente[3]}, Dirección: {cliente[4]}, Teléfono: {cliente[5]}, Estado: {cliente[6]}")
+            telefonos = ", ".join(separar_telefonos(cliente[5])) or "-"
+            print(f"Nombre: {cliente[0]}, Apellido: {cliente[1]}, DNI: {cliente[2]}, Email: {cliente[3]}, Dirección: {cliente[4]}, Teléfonos: {telefonos}, Estado: {cliente[6]}")
     except Exception as e:
         print(f"Error al consultar los clientes: {e}")
     finally:
@@ -95,13 +243,215 @@ def listado_clientes():
         conexion.close()
 
 
-def agregar_cliente():
+def _consulta_de_pagina(estado=None, prefijo_dni=None):
     """
-    Solicita los datos de un nuevo cliente, valida el formato y lo registra en la base de datos.
-    También solicita el número de teléfono y lo registra en la tabla correspondiente.
+    Arma la consulta de una página de 'iterar_clientes' con sus filtros.
+
+    Returns:
+        tuple: (sql, parámetros de los filtros). La consulta espera, además, el último
+        'id_cliente' leído antes de los filtros y el tamaño de página después.
+    """
+    filtros = ""
+    parametros_filtro = []
+    if estado:
+        filtros += " AND estado_de_cliente = %s"
+        parametros_filtro.append(estado)
+    if prefijo_dni:
+        filtros += " AND dni_cliente LIKE %s ESCAPE '!'"
+        prefijo = prefijo_dni.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+        parametros_filtro.append(prefijo + "%")
+
+    sql = f"""
+        SELECT c.id_cliente, c.nombre_cliente, c.apellido_cliente, c.dni_cliente,
+               c.email_cliente, c.dir_cliente, GROUP_CONCAT(t.tel_cliente), c.estado_de_cliente
+        FROM (SELECT id_cliente, nombre_cliente, apellido_cliente, dni_cliente,
+                     email_cliente, dir_cliente, estado_de_cliente
+              FROM clientes
+              WHERE id_cliente > %s{filtros}
+              ORDER BY id_cliente
+              LIMIT %s) c
+        LEFT JOIN telefonos t ON c.dni_cliente = t.dni_cliente
+        GROUP BY c.id_cliente, c.nombre_cliente, c.apellido_cliente, c.dni_cliente,
+                 c.email_cliente, c.dir_cliente, c.estado_de_cliente
+        ORDER BY c.id_cliente;
+    """
+    return sql, parametros_filtro
+
+
+def iterar_clientes(tamanio_pagina=TAMANIO_PAGINA_CLIENTES, estado=None, prefijo_dni=None):
+    """
+    Recorre los clientes registrados página por página, sin cargar la tabla completa en memoria.
+
+    Usa paginación por clave (id_cliente > último id leído) en lugar de OFFSET, por lo que cada
+    página cuesta lo mismo sin importar cuán avanzado esté el recorrido. Cada página trae una fila
+    por cliente (los teléfonos se agrupan con GROUP_CONCAT) y se lee con su propia conexión del
+    pool, que se devuelve antes de entregar las filas: quien recorre puede detenerse entre
+    páginas, por ejemplo esperando al usuario, sin retener una conexión ni una transacción.
+
+    Args:
+        tamanio_pagina (int): Cantidad de clientes por página.
+        estado (str | None): Si se indica, solo clientes con ese estado ('Activo' o 'Inactivo').
+        prefijo_dni (str | None): Si se indica, solo clientes cuyo DNI comienza con ese texto.
+
+    Yields:
+        tuple: (nombre, apellido, dni, email, dirección, teléfonos, estado). 'teléfonos' es una
+        lista, vacía si el cliente no tiene ninguno registrado.
+
+    Raises:
+        ConnectionError: Si no se pudo obtener una conexión para leer una página.
+    """
+    if tamanio_pagina < 1:
+        raise ValueError("El tamaño de página debe ser al menos 1.")
+
+    consulta, parametros_filtro = _consulta_de_pagina(estado, prefijo_dni)
+
+    ultimo_id = 0
+    while True:
+        conexion = obtener_conexion()
+        if conexion is None:
+            raise ConnectionError("No se pudo obtener una conexión a la base de datos.")
+        cursor = conexion.cursor()
+        try:
+            cursor.execute(consulta, (ultimo_id, *parametros_filtro, tamanio_pagina))
+            pagina = cursor.fetchall()
+        finally:
+            cursor.close()
+            conexion.close()
+
+        for id_cliente, nombre, apellido, dni, email, direccion, telefonos, estado in pagina:
+            ultimo_id = id_cliente
+            yield nombre, apellido, dni, email, direccion, separar_telefonos(telefonos), estado
+        if len(pagina) < tamanio_pagina:
+            break
+
+
+def listado_clientes_paginado():
+    """
+    Muestra los clientes de a una página por vez, con filtros opcionales por estado y
+    prefijo de DNI. La primera página se muestra sin esperar a leer el resto de la tabla.
+    """
+    estado = input("Filtrar por estado (Activo/Inactivo, Enter para todos): ").strip().title() or None
+    prefijo_dni = input("Filtrar por prefijo de DNI (Enter para todos): ").strip() or None
+    tamanio = input(f"Clientes por página (Enter para {TAMANIO_PAGINA_CLIENTES}): ").strip()
+    tamanio_pagina = int(tamanio) if tamanio else TAMANIO_PAGINA_CLIENTES
+
+    clientes = iterar_clientes(tamanio_pagina, estado, prefijo_dni)
+    try:
+        mostrados = 0
+        for cliente in clientes:
+            telefonos = ", ".join(cliente[5]) or "-"
+            print(f"Nombre: {cliente[0]}, Apellido: {cliente[1]}, DNI: {cliente[2]}, Email: {cliente[3]}, Dirección: {cliente[4]}, Teléfonos: {telefonos}, Estado: {cliente[6]}")
+            mostrados += 1
+            if mostrados % tamanio_pagina == 0:
+                if input("Enter para ver la página siguiente, 'q' para salir: ").strip().lower() == "q":
+                    break
+        if mostrados == 0:
+            print("No hay clientes que cumplan los filtros indicados.")
+    except Exception as e:
+        print(f"Error al consultar los clientes: {e}")
+    finally:
+        clientes.close()
+
+
+def _consulta_por_dnis(cantidad):
+    """Consulta de 'buscar_cliente' con los datos y teléfonos de 'cantidad' clientes, por DNI."""
+    return f"""
+        SELECT c.nombre_cliente, c.apellido_cliente, c.dni_cliente, c.email_cliente,
+               GROUP_CONCAT(t.tel_cliente), c.estado_de_cliente
+        FROM clientes c
+        LEFT JOIN telefonos t ON c.dni_cliente = t.dni_cliente
+        WHERE c.dni_cliente IN ({", ".join(["%s"] * cantidad)})
+        GROUP BY c.dni_cliente, c.nombre_cliente, c.apellido_cliente, c.email_cliente, c.estado_de_cliente;
+    """
+
+
+def buscar_cliente():
     """
+    Busca clientes por nombre, apellido, email o teléfono (admite palabras incompletas y errores
+    de tipeo) y muestra los más parecidos, del más al menos parecido.
+    """
+    texto = input("Ingrese nombre, apellido, email o teléfono a buscar: ").strip()
+    if len(texto) < 2:
+        print("Ingrese al menos 2 caracteres.")
+        return
+
     conexion = obtener_conexion()
     cursor = conexion.cursor()
+
+    try:
+        resultados = busqueda_clientes.buscar_clientes(texto, conexion=conexion)
+        if not resultados:
+            print("No se encontraron clientes parecidos.")
+            return
+
+        dnis = [dni for dni, _ in resultados]
+        cursor.execute(_consulta_por_dnis(len(dnis)), dnis)
+        por_dni = {cliente[2]: cliente for cliente in cursor.fetchall()}
+
+        for dni, puntaje in resultados:
+            cliente = por_dni.get(dni)
+            if cliente:
+                telefonos = ", ".join(separar_telefonos(cliente[4])) or "-"
+                print(f"Nombre: {cliente[0]}, Apellido: {cliente[1]}, DNI: {cliente[2]}, Email: {cliente[3]}, Teléfonos: {telefonos}, Estado: {cliente[5]} (coincidencia {puntaje:.0%})")
+    except Exception as e:
+        print(f"Error al buscar clientes: {e}")
+    finally:
+        cursor.close()
+        conexion.close()
+
+
+def registrar_cliente(dni, nombre, apellido, direccion, email, telefonos, conexion=None):
+    """
+    Registra un cliente y sus teléfonos en una sola transacción, sin interacción con el usuario.
+
+    Los datos se normalizan y validan con las mismas reglas que el formulario de 'agregar_cliente'.
+
+    Args:
+        telefonos (str | iterable[str]): Teléfono o teléfonos del cliente, en formato XXX-XXXXXXX.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Raises:
+        ValueError: Si el DNI, el email o algún teléfono no tienen un formato válido.
+    """
+    dni = dni.strip()
+    email = email.strip().lower()
+    if not es_dni_valido(dni):
+        raise ValueError("DNI inválido. Debe ser en formato 111.111.111")
+    if not es_email_valido(email):
+        raise ValueError("Email inválido. Formato esperado: ejemplo@correo.com")
+    telefonos = _validar_telefonos(telefonos)
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    nombre = nombre.strip().title()
+    apellido = apellido.strip().title()
+
+    try:
+        cursor.execute("""
+            INSERT INTO clientes (dni_cliente, dir_cliente, nombre_cliente, apellido_cliente, email_cliente)
+            VALUES (%s, %s, %s, %s, %s);
+        """, (dni, direccion.strip().title(), nombre, apellido, email))
+        _insertar_telefonos(cursor, dni, telefonos)
+        conexion.commit()
+        busqueda_clientes.indexar_cliente(dni, nombre, apellido, email, telefonos)
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+def agregar_cliente():
+    """
+    Solicita los datos de un nuevo cliente, valida el formato y lo registra en la base de datos.
+    También solicita uno o más números de teléfono y los registra en la tabla correspondiente.
+    El cliente y sus teléfonos se guardan juntos: si uno falla, no se guarda ninguno.
+    """
     print("A continuación se muestra el formulario para agregar un cliente.")
 
     nombre = input("Ingrese el nombre del cliente: ").strip().title()
@@ -110,40 +460,87 @@ def agregar_cliente():
 
     while True:
         email = input("Ingrese el email del cliente: ").strip().lower()
-        if re.match(r'^\S+@\S+\.\S+$', email):
+        if es_email_valido(email):
             break
         print("Email inválido. Formato esperado: ejemplo@correo.com")
 
     while True:
         dni = input("Ingrese el DNI del cliente (formato 111.111.111): ").strip()
-        if re.match(r'^\d{3}\.\d{3}\.\d{3}$', dni):
+        if es_dni_valido(dni):
             break
         print("DNI inválido. Debe ser en formato 111.111.111")
 
-    try: 
-        consulta = """
-            INSERT INTO clientes (dni_cliente, dir_cliente, nombre_cliente, apellido_cliente, email_cliente)
-            VALUES (%s, %s, %s, %s, %s);
-        """
-        valores = (dni, direccion, nombre, apellido, email)
-        cursor.execute(consulta, valores)
-        conexion.commit()
-        print("Cliente agregado correctamente.")
-        
-        telefono = agregar_telefono()
-        consulta_telefono = """
-            INSERT INTO telefonos (tel_cliente, dni_cliente)
-            VALUES (%s, %s);
-        """
-        cursor.execute(consulta_telefono, (telefono, dni))
-        conexion.commit()
-        print("Teléfono agregado correctamente.")
+    telefonos = agregar_telefono()
 
+    try:
+        registrar_cliente(dni, nombre, apellido, direccion, email, telefonos)
+        print("Cliente agregado correctamente.")
+        print(f"{len(telefonos)} teléfono(s) agregado(s) correctamente.")
     except Exception as e:
         print(f"Error al agregar el cliente: {e}")
+
+
+# Columna de la tabla 'clientes' que corresponde a cada dato modificable.
+COLUMNAS_MODIFICABLES = {
+    "nombre": "nombre_cliente",
+    "apellido": "apellido_cliente",
+    "dni": "dni_cliente",
+    "email": "email_cliente",
+    "direccion": "dir_cliente",
+}
+
+
+def actualizar_cliente(dni_cliente, dato, valor, conexion=None):
+    """
+    Modifica un dato de un cliente sin interacción con el usuario.
+
+    Args:
+        dni_cliente (str): DNI actual del cliente.
+        dato (str): 'nombre', 'apellido', 'dni', 'email' o 'direccion'.
+        valor (str): Nuevo valor; se normaliza y valida como en 'modificar_cliente'.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        bool: True si se modificó el cliente.
+
+    Raises:
+        ValueError: Si el dato no es modificable o el nuevo valor no tiene un formato válido.
+    """
+    if dato not in COLUMNAS_MODIFICABLES:
+        raise ValueError(f"Dato no modificable '{dato}'.")
+    valor = valor.strip()
+    if dato in ("nombre", "apellido", "direccion"):
+        valor = valor.title()
+    elif dato == "email":
+        valor = valor.lower()
+        if not es_email_valido(valor):
+            raise ValueError("Email inválido. Formato esperado: ejemplo@correo.com")
+    elif not es_dni_valido(valor):
+        raise ValueError("DNI inválido. Debe ser en formato 111.111.111")
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+
+    try:
+        modificado = ejecutar(conexion, f"actualizar_cliente_{dato}", (valor, dni_cliente)).rowcount > 0
+        if modificado and dato == "dni":
+            actualizar_dni_archivado(conexion, dni_cliente, valor)
+        conexion.commit()
+        # Un cambio de DNI también invalida el DNI nuevo, por si quedó registrado como otro cliente.
+        if dato == "dni":
+            invalidar_cliente(dni_cliente, valor)
+            busqueda_clientes.reindexar_cliente(valor, dni_cliente, conexion)
+        else:
+            invalidar_cliente(dni_cliente)
+            busqueda_clientes.reindexar_cliente(dni_cliente, conexion=conexion)
+        return modificado
+    except Exception:
+        conexion.rollback()
+        raise
     finally:
-        cursor.close()
-        conexion.close()
+        if propia:
+            conexion.close()
 
 
 def modificar_cliente():
@@ -152,90 +549,108 @@ def modificar_cliente():
     Se identifica al cliente por su DNI y se puede modificar nombre, apellido, email, dirección o DNI.
     """
     conexion = obtener_conexion()
-    cursor = conexion.cursor()
 
     try:
         dni_cliente = input("Ingrese el DNI del cliente que desea modificar (formato 111.111.111): ").strip()
-        consulta = "SELECT * FROM clientes WHERE dni_cliente = %s;"
-        cursor.execute(consulta, (dni_cliente,))
-        cliente = cursor.fetchone()
+        cliente = obtener_cliente(dni_cliente, conexion)
 
         if not cliente:
             print("Cliente no encontrado.")
             return
 
-        print(f"DNI: {cliente[1]}, Nombre: {cliente[3]}, Apellido: {cliente[4]}, Email: {cliente[5]}, Dirección: {cliente[2]}")
+        print(f"DNI: {cliente.dni_cliente}, Nombre: {cliente.nombre_cliente}, Apellido: {cliente.apellido_cliente}, Email: {cliente.email_cliente}, Dirección: {cliente.dir_cliente}")
         modificar = input("Escribe el dato que deseas modificar: nombre, apellido, dni, email o dirección: ").lower()
 
         if modificar == "nombre":
             nuevo_nombre = input("Ingrese el nuevo nombre: ").strip().title()
-            cursor.execute("UPDATE clientes SET nombre_cliente = %s WHERE dni_cliente = %s;", (nuevo_nombre, dni_cliente))
+            actualizar_cliente(dni_cliente, "nombre", nuevo_nombre, conexion)
 
         elif modificar == "apellido":
             nuevo_apellido = input("Ingrese el nuevo apellido: ").strip().title()
-            cursor.execute("UPDATE clientes SET apellido_cliente = %s WHERE dni_cliente = %s;", (nuevo_apellido, dni_cliente))
+            actualizar_cliente(dni_cliente, "apellido", nuevo_apellido, conexion)
 
         elif modificar == "dni":
             while True:
                 nuevo_dni = input("Ingrese el nuevo DNI (formato 111.111.111): ").strip()
-                if re.match(r'^\d{3}\.\d{3}\.\d{3}$', nuevo_dni):
+                if es_dni_valido(nuevo_dni):
                     break
                 print("DNI inválido. Intente nuevamente.")
-            cursor.execute("UPDATE clientes SET dni_cliente = %s WHERE dni_cliente = %s;", (nuevo_dni, dni_cliente))
+            actualizar_cliente(dni_cliente, "dni", nuevo_dni, conexion)
+            dni_cliente = nuevo_dni
 
         elif modificar in ["email", "mail"]:
             while True:
                 nuevo_email = input("Ingrese el nuevo email: ").strip().lower()
-                if re.match(r'^\S+@\S+\.\S+$', nuevo_email):
+                if es_email_valido(nuevo_email):
                     break
                 print("Email inválido. Intente nuevamente.")
-            cursor.execute("UPDATE clientes SET email_cliente = %s WHERE dni_cliente = %s;", (nuevo_email, dni_cliente))
+            actualizar_cliente(dni_cliente, "email", nuevo_email, conexion)
 
         elif modificar in ["dirección", "direccion"]:
             nueva_direccion = input("Ingrese la nueva dirección: ").strip().title()
-            cursor.execute("UPDATE clientes SET dir_cliente = %s WHERE dni_cliente = %s;", (nueva_direccion, dni_cliente))
+            actualizar_cliente(dni_cliente, "direccion", nueva_direccion, conexion)
 
         else:
             print("Opción no válida.")
             return
 
-        conexion.commit()
         print(f"El cliente con DNI {dni_cliente} ha sido modificado correctamente.")
-        cursor.execute("SELECT * FROM clientes WHERE dni_cliente = %s;", (dni_cliente,))
-        cliente_modificado = cursor.fetchone()
+        cliente_modificado = obtener_cliente(dni_cliente, conexion)
         print("Datos actualizados:")
-        print(f"DNI: {cliente_modificado[1]}, Nombre: {cliente_modificado[3]}, Apellido: {cliente_modificado[4]}, Email: {cliente_modificado[5]}, Dirección: {cliente_modificado[2]}")
+        print(f"DNI: {cliente_modificado.dni_cliente}, Nombre: {cliente_modificado.nombre_cliente}, Apellido: {cliente_modificado.apellido_cliente}, Email: {cliente_modificado.email_cliente}, Dirección: {cliente_modificado.dir_cliente}")
 
     except Exception as e:
         print(f"Error al modificar el cliente: {e}")
     finally:
-        cursor.close()
         conexion.close()
 
 
+def desactivar_cliente(dni_cliente, conexion=None):
+    """
+    Marca a un cliente como 'Inactivo' sin interacción con el usuario.
+
+    Args:
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        bool: True si existe un cliente con ese DNI.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+
+    try:
+        cliente = obtener_cliente(dni_cliente, conexion)
+        if not cliente:
+            return False
+        ejecutar(conexion, "desactivar_cliente", (cliente.id_cliente,))
+        conexion.commit()
+        invalidar_cliente(dni_cliente)
+        return True
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        if propia:
+            conexion.close()
+
+
 def cambiar_estado_de_cliente():
     """
     Cambia el estado de un cliente a 'Inactivo', previa confirmación del usuario.
     Requiere el DNI del cliente para identificarlo en la base de datos.
     """
     conexion = obtener_conexion()
-    cursor = conexion.cursor()
-    
+
     try:
         dni_cliente = input("Ingrese el DNI del cliente que desea marcar como 'Inactivo': ")
-        cursor.execute("SELECT * FROM clientes WHERE dni_cliente = %s;", (dni_cliente,))
-        cursor.fetchone()
+        cliente = obtener_cliente(dni_cliente, conexion)
 
-        if cursor.rowcount > 0:
+        if cliente:
             confirmar = input("¿Está seguro de que desea marcar este cliente como 'Inactivo'? (Si/No): ")
             if confirmar.lower() in ["s", "si"]:
-                cursor.execute("SELECT id_cliente FROM clientes WHERE dni_cliente = %s;", (dni_cliente,))
-                resultado = cursor.fetchone()
-                if resultado:
-                    id_cliente = resultado[0]
-                    cursor.execute("UPDATE clientes SET estado_de_cliente = 'Inactivo' WHERE id_cliente = %s;", (id_cliente,))
-                    conexion.commit()
-                    print(f"El cliente con DNI {dni_cliente} ha sido marcado como 'Inactivo'.")
+                desactivar_cliente(dni_cliente, conexion)
+                print(f"El cliente con DNI {dni_cliente} ha sido marcado como 'Inactivo'.")
             else:
                 print("Operación cancelada.")
         else:
@@ -244,30 +659,27 @@ def cambiar_estado_de_cliente():
     except Exception as e:
         print(f"Error al cambiar el estado del cliente: {e}")
     finally:
-        cursor.close()
         conexion.close()
 
 
 def eliminar_cliente():
     """
-    Elimina un cliente de la base de datos de forma definitiva.
+    Elimina un cliente de la base de datos de forma definitiva, junto con sus ventas (ver 'purga').
     Solo se debe utilizar en casos especiales, bajo consentimiento explícito del cliente.
     """
     conexion = obtener_conexion()
-    cursor = conexion.cursor()
-    
+
     try:
         dni_cliente = input("Ingrese el DNI del cliente que desea eliminar: ")
-        cursor.execute("SELECT * FROM clientes WHERE dni_cliente = %s;", (dni_cliente,))
-        cliente = cursor.fetchone()
+        cliente = obtener_cliente(dni_cliente, conexion)
 
         if cliente:
-            print(f"DNI: {cliente[1]}, Nombre: {cliente[3]}, Apellido: {cliente[4]}, Email: {cliente[5]}, Dirección: {cliente[2]}")
+            print(f"DNI: {cliente.dni_cliente}, Nombre: {cliente.nombre_cliente}, Apellido: {cliente.apellido_cliente}, Email: {cliente.email_cliente}, Dirección: {cliente.dir_cliente}")
             confirmar = input("¿Está seguro de que desea eliminar este cliente? (s/n): ")
             if confirmar.lower() in ["s", "si"]:
-                cursor.execute("DELETE FROM clientes WHERE dni_cliente = %s;", (dni_cliente,))
-                conexion.commit()
-                print(f"El cliente con DNI {dni_cliente} ha sido eliminado correctamente.")
+                eliminadas = purgar_cliente(dni_cliente, al_avanzar=lambda n: print(f"{n} ventas eliminadas..."),
+                                            conexion=conexion)
+                print(f"El cliente con DNI {dni_cliente} ha sido eliminado correctamente ({eliminadas} venta(s) eliminada(s)).")
             else:
                 print("Operación cancelada.")
         else:
@@ -276,5 +688,4 @@ def eliminar_cliente():
     except Exception as e:
         print(f"Error al eliminar el cliente: {e}")
     finally:
-        cursor.close()
         conexion.close()
@@ -1,31 +1,379 @@
 """
 Módulo: conexion_base_de_datos.py
 
-Este módulo contiene la función necesaria para establecer conexión con la base de datos MySQL
+Este módulo contiene las funciones necesarias para establecer conexión con la base de datos
 utilizada en el sistema SkyRoute S.A.
 
-La configuración de conexión (host, usuario, contraseña, base de datos, etc.) se importa
+El motor por defecto es MySQL. También puede usarse una base SQLite embebida (ver 'motor_sqlite.py'),
+eligiéndola con la variable de entorno SKYROUTE_MOTOR=sqlite (y SKYROUTE_SQLITE con la ruta del
+archivo) o llamando a 'configurar_motor("sqlite", ruta)'. El resto de los módulos no cambia.
+
+Las conexiones se administran mediante un pool: en lugar de abrir un socket nuevo (con su
+handshake TCP y de autenticación) en cada operación, se reutilizan conexiones ya abiertas.
+Las conexiones entregadas por 'obtener_conexion' vuelven al pool al llamar a 'close()' o al
+salir de un bloque 'with', por lo que el código existente no necesita cambios.
+
+La configuración de conexión a MySQL (host, usuario, contraseña, base de datos, etc.) se importa
 desde el módulo 'config.py'.
 """
 
-import mysql.connector
-from config import config
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+import instrumentacion
+import motor_sqlite
+
+try:
+    import mysql.connector
+except ImportError:  # Solo es obligatorio cuando se usa el motor MySQL.
+    mysql = None
+
+try:
+    from config import config
+except ImportError:
+    config = None
+
+
+MOTORES = ("mysql", "sqlite")
+
+# Motor de base de datos en uso y archivo de la base embebida.
+MOTOR = os.environ.get("SKYROUTE_MOTOR", "mysql").lower()
+RUTA_SQLITE = os.environ.get("SKYROUTE_SQLITE", "skyroute.db")
+
+
+# Parámetros por defecto del pool (modificables con 'configurar_pool').
+TAMANIO_POOL = 5
+VIDA_MAXIMA_CONEXION = 1800     # segundos que puede vivir una conexión antes de renovarse
+TIMEOUT_POOL = 10               # segundos de espera cuando todas las conexiones están en uso
+VERIFICAR_TRAS_INACTIVIDAD = 2  # segundos de inactividad a partir de los cuales se hace ping
+
+
+class PoolAgotadoError(Exception):
+    """Se lanza cuando no se libera ninguna conexión dentro del tiempo de espera del pool."""
+
+
+class _EntradaPool:
+    """Conexión física administrada por el pool junto con sus marcas de tiempo."""
+
+    __slots__ = ("conexion", "creada_en", "liberada_en", "datos")
+
+    def __init__(self, conexion):
+        self.conexion = conexion
+        self.creada_en = time.monotonic()
+        self.liberada_en = self.creada_en
+        # Estado asociado a la conexión física (p. ej. sus sentencias preparadas).
+        self.datos = {}
+
+
+class ConexionAgrupada:
+    """
+    Envoltorio de una conexión del pool.
+
+    Delega todos los atributos en la conexión real, salvo 'close()', que devuelve la conexión
+    al pool en lugar de cerrarla. También puede usarse como gestor de contexto:
+
+        with obtener_conexion() as conexion:
+            cursor = conexion.cursor()
+            ...
+    """
+
+    def __init__(self, pool, entrada):
+        self._pool = pool
+        self._entrada = entrada
+
+    def __getattr__(self, nombre):
+        entrada = self.__dict__.get("_entrada")
+        if entrada is None:
+            raise AttributeError(f"La conexión ya fue devuelta al pool (atributo '{nombre}').")
+        return getattr(entrada.conexion, nombre)
+
+    @property
+    def datos_de_conexion(self):
+        """Diccionario que acompaña a la conexión física mientras viva, entre préstamo y préstamo."""
+        if self._entrada is None:
+            raise AttributeError("La conexión ya fue devuelta al pool.")
+        return self._entrada.datos
+
+    def close(self):
+        """Devuelve la conexión al pool. Llamadas sucesivas no tienen efecto."""
+        entrada, self._entrada = self._entrada, None
+        if entrada is not None:
+            self._pool._devolver(entrada)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo_error, error, traza):
+        if tipo_error is not None and self._entrada is not None:
+            try:
+                self._entrada.conexion.rollback()
+            except Exception:
+                pass
+        self.close()
+        return False
+
+
+class PoolDeConexiones:
+    """
+    Pool de conexiones de tamaño acotado y seguro entre hilos.
+
+    - Verifica la conexión (ping) al entregarla si estuvo inactiva más de 'verificar_tras' segundos.
+    - Renueva las conexiones que superan 'vida_maxima' segundos de antigüedad.
+    - Lanza 'PoolAgotadoError' si no se libera ninguna conexión en 'timeout' segundos.
+    - Lleva estadísticas de uso consultables con 'estadisticas()'.
+    """
+
+    def __init__(self, fabrica, tamanio=TAMANIO_POOL, vida_maxima=VIDA_MAXIMA_CONEXION,
+                 timeout=TIMEOUT_POOL, verificar_tras=VERIFICAR_TRAS_INACTIVIDAD):
+        if tamanio < 1:
+            raise ValueError("El tamaño del pool debe ser al menos 1.")
+        self._fabrica = fabrica
+        self.tamanio = tamanio
+        self.vida_maxima = vida_maxima
+        self.timeout = timeout
+        self.verificar_tras = verificar_tras
+        self._libres = deque()
+        self._abiertas = 0
+        self._condicion = threading.Condition()
+        self._estadisticas = {
+            "obtenciones": 0,
+            "esperas": 0,
+            "creaciones": 0,
+            "descartes": 0,
+            "timeouts": 0,
+        }
+
+    def obtener(self):
+        """
+        Entrega una conexión del pool, creando una nueva si hay lugar libre.
+
+        Returns:
+            ConexionAgrupada: Conexión lista para usar.
+
+        Raises:
+            PoolAgotadoError: Si se agota el tiempo de espera.
+        """
+        limite = time.monotonic() + self.timeout
+        espero = False
+        with self._condicion:
+            self._estadisticas["obtenciones"] += 1
+            while True:
+                if self._libres:
+                    entrada = self._libres.pop()
+                    break
+                if self._abiertas < self.tamanio:
+                    self._abiertas += 1
+                    entrada = None
+                    break
+                if not espero:
+                    espero = True
+                    self._estadisticas["esperas"] += 1
+                restante = limite - time.monotonic()
+                if restante <= 0:
+                    self._estadisticas["timeouts"] += 1
+                    raise PoolAgotadoError(
+                        f"No hay conexiones libres tras esperar {self.timeout} segundos "
+                        f"(tamaño del pool: {self.tamanio})."
+                    )
+                self._condicion.wait(restante)
+
+        if entrada is not None and not self._es_utilizable(entrada):
+            self._cerrar_fisica(entrada)
+            with self._condicion:
+                self._estadisticas["descartes"] += 1
+            entrada = None
+
+        if entrada is None:
+            try:
+                entrada = _EntradaPool(self._fabrica())
+            except Exception:
+                with self._condicion:
+                    self._abiertas -= 1
+                    self._condicion.notify()
+                raise
+            with self._condicion:
+                self._estadisticas["creaciones"] += 1
+
+        return ConexionAgrupada(self, entrada)
+
+    def _es_utilizable(self, entrada):
+        """Indica si una conexión libre puede entregarse sin renovarla."""
+        ahora = time.monotonic()
+        if ahora - entrada.creada_en > self.vida_maxima:
+            return False
+        if ahora - entrada.liberada_en < self.verificar_tras:
+            return True
+        try:
+            entrada.conexion.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def _devolver(self, entrada):
+        """Recibe una conexión devuelta, descartando transacciones abiertas o conexiones vencidas."""
+        conexion = entrada.conexion
+        descartar = time.monotonic() - entrada.creada_en > self.vida_maxima
+        if not descartar:
+            try:
+                if conexion.in_transaction:
+                    conexion.rollback()
+            except Exception:
+                descartar = True
+
+        if descartar:
+            self._cerrar_fisica(entrada)
+
+        with self._condicion:
+            if descartar:
+                self._abiertas -= 1
+                self._estadisticas["descartes"] += 1
+            else:
+                entrada.liberada_en = time.monotonic()
+                self._libres.append(entrada)
+            self._condicion.notify()
+
+    @staticmethod
+    def _cerrar_fisica(entrada):
+        try:
+            entrada.conexion.close()
+        except Exception:
+            pass
+
+    def estadisticas(self):
+        """
+        Devuelve una copia de las estadísticas del pool.
+
+        Returns:
+            dict: Obtenciones, esperas, creaciones, descartes, timeouts y ocupación actual.
+        """
+        with self._condicion:
+            datos = dict(self._estadisticas)
+            datos["abiertas"] = self._abiertas
+            datos["libres"] = len(self._libres)
+            datos["en_uso"] = self._abiertas - len(self._libres)
+            datos["tamanio"] = self.tamanio
+        return datos
+
+    def cerrar(self):
+        """Cierra todas las conexiones libres. Las que están en uso se cierran al devolverse."""
+        with self._condicion:
+            libres = list(self._libres)
+            self._libres.clear()
+            self._abiertas -= len(libres)
+            self.vida_maxima = -1
+            self._condicion.notify_all()
+        for entrada in libres:
+            self._cerrar_fisica(entrada)
+
+
+_pool = None
+_bloqueo_pool = threading.Lock()
+
+_ERRORES_DE_CONEXION = (PoolAgotadoError, RuntimeError, sqlite3.Error)
+if mysql is not None:
+    _ERRORES_DE_CONEXION += (mysql.connector.Error,)
+
+
+def _crear_conexion_fisica():
+    if MOTOR == "sqlite":
+        return motor_sqlite.conectar(RUTA_SQLITE)
+    if mysql is None:
+        raise RuntimeError("El motor MySQL requiere el paquete 'mysql-connector-python'.")
+    if config is None:
+        raise RuntimeError("El motor MySQL requiere el archivo 'config.py' con los datos de conexión.")
+    return mysql.connector.connect(**config)
+
+
+def configurar_motor(motor, ruta_sqlite=None):
+    """
+    Cambia el motor de base de datos ('mysql' o 'sqlite') y reinicia el pool de conexiones.
+
+    Args:
+        motor (str): Motor a utilizar.
+        ruta_sqlite (str | None): Archivo de la base SQLite. Si se omite, se conserva el actual.
+    """
+    global MOTOR, RUTA_SQLITE
+    motor = motor.lower()
+    if motor not in MOTORES:
+        raise ValueError(f"Motor desconocido '{motor}'. Opciones: {', '.join(MOTORES)}.")
+    MOTOR = motor
+    if ruta_sqlite is not None:
+        RUTA_SQLITE = ruta_sqlite
+    configurar_pool()
+
+
+def motor_actual():
+    """Devuelve el nombre del motor de base de datos en uso ('mysql' o 'sqlite')."""
+    return MOTOR
+
+
+def obtener_pool():
+    """
+    Devuelve el pool global del sistema, creándolo la primera vez que se necesita.
+
+    Returns:
+        PoolDeConexiones: Pool compartido por todos los módulos.
+    """
+    global _pool
+    if _pool is None:
+        with _bloqueo_pool:
+            if _pool is None:
+                _pool = PoolDeConexiones(_crear_conexion_fisica)
+    return _pool
+
+
+def configurar_pool(tamanio=None, vida_maxima=None, timeout=None, verificar_tras=None):
+    """
+    Reemplaza el pool global por uno nuevo con los parámetros indicados.
+    Los parámetros omitidos conservan su valor por defecto.
+    """
+    global _pool
+    with _bloqueo_pool:
+        anterior = _pool
+        _pool = PoolDeConexiones(
+            _crear_conexion_fisica,
+            tamanio=TAMANIO_POOL if tamanio is None else tamanio,
+            vida_maxima=VIDA_MAXIMA_CONEXION if vida_maxima is None else vida_maxima,
+            timeout=TIMEOUT_POOL if timeout is None else timeout,
+            verificar_tras=VERIFICAR_TRAS_INACTIVIDAD if verificar_tras is None else verificar_tras,
+        )
+    if anterior is not None:
+        anterior.cerrar()
+
+
+def estadisticas_pool():
+    """
+    Devuelve las estadísticas del pool global (obtenciones, esperas, creaciones, etc.).
+
+    Returns:
+        dict: Estadísticas del pool.
+    """
+    return obtener_pool().estadisticas()
 
 
 def obtener_conexion():
     """
-    Establece una conexión con la base de datos MySQL utilizando los parámetros definidos en 'config.py'.
+    Entrega una conexión del pool de conexiones a la base de datos.
+
+    La conexión debe devolverse con 'close()' (o usarse dentro de un bloque 'with'),
+    lo que la deja disponible para la próxima operación en lugar de cerrar el socket.
+    Si la instrumentación está habilitada, la conexión mide el tiempo de cada sentencia.
 
     Returns:
-        mysql.connector.connection.MySQLConnection | None: 
-            Objeto de conexión activo si la conexión fue exitosa, o None si falló.
+        ConexionAgrupada | None:
+            Conexión activa si se pudo obtener, o None si falló.
     """
     try:
-        conexion = mysql.connector.connect(**config)
-        return conexion
-    except mysql.connector.Error as err:
+        conexion = obtener_pool().obtener()
+    except _ERRORES_DE_CONEXION as err:
         print(f"Error al conectar a la base de datos: {err}")
         return None
+    if instrumentacion.HABILITADA:
+        return instrumentacion.instrumentar(conexion)
+    return conexion
 
 
 if __name__ == "__main__":
@@ -34,5 +382,6 @@ if __name__ == "__main__":
     if conexion:
         print("Conexión exitosa.")
         conexion.close()
+        print(f"Estadísticas del pool: {estadisticas_pool()}")
     else:
         print("No se pudo conectar.")
@@ -7,9 +7,25 @@ visualización de los existentes, modificación y eliminación de destinos.
 
 Cada destino está asociado a una ciudad, y cada ciudad contiene datos como provincia, país y costo base.
 Todas las operaciones se realizan a través de la base de datos mediante conexión SQL.
+Las consultas del catálogo se resuelven con la caché de 'cache_destinos', que cada operación
+de escritura invalida. Para elegir un destino se escribe el comienzo de su ciudad, provincia o
+país (ver 'busqueda_destinos'), en lugar de buscarlo a ojo en el listado completo.
+El cupo de asientos de cada destino se administra en 'asientos'.
 """
 
 from conexion_base_de_datos import obtener_conexion
+from cache_destinos import obtener_catalogo, obtener_destino, invalidar_catalogo
+from busqueda_destinos import autocompletar, buscar_duplicados
+from asientos import asientos_disponibles, asignar_asientos
+from purga import purgar_destino
+
+
+# Consultas de este módulo; 'verificar_planes' revisa sus planes de ejecución.
+_CONSULTA_CIUDAD = """
+    SELECT id_ciudad FROM ciudades
+    WHERE nombre_ciudad = %s AND provincia = %s AND pais = %s;
+"""
+_ACTUALIZAR_CIUDAD = "UPDATE ciudades SET {columna} = %s WHERE id_ciudad = %s;"
 
 
 def gestion_de_destinos():
@@ -21,7 +37,8 @@ def gestion_de_destinos():
     2. Listar destinos registrados
     3. Modificar destino existente
     4. Eliminar destino
-    5. Salir del menú
+    5. Asignar asientos a un destino
+    6. Salir del menú
     """
     while True:
         print("\nGESTIÓN DE DESTINOS")
@@ -29,7 +46,8 @@ def gestion_de_destinos():
         print("2. Listar destinos")
         print("3. Modificar destino")
         print("4. Eliminar destino")
-        print("5. Salir del menú de destinos")
+        print("5. Asignar asientos")
+        print("6. Salir del menú de destinos")
 
         opcion = input("Selecciona una opción: ")
 
@@ -43,6 +61,8 @@ def gestion_de_destinos():
             elif opcion == "4":
                 eliminar_destino()
             elif opcion == "5":
+                modificar_asientos()
+            elif opcion == "6":
                 print("Saliendo del menú de gestión de destinos.")
                 break
             else:
@@ -51,53 +71,130 @@ def gestion_de_destinos():
             print(f"Error en la gestión de destinos: {e}")
 
 
-def registrar_destino():
+def crear_destino(nombre_ciudad, provincia, pais, precio, conexion=None):
     """
-    Registra un nuevo destino en la base de datos.
+    Registra un destino sin interacción con el usuario, reutilizando la ciudad si ya existe
+    (sin distinguir mayúsculas ni acentos: 'Cordoba' reutiliza 'Córdoba').
+    La ciudad (si es nueva) y el destino se guardan en una sola transacción.
 
-    - Solicita al usuario los datos de ciudad, provincia, país y costo base.
-    - Verifica si la ciudad ya existe. Si no existe, la registra.
-    - Registra el destino asociado a esa ciudad.
-    """
-    print("A continuación se muestra el formulario para agregar un destino.")
+    Args:
+        nombre_ciudad (str), provincia (str), pais (str): Se normalizan con '.title()'.
+        precio (float): Costo base de la ciudad, usado solo si la ciudad es nueva.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
 
-    nombre_ciudad = input("Ingrese el nombre del destino: ").strip().title()
-    provincia = input("Ingrese la provincia de destino: ").strip().title()
-    pais = input("Ingrese el país de destino: ").strip().title()
-    precio = float(input("Ingrese el precio del destino: "))
+    Returns:
+        tuple: (id_destino, ciudad_nueva), donde ciudad_nueva indica si se registró la ciudad.
+    """
+    nombre_ciudad = nombre_ciudad.strip().title()
+    provincia = provincia.strip().title()
+    pais = pais.strip().title()
 
-    try:
+    propia = conexion is None
+    if propia:
         conexion = obtener_conexion()
-        cursor = conexion.cursor()
+    cursor = conexion.cursor()
 
-        cursor.execute("""
-            SELECT id_ciudad FROM ciudades 
-            WHERE nombre_ciudad = %s AND provincia = %s AND pais = %s;
-        """, (nombre_ciudad, provincia, pais))
-        ciudad = cursor.fetchone()
+    try:
+        duplicados = buscar_duplicados(nombre_ciudad, provincia, pais, conexion)
+        if duplicados:
+            ciudad = (duplicados[0].id_ciudad,)
+        else:
+            # La ciudad puede existir sin destinos (y por lo tanto fuera del catálogo).
+            cursor.execute(_CONSULTA_CIUDAD, (nombre_ciudad, provincia, pais))
+            ciudad = cursor.fetchone()
 
         if ciudad:
             id_ciudad = ciudad[0]
-            print("La ciudad ya estaba registrada. Se usará como parte del nuevo destino.")
         else:
             cursor.execute("""
                 INSERT INTO ciudades (nombre_ciudad, provincia, pais, costo_base)
                 VALUES (%s, %s, %s, %s);
             """, (nombre_ciudad, provincia, pais, precio))
-            conexion.commit()
-            cursor.execute("SELECT LAST_INSERT_ID();")
-            id_ciudad = cursor.fetchone()[0]
-            print("Ciudad registrada correctamente.")
+            id_ciudad = cursor.lastrowid
 
         cursor.execute("INSERT INTO destinos (id_ciudad) VALUES (%s);", (id_ciudad,))
+        id_destino = cursor.lastrowid
         conexion.commit()
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    invalidar_catalogo()
+    return id_destino, ciudad is None
+
+
+def registrar_destino():
+    """
+    Registra un nuevo destino en la base de datos.
+
+    - Solicita al usuario los datos de ciudad, provincia, país y costo base.
+    - Si ya hay destinos para esa ciudad (sin distinguir mayúsculas ni acentos), los muestra
+      y pide confirmación antes de registrar otro.
+    - Verifica si la ciudad ya existe. Si no existe, la registra.
+    - Registra el destino asociado a esa ciudad.
+    """
+    print("A continuación se muestra el formulario para agregar un destino.")
+
+    nombre_ciudad = input("Ingrese el nombre del destino: ").strip().title()
+    provincia = input("Ingrese la provincia de destino: ").strip().title()
+    pais = input("Ingrese el país de destino: ").strip().title()
+
+    try:
+        duplicados = buscar_duplicados(nombre_ciudad, provincia, pais)
+        if duplicados:
+            print("Ya hay destinos registrados para esa ciudad:")
+            for destino in duplicados:
+                print(f"ID Destino: {destino.id_destino}, Ciudad: {destino.nombre_ciudad}, Provincia: {destino.provincia}, País: {destino.pais}, Costo: {destino.costo_base}")
+            if input("¿Desea registrar otro destino para la misma ciudad? (s/n): ").strip().lower() not in ["s", "si"]:
+                print("Operación cancelada.")
+                return
+
+        precio = float(input("Ingrese el precio del destino: "))
+        _, ciudad_nueva = crear_destino(nombre_ciudad, provincia, pais, precio)
+        if ciudad_nueva:
+            print("Ciudad registrada correctamente.")
+        else:
+            print("La ciudad ya estaba registrada. Se usará como parte del nuevo destino.")
         print("Destino registrado exitosamente.")
 
     except Exception as e:
         print(f"Error al registrar el destino: {e}")
-    finally:
-        cursor.close()
-        conexion.close()
+
+
+def seleccionar_destino(accion, conexion=None):
+    """
+    Ayuda a elegir un destino: muestra los que coinciden con lo que escribe el usuario
+    (comienzo de la ciudad, provincia o país) y le pide el ID del elegido.
+
+    Args:
+        accion (str): Verbo para el mensaje, por ejemplo 'modificar' o 'comprar'.
+        conexion: Conexión a reutilizar si hay que cargar el catálogo.
+
+    Returns:
+        Destino | None: Destino elegido, o None si no hay coincidencias o el ID no es válido.
+    """
+    texto = input("Buscar destino por ciudad, provincia o país (Enter para ver todos): ").strip()
+    if texto:
+        destinos = autocompletar(texto, conexion=conexion)
+    else:
+        destinos = list(obtener_catalogo(conexion).values())
+
+    if not destinos:
+        print("No se encontraron destinos.")
+        return None
+
+    for destino in destinos:
+        print(f"ID Destino: {destino.id_destino}, Ciudad: {destino.nombre_ciudad}, Provincia: {destino.provincia}, País: {destino.pais}, Costo: {destino.costo_base}")
+
+    id_destino = int(input(f"Ingrese el ID del destino que desea {accion}: "))
+    destino = obtener_destino(id_destino, conexion)
+    if not destino:
+        print("ID de destino no válido.")
+    return destino
 
 
 def listar_destinos():
@@ -110,28 +207,17 @@ def listar_destinos():
     - Costo base
     """
     try:
-        conexion = obtener_conexion()
-        cursor = conexion.cursor()
-
-        cursor.execute("""
-            SELECT destinos.id_destino, ciudades.nombre_ciudad, ciudades.provincia, ciudades.pais, ciudades.costo_base
-            FROM destinos
-            JOIN ciudades ON destinos.id_ciudad = ciudades.id_ciudad;
-        """)
-        destinos = cursor.fetchall()
+        destinos = obtener_catalogo().values()
 
         if destinos:
             print("Lista de destinos disponibles:")
             for destino in destinos:
-                print(f"ID Destino: {destino[0]}, Ciudad: {destino[1]}, Provincia: {destino[2]}, País: {destino[3]}, Costo: {destino[4]}")
+                print(f"ID Destino: {destino.id_destino}, Ciudad: {destino.nombre_ciudad}, Provincia: {destino.provincia}, País: {destino.pais}, Costo: {destino.costo_base}")
         else:
             print("No hay destinos registrados.")
 
     except Exception as e:
         print(f"Error al listar los destinos: {e}")
-    finally:
-        cursor.close()
-        conexion.close()
 
 
 def modificar_destino():
@@ -139,7 +225,7 @@ def modificar_destino():
     Permite modificar los datos de un destino existente.
 
     Pasos:
-    - Muestra los destinos registrados.
+    - Permite buscar y elegir el destino.
     - Permite modificar ciudad, provincia, país o costo base.
     - Aplica el cambio sobre la ciudad asociada al destino.
     """
@@ -147,51 +233,33 @@ def modificar_destino():
         conexion = obtener_conexion()
         cursor = conexion.cursor()
 
-        cursor.execute("""
-            SELECT d.id_destino, c.nombre_ciudad, c.provincia, c.pais, c.costo_base
-            FROM destinos d
-            JOIN ciudades c ON d.id_ciudad = c.id_ciudad;
-        """)
-        destinos = cursor.fetchall()
-
-        if not destinos:
-            print("No hay destinos registrados.")
-            return
+        destino_seleccionado = seleccionar_destino("modificar", conexion)
 
-        print("Lista de destinos:")
-        for destino in destinos:
-            print(f"ID Destino: {destino[0]}, Ciudad: {destino[1]}, Provincia: {destino[2]}, País: {destino[3]}, Costo: {destino[4]}")
-
-        id_destino = int(input("Ingrese el ID del destino que desea modificar: "))
-
-        cursor.execute("SELECT id_ciudad FROM destinos WHERE id_destino = %s;", (id_destino,))
-        resultado = cursor.fetchone()
-
-        if not resultado:
-            print("No se encontró el destino.")
+        if not destino_seleccionado:
             return
 
-        id_ciudad = resultado[0]
+        id_destino, id_ciudad = destino_seleccionado.id_destino, destino_seleccionado.id_ciudad
 
         modificar = input("¿Qué desea modificar: ciudad, provincia, país o costo base?: ").strip().lower()
 
         if modificar == "ciudad":
             ciudad = input("Ingresa el nuevo nombre de la ciudad: ").strip().title()
-            cursor.execute("UPDATE ciudades SET nombre_ciudad = %s WHERE id_ciudad = %s;", (ciudad, id_ciudad))
+            cursor.execute(_ACTUALIZAR_CIUDAD.format(columna="nombre_ciudad"), (ciudad, id_ciudad))
         elif modificar == "provincia":
             provincia = input("Ingresa la nueva provincia: ").strip().title()
-            cursor.execute("UPDATE ciudades SET provincia = %s WHERE id_ciudad = %s;", (provincia, id_ciudad))
+            cursor.execute(_ACTUALIZAR_CIUDAD.format(columna="provincia"), (provincia, id_ciudad))
         elif modificar in ["pais", "país"]:
             pais = input("Ingresa el nuevo país: ").strip().title()
-            cursor.execute("UPDATE ciudades SET pais = %s WHERE id_ciudad = %s;", (pais, id_ciudad))
+            cursor.execute(_ACTUALIZAR_CIUDAD.format(columna="pais"), (pais, id_ciudad))
         elif modificar in ["costo base", "costo"]:
             costo_base = float(input("Ingresa el nuevo costo base: "))
-            cursor.execute("UPDATE ciudades SET costo_base = %s WHERE id_ciudad = %s;", (costo_base, id_ciudad))
+            cursor.execute(_ACTUALIZAR_CIUDAD.format(columna="costo_base"), (costo_base, id_ciudad))
         else:
             print("Opción no válida.")
             return
 
         conexion.commit()
+        invalidar_catalogo()
         print(f"Destino con ID {id_destino} modificado correctamente.")
 
     except Exception as e:
@@ -203,50 +271,63 @@ def modificar_destino():
 
 def eliminar_destino():
     """
-    Elimina un destino y su ciudad asociada de la base de datos.
+    Elimina un destino, con sus ventas, y su ciudad asociada si no tiene otros destinos.
 
     Pasos:
-    - Muestra los destinos disponibles.
-    - Solicita el ID del destino a eliminar.
-    - Elimina primero el registro en la tabla 'destinos' y luego en 'ciudades'.
+    - Permite buscar y elegir el destino a eliminar.
+    - Elimina por lotes sus ventas y luego el destino y la ciudad (ver 'purga').
     """
-    try:
-        conexion = obtener_conexion()
-        cursor = conexion.cursor()
+    conexion = obtener_conexion()
 
-        cursor.execute("""
-            SELECT d.id_destino, c.id_ciudad, c.nombre_ciudad, c.provincia, c.pais, c.costo_base
-            FROM destinos d
-            JOIN ciudades c ON d.id_ciudad = c.id_ciudad;
-        """)
-        destinos = cursor.fetchall()
+    try:
+        destino_seleccionado = seleccionar_destino("eliminar", conexion)
 
-        if not destinos:
-            print("No hay destinos registrados.")
+        if not destino_seleccionado:
             return
 
-        print("Lista de destinos:")
-        for destino in destinos:
-            print(f"ID Destino: {destino[0]}, Ciudad: {destino[2]}, Provincia: {destino[3]}, País: {destino[4]}, Costo: {destino[5]}")
+        id_destino = destino_seleccionado.id_destino
+        eliminadas = purgar_destino(id_destino, al_avanzar=lambda n: print(f"{n} ventas eliminadas..."),
+                                    conexion=conexion)
+
+        print(f"Destino con ID {id_destino} eliminado correctamente ({eliminadas} venta(s) eliminada(s)).")
+
+    except Exception as e:
+        print(f"Error al eliminar el destino: {e}")
+    finally:
+        conexion.close()
+
 
-        id_destino = int(input("Ingrese el ID del destino que desea eliminar: "))
+def modificar_asientos():
+    """
+    Permite fijar los asientos disponibles de un destino.
 
-        destino_seleccionado = next((d for d in destinos if d[0] == id_destino), None)
+    Pasos:
+    - Permite buscar y elegir el destino.
+    - Muestra los asientos disponibles actuales.
+    - Fija el nuevo cupo, o lo quita si se deja vacío.
+    """
+    try:
+        conexion = obtener_conexion()
+
+        destino_seleccionado = seleccionar_destino("modificar", conexion)
 
         if not destino_seleccionado:
-            print("ID de destino no válido.")
             return
 
-        id_ciudad = destino_seleccionado[1]
+        id_destino = destino_seleccionado.id_destino
+        disponibles = asientos_disponibles(id_destino, conexion)
+        print(f"Asientos disponibles: {'sin límite' if disponibles is None else disponibles}")
 
-        cursor.execute("DELETE FROM destinos WHERE id_destino = %s;", (id_destino,))
-        cursor.execute("DELETE FROM ciudades WHERE id_ciudad = %s;", (id_ciudad,))
-        conexion.commit()
+        respuesta = input("Ingrese los asientos disponibles (Enter para no limitar): ").strip()
+        cantidad = int(respuesta) if respuesta else None
+        asignar_asientos(id_destino, cantidad, conexion=conexion)
 
-        print(f"Destino con ID {id_destino} eliminado correctamente.")
+        if cantidad is None:
+            print(f"El destino con ID {id_destino} no tiene límite de asientos.")
+        else:
+            print(f"El destino con ID {id_destino} tiene {cantidad} asientos disponibles.")
 
     except Exception as e:
-        print(f"Error al eliminar el destino: {e}")
+        print(f"Error al asignar los asientos: {e}")
     finally:
-        cursor.close()
         conexion.close()
@@ -0,0 +1,293 @@
+"""
+Módulo: exportacion_ventas.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y genera extractos completos de la tabla
+'ventas', unida a los datos del cliente y del destino, para el área de finanzas. Las ventas
+archivadas (ver 'archivo_ventas') solo se incluyen con '--incluir-archivo'.
+
+Las ventas se leen con un cursor sin buffer (el servidor las envía a medida que se piden con
+'fetchmany') y se escriben por bloques, de modo que la memoria usada no depende del tamaño del
+extracto. Formatos disponibles:
+
+- csv: con encabezado;
+- jsonl: un objeto JSON por venta;
+- columnas: comprimido con gzip; cada bloque es una línea JSON con los valores agrupados por
+  columna, que se comprimen mucho mejor que las filas. Se lee con 'leer_columnas'.
+
+Después de cada bloque se guarda en '<archivo>.progreso' el último 'id_venta' exportado y el
+tamaño del archivo en ese punto. Con '--reanudar', una exportación interrumpida continúa desde
+allí: el archivo se recorta al último bloque completo y se leen solo las ventas siguientes.
+
+Uso:
+    python exportacion_ventas.py ventas.csv [--desde 2025-01-01] [--hasta 2025-02-01]
+                                 [--estados Activa Cerrada] [--incluir-archivo] [--reanudar]
+    python exportacion_ventas.py ventas.jsonl.gz --formato columnas
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import json
+import os
+import time
+from datetime import datetime
+from decimal import Decimal
+
+from conexion_base_de_datos import obtener_conexion
+
+
+FORMATOS = ("csv", "jsonl", "columnas")
+
+# Ventas que se piden al servidor y se escriben juntas.
+TAMANIO_BLOQUE = 5000
+
+COLUMNAS_EXPORTACION = (
+    "id_venta", "fecha_de_compra", "estado_de_venta", "cantidad_de_tickets", "total_venta",
+    "dni_cliente", "nombre_cliente", "apellido_cliente", "email_cliente",
+    "id_destino", "nombre_ciudad", "provincia", "pais", "costo_base",
+)
+
+
+def _consulta(fecha_desde, fecha_hasta, estados, incluir_archivo=False, desde_id=0):
+    """Arma la consulta del extracto y sus parámetros."""
+    condiciones = ["v.id_venta > %s"]
+    parametros = [desde_id]
+    if fecha_desde is not None:
+        condiciones.append("v.fecha_de_compra >= %s")
+        parametros.append(fecha_desde)
+    if fecha_hasta is not None:
+        condiciones.append("v.fecha_de_compra < %s")
+        parametros.append(fecha_hasta)
+    if estados:
+        condiciones.append(f"v.estado_de_venta IN ({', '.join(['%s'] * len(estados))})")
+        parametros.extend(estados)
+
+    tablas = ("ventas", "ventas_archivo") if incluir_archivo else ("ventas",)
+    # Las ventas archivadas conservan su 'id_venta', así que el orden y la reanudación no cambian.
+    sql = " UNION ALL ".join(f"""
+        SELECT v.id_venta, v.fecha_de_compra, v.estado_de_venta, v.cantidad_de_tickets, v.total_venta,
+               v.dni_cliente, cl.nombre_cliente, cl.apellido_cliente, cl.email_cliente,
+               v.id_destino, ci.nombre_ciudad, ci.provincia, ci.pais, ci.costo_base
+        FROM {tabla} v
+        JOIN clientes cl ON cl.dni_cliente = v.dni_cliente
+        JOIN destinos d ON d.id_destino = v.id_destino
+        JOIN ciudades ci ON ci.id_ciudad = d.id_ciudad
+        WHERE {' AND '.join(condiciones)}
+    """ for tabla in tablas)
+    return f"{sql} ORDER BY id_venta;", parametros * len(tablas)
+
+
+def _texto(valor):
+    if isinstance(valor, datetime):
+        return valor.isoformat(sep=" ")
+    if isinstance(valor, Decimal):
+        return float(valor)
+    return valor
+
+
+def _codificar_csv(filas, con_encabezado):
+    salida = io.StringIO()
+    escritor = csv.writer(salida)
+    if con_encabezado:
+        escritor.writerow(COLUMNAS_EXPORTACION)
+    escritor.writerows([_texto(valor) for valor in fila] for fila in filas)
+    return salida.getvalue().encode("utf-8")
+
+
+def _codificar_jsonl(filas, con_encabezado):
+    lineas = (json.dumps(dict(zip(COLUMNAS_EXPORTACION, map(_texto, fila))), ensure_ascii=False)
+              for fila in filas)
+    return "".join(f"{linea}\n" for linea in lineas).encode("utf-8")
+
+
+def _codificar_columnas(filas, con_encabezado):
+    # Cada bloque es un miembro gzip independiente: el archivo puede recortarse y continuarse
+    # en cualquier límite de bloque y sigue siendo un gzip válido.
+    columnas = {nombre: [_texto(fila[posicion]) for fila in filas]
+                for posicion, nombre in enumerate(COLUMNAS_EXPORTACION)}
+    bloque = json.dumps({"filas": len(filas), "columnas": columnas}, ensure_ascii=False)
+    return gzip.compress(f"{bloque}\n".encode("utf-8"))
+
+
+_CODIFICADORES = {
+    "csv": _codificar_csv,
+    "jsonl": _codificar_jsonl,
+    "columnas": _codificar_columnas,
+}
+
+
+def ruta_progreso(ruta):
+    return f"{ruta}.progreso"
+
+
+def _leer_progreso(ruta):
+    try:
+        with open(ruta_progreso(ruta), encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except FileNotFoundError:
+        return None
+
+
+def _guardar_progreso(ruta, progreso):
+    # Se escribe en un archivo temporal y se reemplaza, para no dejar nunca un progreso a medias.
+    temporal = f"{ruta_progreso(ruta)}.tmp"
+    with open(temporal, "w", encoding="utf-8") as archivo:
+        json.dump(progreso, archivo)
+        archivo.flush()
+        os.fsync(archivo.fileno())
+    os.replace(temporal, ruta_progreso(ruta))
+
+
+def exportar_ventas(ruta, formato="csv", fecha_desde=None, fecha_hasta=None, estados=None,
+                    reanudar=False, desde_id=0, tamanio_bloque=TAMANIO_BLOQUE, conexion=None,
+                    incluir_archivo=False):
+    """
+    Exporta las ventas, con los datos del cliente y del destino, en orden de 'id_venta'.
+
+    Args:
+        ruta (str): Archivo de salida. Se sobrescribe, salvo al reanudar.
+        formato (str): 'csv', 'jsonl' o 'columnas'.
+        fecha_desde (datetime | None): Incluye las ventas compradas desde ese momento.
+        fecha_hasta (datetime | None): Incluye las ventas compradas antes de ese momento.
+        estados (list[str] | None): Estados a incluir ('Activa', 'Cerrada', 'Anulada'); todos si se omite.
+        reanudar (bool): Continuar una exportación interrumpida a partir de su archivo de progreso.
+        desde_id (int): Exportar solo las ventas con 'id_venta' mayor a este valor.
+        tamanio_bloque (int): Ventas por bloque leído y escrito.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+        incluir_archivo (bool): Si es True, también se exportan las ventas archivadas
+            (ver 'archivo_ventas'), que de lo contrario no se leen.
+
+    Returns:
+        dict: Resumen con 'exportadas', 'ultimo_id_venta', 'segundos' y 'filas_por_segundo'.
+
+    Raises:
+        ValueError: Si los parámetros son inválidos o no coinciden con los de la exportación a reanudar.
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato desconocido '{formato}'. Opciones: {', '.join(FORMATOS)}.")
+    if tamanio_bloque < 1:
+        raise ValueError("El tamaño de bloque debe ser al menos 1.")
+
+    estados = sorted(estados) if estados else []
+    filtros = {
+        "formato": formato,
+        "desde": fecha_desde.isoformat() if fecha_desde else None,
+        "hasta": fecha_hasta.isoformat() if fecha_hasta else None,
+        "estados": estados,
+        "archivo": incluir_archivo,
+    }
+
+    tamanio_archivo = 0
+    if reanudar:
+        progreso = _leer_progreso(ruta)
+        if progreso is None:
+            raise ValueError(f"No hay una exportación para reanudar en '{ruta}'.")
+        if progreso["filtros"] != filtros:
+            raise ValueError("Los filtros no coinciden con los de la exportación a reanudar.")
+        desde_id = progreso["ultimo_id_venta"]
+        tamanio_archivo = progreso["bytes"]
+    elif os.path.exists(ruta_progreso(ruta)):
+        os.remove(ruta_progreso(ruta))
+
+    codificar = _CODIFICADORES[formato]
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    # Cursor sin buffer: el resultado no se carga completo en memoria.
+    cursor = conexion.cursor(buffered=False)
+    inicio = time.perf_counter()
+    exportadas = 0
+    completa = False
+
+    try:
+        with open(ruta, "r+b" if reanudar else "wb") as archivo:
+            # Se descarta lo escrito después del último bloque registrado en el progreso.
+            archivo.truncate(tamanio_archivo)
+            archivo.seek(tamanio_archivo)
+
+            cursor.execute(*_consulta(fecha_desde, fecha_hasta, estados, incluir_archivo, desde_id))
+            while True:
+                filas = cursor.fetchmany(tamanio_bloque)
+                if not filas:
+                    break
+                archivo.write(codificar(filas, con_encabezado=archivo.tell() == 0))
+                archivo.flush()
+                os.fsync(archivo.fileno())
+
+                exportadas += len(filas)
+                desde_id = filas[-1][0]
+                _guardar_progreso(ruta, {"ultimo_id_venta": desde_id, "bytes": archivo.tell(),
+                                         "filtros": filtros})
+
+            if formato == "csv" and archivo.tell() == 0:
+                archivo.write(codificar([], con_encabezado=True))
+            completa = True
+    finally:
+        if not completa and hasattr(conexion, "consume_results"):
+            # Un resultado sin leer dejaría la conexión inutilizable para el próximo préstamo.
+            try:
+                conexion.consume_results()
+            except Exception:
+                pass
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "exportadas": exportadas,
+        "ultimo_id_venta": desde_id,
+        "segundos": segundos,
+        "filas_por_segundo": exportadas / segundos if segundos > 0 else 0.0,
+    }
+
+
+def leer_columnas(ruta):
+    """
+    Recorre un archivo exportado en formato 'columnas', un bloque por vez.
+
+    Yields:
+        dict: nombre de columna -> lista de valores del bloque.
+    """
+    with gzip.open(ruta, "rt", encoding="utf-8") as archivo:
+        for linea in archivo:
+            yield json.loads(linea)["columnas"]
+
+
+def _fecha(texto):
+    try:
+        return datetime.fromisoformat(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Fecha inválida '{texto}'. Formato esperado: AAAA-MM-DD [HH:MM:SS]") from None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exportación de ventas a CSV, JSONL o columnas comprimidas.")
+    parser.add_argument("archivo", help="Archivo de salida.")
+    parser.add_argument("--formato", choices=FORMATOS,
+                        help="Formato de salida (por defecto, según la extensión del archivo).")
+    parser.add_argument("--desde", type=_fecha, help="Ventas compradas desde esta fecha (inclusive).")
+    parser.add_argument("--hasta", type=_fecha, help="Ventas compradas antes de esta fecha (exclusive).")
+    parser.add_argument("--estados", nargs="*", choices=("Activa", "Cerrada", "Anulada"))
+    parser.add_argument("--desde-id", type=int, default=0, help="Exportar las ventas con id_venta mayor a este.")
+    parser.add_argument("--incluir-archivo", action="store_true", help="Incluir también las ventas archivadas.")
+    parser.add_argument("--reanudar", action="store_true", help="Continuar una exportación interrumpida.")
+    parser.add_argument("--bloque", type=int, default=TAMANIO_BLOQUE, help="Ventas por bloque.")
+    argumentos = parser.parse_args()
+
+    formato = argumentos.formato
+    if formato is None:
+        nombre = argumentos.archivo.lower()
+        formato = "jsonl" if nombre.endswith((".jsonl", ".json")) else "columnas" if nombre.endswith(".gz") else "csv"
+
+    try:
+        resumen = exportar_ventas(argumentos.archivo, formato, argumentos.desde, argumentos.hasta,
+                                  argumentos.estados, argumentos.reanudar, argumentos.desde_id,
+                                  argumentos.bloque, incluir_archivo=argumentos.incluir_archivo)
+    except ValueError as e:
+        raise SystemExit(f"Error: {e}")
+
+    print(f"Ventas exportadas: {resumen['exportadas']} (último id_venta: {resumen['ultimo_id_venta']}).")
+    print(f"Tiempo total: {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s).")
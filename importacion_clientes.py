@@ -0,0 +1,220 @@
+"""
+Módulo: importacion_clientes.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y permite dar de alta clientes en forma masiva
+a partir de un archivo CSV o JSONL, sin pasar por el formulario interactivo de 'agregar_cliente'.
+
+El archivo se lee en forma incremental: los registros se validan con las mismas reglas que el
+alta manual y se insertan por lotes (un INSERT de varias filas por tabla y un único commit por
+lote), de modo que el tiempo de carga queda dominado por el volumen de datos y no por la
+cantidad de viajes a la base de datos.
+
+Uso:
+    python importacion_clientes.py clientes.csv [--lote 1000] [--rechazos rechazos.csv]
+
+Columnas esperadas: dni, nombre, apellido, direccion, email, telefono.
+"""
+
+import argparse
+import csv
+import json
+import os
+import time
+
+from clientes import es_dni_valido, es_email_valido, es_telefono_valido
+from conexion_base_de_datos import obtener_conexion
+
+
+# Cantidad de registros que se insertan y confirman juntos.
+TAMANIO_LOTE = 1000
+
+CAMPOS_CLIENTE = ("dni", "nombre", "apellido", "direccion", "email", "telefono")
+
+
+def leer_registros(ruta):
+    """
+    Recorre un archivo CSV (con encabezado) o JSONL, un registro por vez.
+
+    El formato se deduce de la extensión: '.jsonl' o '.json' para JSON por líneas,
+    cualquier otra para CSV.
+
+    Yields:
+        tuple: (número de línea, dict con los campos del registro). Si una línea JSONL no
+        puede interpretarse, el dict es None.
+    """
+    extension = os.path.splitext(ruta)[1].lower()
+    with open(ruta, newline="", encoding="utf-8") as archivo:
+        if extension in (".jsonl", ".json"):
+            for numero_linea, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    registro = json.loads(linea)
+                except json.JSONDecodeError:
+                    registro = None
+                yield numero_linea, registro if isinstance(registro, dict) else None
+        else:
+            lector = csv.DictReader(archivo)
+            for numero_linea, registro in enumerate(lector, start=2):
+                yield numero_linea, registro
+
+
+def normalizar_cliente(registro):
+    """
+    Valida y normaliza un registro de cliente con las reglas de 'agregar_cliente'.
+
+    Returns:
+        tuple: (dni, dirección, nombre, apellido, email, teléfono) listos para insertar.
+
+    Raises:
+        ValueError: Con el motivo del rechazo si algún dato es inválido.
+    """
+    if registro is None:
+        raise ValueError("Registro ilegible.")
+
+    def campo(nombre):
+        valor = registro.get(nombre)
+        return "" if valor is None else str(valor).strip()
+
+    dni = campo("dni")
+    email = campo("email").lower()
+    telefono = campo("telefono")
+
+    if not es_dni_valido(dni):
+        raise ValueError(f"DNI inválido '{dni}'. Debe ser en formato 111.111.111")
+    if not es_email_valido(email):
+        raise ValueError(f"Email inválido '{email}'. Formato esperado: ejemplo@correo.com")
+    if not es_telefono_valido(telefono):
+        raise ValueError(f"Teléfono inválido '{telefono}'. Debe ser en formato XXX-XXXXXXX")
+
+    return (dni, campo("direccion").title(), campo("nombre").title(),
+            campo("apellido").title(), email, telefono)
+
+
+def _consulta_existentes(cantidad):
+    """Consulta de los DNI, entre 'cantidad' dados, que ya están registrados."""
+    return f"SELECT dni_cliente FROM clientes WHERE dni_cliente IN ({', '.join(['%s'] * cantidad)});"
+
+
+def _insertar_lote(conexion, lote, rechazos):
+    """
+    Inserta un lote de clientes válidos y confirma la transacción.
+    Los DNI que ya existen en la base de datos se rechazan sin interrumpir el lote.
+
+    Returns:
+        int: Cantidad de clientes insertados.
+    """
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(_consulta_existentes(len(lote)), tuple(lote))
+        existentes = {fila[0] for fila in cursor.fetchall()}
+        for dni in existentes:
+            numero_linea, _ = lote.pop(dni)
+            rechazos.append((numero_linea, f"Ya existe un cliente con DNI {dni}."))
+
+        if not lote:
+            return 0
+
+        filas = [valores for _, valores in lote.values()]
+        cursor.executemany("""
+            INSERT INTO clientes (dni_cliente, dir_cliente, nombre_cliente, apellido_cliente, email_cliente)
+            VALUES (%s, %s, %s, %s, %s);
+        """, [fila[:5] for fila in filas])
+        cursor.executemany("""
+            INSERT INTO telefonos (tel_cliente, dni_cliente)
+            VALUES (%s, %s);
+        """, [(fila[5], fila[0]) for fila in filas])
+        conexion.commit()
+        return len(filas)
+    except Exception as e:
+        conexion.rollback()
+        for numero_linea, _ in lote.values():
+            rechazos.append((numero_linea, f"Error al insertar el lote: {e}"))
+        return 0
+    finally:
+        cursor.close()
+
+
+def importar_clientes(ruta, tamanio_lote=TAMANIO_LOTE):
+    """
+    Importa los clientes de un archivo CSV o JSONL en lotes.
+
+    Args:
+        ruta (str): Ruta del archivo a importar.
+        tamanio_lote (int): Cantidad de registros por INSERT y por commit.
+
+    Returns:
+        dict: Resumen con 'leidos', 'importados', 'rechazos' (lista de (línea, motivo)),
+        'segundos' y 'filas_por_segundo'.
+    """
+    if tamanio_lote < 1:
+        raise ValueError("El tamaño de lote debe ser al menos 1.")
+
+    conexion = obtener_conexion()
+    inicio = time.perf_counter()
+    leidos = 0
+    importados = 0
+    rechazos = []
+    lote = {}
+
+    try:
+        for numero_linea, registro in leer_registros(ruta):
+            leidos += 1
+            try:
+                valores = normalizar_cliente(registro)
+            except ValueError as e:
+                rechazos.append((numero_linea, str(e)))
+                continue
+
+            dni = valores[0]
+            if dni in lote:
+                rechazos.append((numero_linea, f"DNI {dni} repetido en el archivo (línea {lote[dni][0]})."))
+                continue
+            lote[dni] = (numero_linea, valores)
+
+            if len(lote) >= tamanio_lote:
+                importados += _insertar_lote(conexion, lote, rechazos)
+                lote = {}
+                transcurrido = time.perf_counter() - inicio
+                print(f"{importados} clientes importados ({leidos / transcurrido:.0f} filas/s).")
+
+        if lote:
+            importados += _insertar_lote(conexion, lote, rechazos)
+    finally:
+        conexion.close()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "leidos": leidos,
+        "importados": importados,
+        "rechazos": sorted(rechazos),
+        "segundos": segundos,
+        "filas_por_segundo": leidos / segundos if segundos > 0 else 0.0,
+    }
+
+
+def guardar_rechazos(rechazos, ruta):
+    """Guarda los registros rechazados (línea y motivo) en un archivo CSV."""
+    with open(ruta, "w", newline="", encoding="utf-8") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["linea", "motivo"])
+        escritor.writerows(rechazos)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importación masiva de clientes desde CSV o JSONL.")
+    parser.add_argument("archivo", help="Archivo .csv o .jsonl con los clientes a importar.")
+    parser.add_argument("--lote", type=int, default=TAMANIO_LOTE, help="Registros por lote.")
+    parser.add_argument("--rechazos", help="Archivo CSV donde guardar los registros rechazados.")
+    argumentos = parser.parse_args()
+
+    resumen = importar_clientes(argumentos.archivo, argumentos.lote)
+
+    for numero_linea, motivo in resumen["rechazos"]:
+        print(f"Línea {numero_linea} rechazada: {motivo}")
+    if argumentos.rechazos:
+        guardar_rechazos(resumen["rechazos"], argumentos.rechazos)
+
+    print(f"Registros leídos: {resumen['leidos']}, importados: {resumen['importados']}, "
+          f"rechazados: {len(resumen['rechazos'])}.")
+    print(f"Tiempo total: {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s).")
@@ -0,0 +1,261 @@
+"""
+Módulo: importacion_destinos.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y permite cargar en forma masiva el catálogo de
+destinos de una aerolínea asociada, a partir de un archivo CSV o JSONL, sin registrarlos uno por
+uno con 'registrar_destino'.
+
+Antes de leer el archivo se arma, con una sola consulta, el mapa de las ciudades existentes,
+con la misma clave que usa 'crear_destino' para reconocerlas (sin distinguir mayúsculas ni
+acentos: 'Cordoba' reutiliza 'Córdoba'). Luego, por cada lote, las ciudades nuevas se insertan
+con un único INSERT de varias filas y sus IDs se vuelven a leer con una sola consulta (no se
+deducen del ID autoincremental, que con inserciones concurrentes o 'auto_increment_increment'
+mayor a 1 no es consecutivo), los destinos se insertan con otro INSERT de varias filas y el lote
+se confirma con un solo commit. Los nombres se normalizan con '.title()', como en
+'registrar_destino'.
+
+Una ciudad que ya tiene un destino (en la base o más arriba en el mismo archivo) no se vuelve a
+cargar, de modo que importar dos veces el mismo catálogo no duplica destinos.
+
+Uso:
+    python importacion_destinos.py destinos.csv [--lote 1000] [--rechazos rechazos.csv]
+
+Columnas esperadas: ciudad, provincia, pais, precio.
+"""
+
+import argparse
+import time
+
+from busqueda_destinos import clave_ciudad
+from cache_destinos import invalidar_catalogo
+from conexion_base_de_datos import obtener_conexion
+from importacion_clientes import leer_registros, guardar_rechazos
+
+
+# Cantidad de destinos que se insertan y confirman juntos.
+TAMANIO_LOTE = 1000
+
+# Todas las ciudades, con la cantidad de destinos de cada una.
+_CONSULTA_CIUDADES = """
+    SELECT c.id_ciudad, c.nombre_ciudad, c.provincia, c.pais, COUNT(d.id_destino)
+    FROM ciudades c
+    LEFT JOIN destinos d ON d.id_ciudad = c.id_ciudad
+    GROUP BY c.id_ciudad, c.nombre_ciudad, c.provincia, c.pais;
+"""
+
+
+def normalizar_destino(registro):
+    """
+    Valida y normaliza un registro de destino con las reglas de 'registrar_destino'.
+
+    Returns:
+        tuple: (nombre_ciudad, provincia, pais, precio) listos para insertar.
+
+    Raises:
+        ValueError: Con el motivo del rechazo si algún dato es inválido.
+    """
+    if registro is None:
+        raise ValueError("Registro ilegible.")
+
+    def campo(nombre):
+        valor = registro.get(nombre)
+        return "" if valor is None else str(valor).strip()
+
+    nombre_ciudad = campo("ciudad").title()
+    if not nombre_ciudad:
+        raise ValueError("Falta el nombre de la ciudad.")
+    try:
+        precio = float(campo("precio"))
+    except ValueError:
+        raise ValueError(f"Precio inválido '{campo('precio')}'.") from None
+    if precio < 0:
+        raise ValueError(f"El precio no puede ser negativo ({precio}).")
+
+    return nombre_ciudad, campo("provincia").title(), campo("pais").title(), precio
+
+
+def cargar_ciudades(conexion):
+    """
+    Lee todas las ciudades con una sola consulta.
+
+    Returns:
+        tuple: (mapa clave de ciudad -> id_ciudad, conjunto de claves de las ciudades con destinos).
+    """
+    cursor = conexion.cursor()
+    try:
+        cursor.execute(_CONSULTA_CIUDADES)
+        ciudades = {}
+        con_destino = set()
+        for id_ciudad, nombre_ciudad, provincia, pais, destinos in cursor.fetchall():
+            clave = clave_ciudad(nombre_ciudad, provincia, pais)
+            ciudades.setdefault(clave, id_ciudad)
+            if destinos:
+                con_destino.add(clave)
+        return ciudades, con_destino
+    finally:
+        cursor.close()
+
+
+def _insertar_varias(cursor, sql, filas):
+    """Inserta varias filas con un único INSERT."""
+    marcadores = "(" + ", ".join(["%s"] * len(filas[0])) + ")"
+    cursor.execute(f"{sql} VALUES {', '.join([marcadores] * len(filas))};",
+                   [valor for fila in filas for valor in fila])
+
+
+def _consulta_ciudades_por_nombre(cantidad):
+    """Consulta de las ciudades con alguno de 'cantidad' nombres dados."""
+    return f"""
+        SELECT id_ciudad, nombre_ciudad, provincia, pais FROM ciudades
+        WHERE nombre_ciudad IN ({", ".join(["%s"] * cantidad)});
+    """
+
+
+def _leer_ids_de_ciudades(cursor, nuevas):
+    """
+    Lee con una sola consulta los IDs de las ciudades recién insertadas.
+
+    Args:
+        nuevas (dict): Clave de ciudad -> (nombre_ciudad, provincia, pais, precio).
+
+    Returns:
+        dict: Clave de ciudad -> id_ciudad.
+    """
+    # Se filtra por nombre (prefijo del índice de ciudades) y la coincidencia exacta se resuelve con la clave.
+    nombres = list({valores[0] for valores in nuevas.values()})
+    cursor.execute(_consulta_ciudades_por_nombre(len(nombres)), nombres)
+    ids = {}
+    for id_ciudad, nombre_ciudad, provincia, pais in cursor.fetchall():
+        clave = clave_ciudad(nombre_ciudad, provincia, pais)
+        # Si otro proceso cargó la misma ciudad a la vez, se usa la más reciente (la de este lote).
+        if clave in nuevas and id_ciudad > ids.get(clave, 0):
+            ids[clave] = id_ciudad
+    return ids
+
+
+def _insertar_lote(conexion, lote, ciudades, con_destino, rechazos):
+    """
+    Inserta las ciudades nuevas y los destinos de un lote y confirma la transacción.
+    Las ciudades nuevas se agregan al mapa 'ciudades', y las del lote al conjunto 'con_destino',
+    solo si el lote se confirma.
+
+    Args:
+        lote (list[tuple]): (número de línea, clave de ciudad, (nombre_ciudad, provincia, pais, precio)).
+
+    Returns:
+        tuple: (destinos insertados, ciudades nuevas).
+    """
+    cursor = conexion.cursor()
+    try:
+        nuevas = {}
+        for _, clave, valores in lote:
+            if clave not in ciudades and clave not in nuevas:
+                nuevas[clave] = valores
+
+        ids_nuevos = {}
+        if nuevas:
+            _insertar_varias(cursor, "INSERT INTO ciudades (nombre_ciudad, provincia, pais, costo_base)",
+                             list(nuevas.values()))
+            ids_nuevos = _leer_ids_de_ciudades(cursor, nuevas)
+
+        _insertar_varias(cursor, "INSERT INTO destinos (id_ciudad)",
+                         [(ciudades.get(clave) or ids_nuevos[clave],) for _, clave, _ in lote])
+        conexion.commit()
+        invalidar_catalogo()
+        ciudades.update(ids_nuevos)
+        con_destino.update(clave for _, clave, _ in lote)
+        return len(lote), len(ids_nuevos)
+    except Exception as e:
+        conexion.rollback()
+        for numero_linea, _, _ in lote:
+            rechazos.append((numero_linea, f"Error al insertar el lote: {e}"))
+        return 0, 0
+    finally:
+        cursor.close()
+
+
+def importar_destinos(ruta, tamanio_lote=TAMANIO_LOTE):
+    """
+    Importa los destinos de un archivo CSV o JSONL en lotes.
+
+    Args:
+        ruta (str): Ruta del archivo a importar.
+        tamanio_lote (int): Cantidad de destinos por INSERT y por commit.
+
+    Returns:
+        dict: Resumen con 'leidos', 'importados', 'ciudades_nuevas', 'rechazos' (lista de
+        (línea, motivo)), 'segundos' y 'filas_por_segundo'.
+    """
+    if tamanio_lote < 1:
+        raise ValueError("El tamaño de lote debe ser al menos 1.")
+
+    conexion = obtener_conexion()
+    inicio = time.perf_counter()
+    leidos = 0
+    importados = 0
+    ciudades_nuevas = 0
+    rechazos = []
+    lote = []
+    en_lote = set()
+
+    try:
+        ciudades, con_destino = cargar_ciudades(conexion)
+        for numero_linea, registro in leer_registros(ruta):
+            leidos += 1
+            try:
+                valores = normalizar_destino(registro)
+            except ValueError as e:
+                rechazos.append((numero_linea, str(e)))
+                continue
+
+            clave = clave_ciudad(*valores[:3])
+            if clave in con_destino or clave in en_lote:
+                rechazos.append((numero_linea, f"Ya existe un destino para {valores[0]}, {valores[1]}, {valores[2]}."))
+                continue
+            en_lote.add(clave)
+            lote.append((numero_linea, clave, valores))
+
+            if len(lote) >= tamanio_lote:
+                insertados, nuevas = _insertar_lote(conexion, lote, ciudades, con_destino, rechazos)
+                importados += insertados
+                ciudades_nuevas += nuevas
+                lote = []
+                en_lote = set()
+                transcurrido = time.perf_counter() - inicio
+                print(f"{importados} destinos importados ({leidos / transcurrido:.0f} filas/s).")
+
+        if lote:
+            insertados, nuevas = _insertar_lote(conexion, lote, ciudades, con_destino, rechazos)
+            importados += insertados
+            ciudades_nuevas += nuevas
+    finally:
+        conexion.close()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "leidos": leidos,
+        "importados": importados,
+        "ciudades_nuevas": ciudades_nuevas,
+        "rechazos": sorted(rechazos),
+        "segundos": segundos,
+        "filas_por_segundo": leidos / segundos if segundos > 0 else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importación masiva de destinos desde CSV o JSONL.")
+    parser.add_argument("archivo", help="Archivo .csv o .jsonl con los destinos a importar.")
+    parser.add_argument("--lote", type=int, default=TAMANIO_LOTE, help="Registros por lote.")
+    parser.add_argument("--rechazos", help="Archivo CSV donde guardar los registros rechazados.")
+    argumentos = parser.parse_args()
+
+    resumen = importar_destinos(argumentos.archivo, argumentos.lote)
+
+    for numero_linea, motivo in resumen["rechazos"]:
+        print(f"Línea {numero_linea} rechazada: {motivo}")
+    if argumentos.rechazos:
+        guardar_rechazos(resumen["rechazos"], argumentos.rechazos)
+
+    print(f"Registros leídos: {resumen['leidos']}, destinos importados: {resumen['importados']} "
+          f"({resumen['ciudades_nuevas']} ciudades nuevas), rechazados: {len(resumen['rechazos'])}.")
+    print(f"Tiempo total: {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s).")
@@ -0,0 +1,266 @@
+"""
+Módulo: importacion_ventas.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y permite cargar en forma masiva las ventas
+que informan los revendedores en archivos CSV o JSONL, sin ingresarlas una por una desde
+'gestion_de_ventas'.
+
+El archivo se procesa por lotes: para cada lote se consulta una sola vez el estado de todos los
+clientes y la existencia de todos los destinos involucrados, las ventas válidas se insertan con
+un INSERT de varias filas y el lote se confirma con un único commit. El total de cada venta se
+calcula con 'tarifas.cotizar_lote', para todo el lote a la vez, y los resúmenes de ventas se
+actualizan con una fila por cliente y por destino del lote.
+
+Los asientos se descuentan del cupo de cada destino una vez por lote
+('asientos.reservar_asientos_lote'), en el mismo orden del archivo: las ventas que ya no entran
+en el cupo se rechazan en lugar de sobrevender el destino.
+
+Uso:
+    python importacion_ventas.py ventas.csv [--lote 1000] [--rechazos rechazos.csv]
+
+Columnas esperadas: dni, id_destino, cantidad, fecha (AAAA-MM-DD HH:MM:SS).
+"""
+
+import argparse
+import math
+import time
+from datetime import datetime
+
+from asientos import reservar_asientos_lote
+from clientes import es_dni_valido
+from conexion_base_de_datos import obtener_conexion
+from importacion_clientes import leer_registros, guardar_rechazos
+from tarifas import cotizar_lote
+from resumen_ventas import registrar_lote_en_resumen
+
+
+# Cantidad de ventas que se validan, insertan y confirman juntas.
+TAMANIO_LOTE = 1000
+
+
+def normalizar_venta(registro):
+    """
+    Valida el formato de un registro de venta.
+
+    Returns:
+        tuple: (dni, id_destino, cantidad, fecha) con los tipos de la tabla 'ventas'.
+
+    Raises:
+        ValueError: Con el motivo del rechazo si algún dato es inválido.
+    """
+    if registro is None:
+        raise ValueError("Registro ilegible.")
+
+    def campo(nombre):
+        valor = registro.get(nombre)
+        return "" if valor is None else str(valor).strip()
+
+    dni = campo("dni")
+    if not es_dni_valido(dni):
+        raise ValueError(f"DNI inválido '{dni}'. Debe ser en formato 111.111.111")
+
+    try:
+        id_destino = int(campo("id_destino"))
+    except ValueError:
+        raise ValueError(f"ID de destino inválido '{campo('id_destino')}'.") from None
+
+    try:
+        cantidad = int(campo("cantidad"))
+    except ValueError:
+        cantidad = 0
+    if cantidad < 1:
+        raise ValueError(f"Cantidad de tickets inválida '{campo('cantidad')}'.")
+
+    try:
+        fecha = datetime.fromisoformat(campo("fecha"))
+    except ValueError:
+        raise ValueError(f"Fecha inválida '{campo('fecha')}'. Formato esperado: AAAA-MM-DD HH:MM:SS") from None
+
+    return dni, id_destino, cantidad, fecha
+
+
+def _marcadores(cantidad):
+    return ", ".join(["%s"] * cantidad)
+
+
+def _consulta_estados(cantidad):
+    """Consulta del estado de 'cantidad' clientes, por DNI."""
+    return f"SELECT dni_cliente, estado_de_cliente FROM clientes WHERE dni_cliente IN ({_marcadores(cantidad)});"
+
+
+def _consulta_destinos(cantidad):
+    """Consulta de cuáles de 'cantidad' IDs de destino existen."""
+    return f"SELECT id_destino FROM destinos WHERE id_destino IN ({_marcadores(cantidad)});"
+
+
+def _consulta_purgas(clientes, destinos):
+    """Consulta de las purgas en curso de 'clientes' DNI y 'destinos' IDs de destino."""
+    return f"""
+        SELECT tipo, clave FROM purgas_pendientes
+        WHERE (tipo = 'cliente' AND clave IN ({_marcadores(clientes)}))
+           OR (tipo = 'destino' AND clave IN ({_marcadores(destinos)}))
+        FOR UPDATE;
+    """
+
+
+def _insertar_lote(conexion, lote, rechazos):
+    """
+    Verifica contra la base de datos los clientes, destinos y asientos disponibles de un lote,
+    inserta las ventas válidas y confirma la transacción.
+
+    Args:
+        lote (list[tuple]): (número de línea, (dni, id_destino, cantidad, fecha)).
+
+    Returns:
+        int: Cantidad de ventas insertadas.
+    """
+    cursor = conexion.cursor()
+    rechazos_previos = len(rechazos)
+    try:
+        dnis = list({venta[0] for _, venta in lote})
+        cursor.execute(_consulta_estados(len(dnis)), dnis)
+        estados = dict(cursor.fetchall())
+
+        ids_destino = list({venta[1] for _, venta in lote})
+        cursor.execute(_consulta_destinos(len(ids_destino)), ids_destino)
+        destinos = {fila[0] for fila in cursor.fetchall()}
+
+        # Clientes y destinos que se están eliminando (ver 'purga'): no admiten ventas nuevas.
+        cursor.execute(_consulta_purgas(len(dnis), len(ids_destino)),
+                       dnis + [str(id_destino) for id_destino in ids_destino])
+        en_purga = set(cursor.fetchall())
+
+        filas = []
+        for numero_linea, (dni, id_destino, cantidad, fecha) in lote:
+            if dni not in estados:
+                rechazos.append((numero_linea, f"No existe un cliente con DNI {dni}."))
+            elif ("cliente", dni) in en_purga:
+                rechazos.append((numero_linea, f"El cliente con DNI {dni} se está eliminando."))
+            elif estados[dni] != "Activo":
+                rechazos.append((numero_linea, f"El cliente con DNI {dni} está inactivo."))
+            elif id_destino not in destinos:
+                rechazos.append((numero_linea, f"No existe un destino con ID {id_destino}."))
+            elif ("destino", str(id_destino)) in en_purga:
+                rechazos.append((numero_linea, f"El destino con ID {id_destino} se está eliminando."))
+            else:
+                filas.append((numero_linea, fecha, id_destino, cantidad, dni))
+
+        # Los destinos se bloquean siempre en el mismo orden, para no cruzarse con otro lote.
+        por_destino = {}
+        for fila in filas:
+            por_destino.setdefault(fila[2], []).append(fila)
+        filas = []
+        tramos = {}
+        for id_destino in sorted(por_destino):
+            ventas_del_destino = por_destino[id_destino]
+            errores, tramo = reservar_asientos_lote(conexion, id_destino,
+                                                    [fila[3] for fila in ventas_del_destino])
+            if tramo is not None:
+                tramos[id_destino] = tramo
+            for fila, error in zip(ventas_del_destino, errores):
+                if error is None:
+                    filas.append(fila)
+                else:
+                    rechazos.append((fila[0], str(error)))
+        # Las ventas aceptadas se insertan en el orden del archivo.
+        filas = [fila[1:] for fila in sorted(filas)]
+
+        if not filas:
+            conexion.rollback()
+            return 0
+
+        # Los totales del lote se cotizan juntos, en una sola pasada.
+        fechas, ids, cantidades, _ = zip(*filas)
+        totales = cotizar_lote(ids, cantidades, fechas, conexion).tolist()
+        filas = [(fecha, id_destino, cantidad, None if math.isnan(total) else total, dni)
+                 for (fecha, id_destino, cantidad, dni), total in zip(filas, totales)]
+
+        cursor.executemany("""
+            INSERT INTO ventas (fecha_de_compra, id_destino, cantidad_de_tickets, total_venta, dni_cliente)
+            VALUES (%s, %s, %s, %s, %s);
+        """, filas)
+        registrar_lote_en_resumen(conexion, [(dni, id_destino, cantidad, "Activa")
+                                             for _, id_destino, cantidad, _, dni in filas], tramos=tramos)
+        conexion.commit()
+        return len(filas)
+    except Exception as e:
+        conexion.rollback()
+        # Las líneas de este lote que ya se habían rechazado conservan su motivo.
+        ya_rechazadas = {numero_linea for numero_linea, _ in rechazos[rechazos_previos:]}
+        for numero_linea, _ in lote:
+            if numero_linea not in ya_rechazadas:
+                rechazos.append((numero_linea, f"Error al insertar el lote: {e}"))
+        return 0
+    finally:
+        cursor.close()
+
+
+def importar_ventas(ruta, tamanio_lote=TAMANIO_LOTE):
+    """
+    Importa las ventas de un archivo CSV o JSONL en lotes.
+
+    Args:
+        ruta (str): Ruta del archivo a importar.
+        tamanio_lote (int): Cantidad de ventas por lote (y por commit).
+
+    Returns:
+        dict: Resumen con 'leidos', 'importados', 'rechazos' (lista de (línea, motivo)),
+        'segundos' y 'filas_por_segundo'.
+    """
+    if tamanio_lote < 1:
+        raise ValueError("El tamaño de lote debe ser al menos 1.")
+
+    conexion = obtener_conexion()
+    inicio = time.perf_counter()
+    leidos = 0
+    importados = 0
+    rechazos = []
+    lote = []
+
+    try:
+        for numero_linea, registro in leer_registros(ruta):
+            leidos += 1
+            try:
+                lote.append((numero_linea, normalizar_venta(registro)))
+            except ValueError as e:
+                rechazos.append((numero_linea, str(e)))
+                continue
+
+            if len(lote) >= tamanio_lote:
+                importados += _insertar_lote(conexion, lote, rechazos)
+                lote = []
+                transcurrido = time.perf_counter() - inicio
+                print(f"{importados} ventas importadas ({leidos / transcurrido:.0f} filas/s).")
+
+        if lote:
+            importados += _insertar_lote(conexion, lote, rechazos)
+    finally:
+        conexion.close()
+
+    segundos = time.perf_counter() - inicio
+    return {
+        "leidos": leidos,
+        "importados": importados,
+        "rechazos": sorted(rechazos),
+        "segundos": segundos,
+        "filas_por_segundo": leidos / segundos if segundos > 0 else 0.0,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Importación masiva de ventas desde CSV o JSONL.")
+    parser.add_argument("archivo", help="Archivo .csv o .jsonl con las ventas a importar.")
+    parser.add_argument("--lote", type=int, default=TAMANIO_LOTE, help="Ventas por lote.")
+    parser.add_argument("--rechazos", help="Archivo CSV donde guardar los registros rechazados.")
+    argumentos = parser.parse_args()
+
+    resumen = importar_ventas(argumentos.archivo, argumentos.lote)
+
+    for numero_linea, motivo in resumen["rechazos"]:
+        print(f"Línea {numero_linea} rechazada: {motivo}")
+    if argumentos.rechazos:
+        guardar_rechazos(resumen["rechazos"], argumentos.rechazos)
+
+    print(f"Registros leídos: {resumen['leidos']}, importados: {resumen['importados']}, "
+          f"rechazados: {len(resumen['rechazos'])}.")
+    print(f"Tiempo total: {resumen['segundos']:.2f} s ({resumen['filas_por_segundo']:.0f} filas/s).")
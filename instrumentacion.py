@@ -0,0 +1,313 @@
+"""
+Módulo: instrumentacion.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y mide el tiempo de cada sentencia SQL que
+ejecutan los módulos, para saber qué consulta vuelve lenta una operación del menú.
+
+Cuando está habilitada, las conexiones que entrega 'obtener_conexion' se envuelven de modo que
+cada 'execute', cada lectura de resultados ('fetchone', 'fetchmany', 'fetchall') y cada 'commit'
+se cronometran y se etiquetan con la función que los originó ('agregar_venta',
+'listado_clientes', ...): la más cercana en la pila de los módulos de operaciones del menú, aun
+cuando la sentencia la ejecute un módulo auxiliar como 'cache_clientes' o 'asientos'. Con esa
+información se mantienen:
+
+- Histogramas acumulados por función y sentencia, exportables en formato de texto de Prometheus.
+- Las últimas mediciones de cada sentencia, para consultar percentiles recientes.
+- Un registro de consultas lentas con las sentencias que superan un umbral configurable.
+
+Deshabilitada (el valor por defecto), el único costo es comprobar una variable al entregar cada
+conexión. Se habilita con 'habilitar()' o con la variable de entorno SKYROUTE_INSTRUMENTACION=1
+(el umbral de lentitud puede fijarse con SKYROUTE_UMBRAL_LENTO_MS).
+"""
+
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+
+
+HABILITADA = os.environ.get("SKYROUTE_INSTRUMENTACION", "0") == "1"
+
+# Duración (en segundos) a partir de la cual una sentencia se registra como lenta.
+UMBRAL_LENTO = float(os.environ.get("SKYROUTE_UMBRAL_LENTO_MS", "100")) / 1000
+RUTA_LOG_LENTAS = "consultas_lentas.log"
+
+# Límites superiores (en segundos) de los intervalos de los histogramas.
+LIMITES_HISTOGRAMA = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Cantidad de mediciones recientes que se conservan por sentencia.
+MEDICIONES_RECIENTES = 1000
+
+# Módulos de infraestructura que no cuentan como origen de una sentencia.
+MODULOS_INTERNOS = {"instrumentacion.py", "conexion_base_de_datos.py", "motor_sqlite.py", "sentencias.py"}
+
+# Módulos con las operaciones del menú. Una sentencia que ejecuta un módulo auxiliar (cachés,
+# cupo de asientos, resúmenes...) se atribuye a la operación de estos módulos que lo llamó.
+MODULOS_DE_OPERACIONES = {"clientes.py", "ventas.py", "destinos.py"}
+
+registro_lentas = logging.getLogger("skyroute.consultas_lentas")
+registro_lentas.propagate = False
+
+_bloqueo = threading.Lock()
+_metricas = {}
+_manejador_log = None
+
+
+class _Metrica:
+    """Histograma acumulado y mediciones recientes de una sentencia."""
+
+    __slots__ = ("intervalos", "cantidad", "suma", "recientes")
+
+    def __init__(self):
+        self.intervalos = [0] * (len(LIMITES_HISTOGRAMA) + 1)
+        self.cantidad = 0
+        self.suma = 0.0
+        self.recientes = deque(maxlen=MEDICIONES_RECIENTES)
+
+    def agregar(self, duracion):
+        indice = 0
+        while indice < len(LIMITES_HISTOGRAMA) and duracion > LIMITES_HISTOGRAMA[indice]:
+            indice += 1
+        self.intervalos[indice] += 1
+        self.cantidad += 1
+        self.suma += duracion
+        self.recientes.append(duracion)
+
+
+@lru_cache(maxsize=2048)
+def normalizar_sentencia(sql):
+    """
+    Reduce una sentencia a una forma canónica para agrupar sus mediciones: espacios colapsados
+    y listas de marcadores de cualquier longitud ('IN (%s, %s, ...)') unificadas.
+    """
+    sql = " ".join(sql.split()).rstrip(";")
+    return re.sub(r"%s(?:\s*,\s*%s)+", "%s, ...", sql)
+
+
+def _origen():
+    """
+    Devuelve el nombre de la función más cercana de los módulos de operaciones o, si la sentencia
+    no proviene de ellos (una importación, la purga...), el de la primera función fuera de los
+    módulos de infraestructura.
+    """
+    primera = None
+    marco = sys._getframe(2)
+    while marco is not None:
+        modulo = os.path.basename(marco.f_code.co_filename)
+        if modulo in MODULOS_DE_OPERACIONES:
+            return marco.f_code.co_name
+        if primera is None and modulo not in MODULOS_INTERNOS:
+            primera = marco.f_code.co_name
+        marco = marco.f_back
+    return primera or "desconocido"
+
+
+def registrar_medicion(origen, operacion, sentencia, duracion):
+    """Acumula una medición y, si supera el umbral, la escribe en el registro de consultas lentas."""
+    clave = (origen, operacion, sentencia)
+    with _bloqueo:
+        metrica = _metricas.get(clave)
+        if metrica is None:
+            metrica = _metricas[clave] = _Metrica()
+        metrica.agregar(duracion)
+    if duracion >= UMBRAL_LENTO:
+        registro_lentas.warning("%.1f ms | %s | %s | %s", duracion * 1000, origen, operacion, sentencia)
+
+
+class CursorInstrumentado:
+    """Cursor que cronometra cada ejecución y cada lectura de resultados."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._sentencia = ""
+        self._origen = "desconocido"
+
+    def execute(self, sql, parametros=()):
+        self._sentencia = normalizar_sentencia(sql)
+        self._origen = _origen()
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.execute(sql, parametros)
+        finally:
+            registrar_medicion(self._origen, "execute", self._sentencia, time.perf_counter() - inicio)
+
+    def executemany(self, sql, secuencia_parametros):
+        self._sentencia = normalizar_sentencia(sql)
+        self._origen = _origen()
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.executemany(sql, secuencia_parametros)
+        finally:
+            registrar_medicion(self._origen, "executemany", self._sentencia, time.perf_counter() - inicio)
+
+    def _leer(self, metodo, *argumentos):
+        inicio = time.perf_counter()
+        try:
+            return metodo(*argumentos)
+        finally:
+            registrar_medicion(self._origen, "fetch", self._sentencia, time.perf_counter() - inicio)
+
+    def fetchone(self):
+        return self._leer(self._cursor.fetchone)
+
+    def fetchmany(self, cantidad=1):
+        return self._leer(self._cursor.fetchmany, cantidad)
+
+    def fetchall(self):
+        return self._leer(self._cursor.fetchall)
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+
+class ConexionInstrumentada:
+    """Conexión que entrega cursores instrumentados y cronometra los commits."""
+
+    def __init__(self, conexion):
+        self._conexion = conexion
+
+    @property
+    def datos_de_conexion(self):
+        """
+        Datos de la conexión física, separados de los que usa la conexión sin instrumentar: los
+        cursores preparados que guarda 'sentencias' son instrumentados y no deben seguir usándose
+        (ni midiendo) cuando la instrumentación se deshabilita.
+        """
+        datos = getattr(self._conexion, "datos_de_conexion", None)
+        if datos is None:
+            raise AttributeError("datos_de_conexion")
+        return datos.setdefault("instrumentada", {})
+
+    def cursor(self, *argumentos, **opciones):
+        return CursorInstrumentado(self._conexion.cursor(*argumentos, **opciones))
+
+    def commit(self):
+        origen = _origen()
+        inicio = time.perf_counter()
+        try:
+            return self._conexion.commit()
+        finally:
+            registrar_medicion(origen, "commit", "COMMIT", time.perf_counter() - inicio)
+
+    def close(self):
+        self._conexion.close()
+
+    def __enter__(self):
+        self._conexion.__enter__()
+        return self
+
+    def __exit__(self, tipo_error, error, traza):
+        return self._conexion.__exit__(tipo_error, error, traza)
+
+    def __getattr__(self, nombre):
+        return getattr(self._conexion, nombre)
+
+
+def instrumentar(conexion):
+    """Envuelve una conexión para medir sus sentencias."""
+    return ConexionInstrumentada(conexion)
+
+
+def habilitar(umbral_lento=None, ruta_log=None):
+    """
+    Habilita la instrumentación para las conexiones que se entreguen a partir de ahora.
+
+    Args:
+        umbral_lento (float | None): Segundos a partir de los cuales una sentencia es lenta.
+        ruta_log (str | None): Archivo del registro de consultas lentas.
+    """
+    global HABILITADA, UMBRAL_LENTO, RUTA_LOG_LENTAS, _manejador_log
+    if umbral_lento is not None:
+        UMBRAL_LENTO = umbral_lento
+    if ruta_log is not None:
+        RUTA_LOG_LENTAS = ruta_log
+    if _manejador_log is not None:
+        registro_lentas.removeHandler(_manejador_log)
+        _manejador_log.close()
+    _manejador_log = logging.FileHandler(RUTA_LOG_LENTAS, encoding="utf-8")
+    _manejador_log.setFormatter(logging.Formatter("%(asctime)s | %(message)s"))
+    registro_lentas.addHandler(_manejador_log)
+    registro_lentas.setLevel(logging.WARNING)
+    HABILITADA = True
+
+
+def deshabilitar():
+    """
+    Deshabilita la instrumentación. Las métricas acumuladas se conservan, y las conexiones que se
+    entreguen a partir de ahora usan sus propios cursores preparados, sin instrumentar.
+    """
+    global HABILITADA
+    HABILITADA = False
+
+
+def reiniciar():
+    """Descarta todas las métricas acumuladas."""
+    with _bloqueo:
+        _metricas.clear()
+
+
+def resumen():
+    """
+    Resume las mediciones recientes de cada sentencia, ordenadas por tiempo total descendente.
+
+    Returns:
+        list[dict]: origen, operación, sentencia, cantidad total, segundos totales y
+        percentiles 50/95/99 (en milisegundos) de las mediciones recientes.
+    """
+    with _bloqueo:
+        copia = [(clave, metrica.cantidad, metrica.suma, sorted(metrica.recientes))
+                 for clave, metrica in _metricas.items()]
+    filas = []
+    for (origen, operacion, sentencia), cantidad, suma, recientes in copia:
+        def percentil(porcentaje):
+            return recientes[min(len(recientes) - 1, int(len(recientes) * porcentaje / 100))] * 1000
+        filas.append({
+            "origen": origen, "operacion": operacion, "sentencia": sentencia,
+            "cantidad": cantidad, "segundos": suma,
+            "p50_ms": percentil(50), "p95_ms": percentil(95), "p99_ms": percentil(99),
+        })
+    filas.sort(key=lambda fila: fila["segundos"], reverse=True)
+    return filas
+
+
+def _etiqueta(valor):
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def exportar_prometheus():
+    """
+    Exporta los histogramas acumulados en el formato de texto de Prometheus.
+
+    Returns:
+        str: Métrica 'skyroute_sentencia_segundos' con etiquetas origen, operacion y sentencia.
+    """
+    with _bloqueo:
+        copia = [(clave, list(metrica.intervalos), metrica.cantidad, metrica.suma)
+                 for clave, metrica in sorted(_metricas.items())]
+
+    lineas = [
+        "# HELP skyroute_sentencia_segundos Duración de las sentencias SQL por función de origen.",
+        "# TYPE skyroute_sentencia_segundos histogram",
+    ]
+    for (origen, operacion, sentencia), intervalos, cantidad, suma in copia:
+        etiquetas = (f'origen="{_etiqueta(origen)}",operacion="{operacion}",'
+                     f'sentencia="{_etiqueta(sentencia)}"')
+        acumulado = 0
+        for limite, cantidad_intervalo in zip(LIMITES_HISTOGRAMA, intervalos):
+            acumulado += cantidad_intervalo
+            lineas.append(f'skyroute_sentencia_segundos_bucket{{{etiquetas},le="{limite}"}} {acumulado}')
+        lineas.append(f'skyroute_sentencia_segundos_bucket{{{etiquetas},le="+Inf"}} {cantidad}')
+        lineas.append(f"skyroute_sentencia_segundos_sum{{{etiquetas}}} {suma}")
+        lineas.append(f"skyroute_sentencia_segundos_count{{{etiquetas}}} {cantidad}")
+    return "\n".join(lineas) + "\n"
+
+
+if HABILITADA:
+    habilitar()
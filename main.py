@@ -7,12 +7,18 @@ Desde aquí se invocan los módulos encargados de la gestión de clientes, venta
 Actúa como interfaz de usuario en consola, permitiendo la navegación por el sistema.
 """
 
+import logging
+
 from clientes import gestion_de_clientes, listado_clientes, agregar_cliente, modificar_cliente, eliminar_cliente
 from destinos import gestion_de_destinos, registrar_destino, listar_destinos, modificar_destino, eliminar_destino
-from ventas import gestion_de_ventas, agregar_venta, anular_venta
+from ventas import gestion_de_ventas, agregar_venta, anular_venta, iniciar_barredor, detener_barredor
 from conexion_base_de_datos import obtener_conexion
 
 
+# Archivo donde se registran los errores de las tareas en segundo plano (por ejemplo, el barredor).
+RUTA_LOG = "skyroute.log"
+
+
 def main():
     """
     Función principal del sistema.
@@ -24,7 +30,19 @@ def main():
     4. Salir del sistema
 
     Permanece en ejecución hasta que el usuario seleccione la opción de salida.
+    Mientras tanto, un barredor en segundo plano cierra las ventas cuya ventana de anulación venció;
+    sus errores se registran en RUTA_LOG, para no interrumpir el menú.
     """
+    logging.basicConfig(filename=RUTA_LOG, level=logging.WARNING,
+                        format="%(asctime)s | %(name)s | %(levelname)s | %(message)s")
+    iniciar_barredor()
+    try:
+        _menu_principal()
+    finally:
+        detener_barredor()
+
+
+def _menu_principal():
     while True:
         print("MENU PRINCIPAL")
         print("1. Gestión de clientes")
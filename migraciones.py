@@ -0,0 +1,130 @@
+"""
+Módulo: migraciones.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y aplica, en orden, los cambios de esquema
+versionados que se encuentran en 'base_de_datos/migraciones'.
+
+Cada migración es un archivo 'NNNN_descripcion.sql', donde NNNN es su número de versión.
+Las versiones aplicadas se registran en la tabla 'migraciones_aplicadas', por lo que ejecutar
+este módulo varias veces solo aplica las migraciones pendientes.
+
+Cuando una migración necesita sintaxis propia de un motor, se escribe en dos archivos con la
+misma versión: 'NNNN_descripcion.mysql.sql' y 'NNNN_descripcion.sqlite.sql'. Cada motor aplica
+solo la variante que le corresponde. Con SQLite las migraciones se aplican automáticamente al
+crear la base.
+
+Uso (después de crear las tablas con 'estructura_tablas.sql'):
+    python migraciones.py
+"""
+
+import os
+import re
+
+from conexion_base_de_datos import obtener_conexion
+
+
+DIRECTORIO_MIGRACIONES = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                      "base_de_datos", "migraciones")
+
+PATRON_ARCHIVO = re.compile(r"^(\d{4})_(\w+?)(?:\.(mysql|sqlite))?\.sql$")
+
+
+def listar_migraciones(directorio=DIRECTORIO_MIGRACIONES, motor="mysql"):
+    """
+    Lista las migraciones disponibles para un motor, ordenadas por versión.
+
+    Returns:
+        list[tuple]: (versión, nombre, ruta del archivo).
+    """
+    migraciones = []
+    for archivo in os.listdir(directorio):
+        coincidencia = PATRON_ARCHIVO.match(archivo)
+        if coincidencia and coincidencia.group(3) in (None, motor):
+            migraciones.append((int(coincidencia.group(1)), coincidencia.group(2),
+                                os.path.join(directorio, archivo)))
+    migraciones.sort()
+    return migraciones
+
+
+def leer_sentencias(ruta):
+    """
+    Lee un archivo SQL y lo separa en sentencias, descartando los comentarios de línea.
+
+    Returns:
+        list[str]: Sentencias SQL sin el ';' final.
+    """
+    with open(ruta, encoding="utf-8") as archivo:
+        lineas = [linea for linea in archivo if not linea.lstrip().startswith("--")]
+    return [sentencia.strip() for sentencia in "".join(lineas).split(";") if sentencia.strip()]
+
+
+def versiones_aplicadas(cursor):
+    """
+    Crea, si hace falta, la tabla de control y devuelve las versiones ya aplicadas.
+
+    Returns:
+        set[int]: Versiones registradas en 'migraciones_aplicadas'.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS migraciones_aplicadas (
+            version INT NOT NULL,
+            nombre VARCHAR(100) NOT NULL,
+            fecha_aplicacion DATETIME NOT NULL,
+            PRIMARY KEY (version)
+        );
+    """)
+    cursor.execute("SELECT version FROM migraciones_aplicadas;")
+    return {fila[0] for fila in cursor.fetchall()}
+
+
+def aplicar_migraciones(conexion=None, directorio=DIRECTORIO_MIGRACIONES):
+    """
+    Aplica las migraciones pendientes en orden de versión.
+
+    Args:
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+        directorio (str): Carpeta donde buscar las migraciones.
+
+    Returns:
+        list[tuple]: (versión, nombre) de las migraciones aplicadas en esta ejecución.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    aplicadas = []
+
+    try:
+        ya_aplicadas = versiones_aplicadas(cursor)
+        motor = getattr(conexion, "motor", "mysql")
+        for version, nombre, ruta in listar_migraciones(directorio, motor):
+            if version in ya_aplicadas:
+                continue
+            for sentencia in leer_sentencias(ruta):
+                cursor.execute(sentencia)
+            cursor.execute("""
+                INSERT INTO migraciones_aplicadas (version, nombre, fecha_aplicacion)
+                VALUES (%s, %s, NOW());
+            """, (version, nombre))
+            conexion.commit()
+            aplicadas.append((version, nombre))
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    return aplicadas
+
+
+if __name__ == "__main__":
+    try:
+        aplicadas = aplicar_migraciones()
+    except Exception as e:
+        print(f"Error al aplicar las migraciones: {e}")
+        raise SystemExit(1)
+
+    if aplicadas:
+        for version, nombre in aplicadas:
+            print(f"Migración {version:04d} aplicada: {nombre}")
+    else:
+        print("La base de datos ya está actualizada.")
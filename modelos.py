@@ -0,0 +1,211 @@
+"""
+Módulo: modelos.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y define los tipos de registro con los que los
+módulos manejan las filas de la base de datos: Cliente, Telefono, Ciudad, Destino, Venta y
+Arrepentimiento.
+
+Cada campo se lee por su nombre ('cliente.estado_de_cliente') en lugar de por su posición en la
+tupla ('cliente[6]'), que cambiaba de una consulta a otra. Las clases usan '__slots__': sus
+instancias no tienen diccionario propio y ocupan lo mismo que una tupla con los mismos valores.
+
+Cada clase declara en COLUMNAS las columnas, en orden, con las que se construye desde una fila:
+
+    cursor.execute(f"SELECT {Venta.COLUMNAS} FROM ventas WHERE dni_cliente = %s;", (dni,))
+    ventas = Venta.desde_filas(cursor.fetchall())
+
+Para resultados muy grandes, 'VentasEnColumnas' guarda las ventas por columnas en arreglos
+compactos ('array') en lugar de un objeto por fila.
+"""
+
+from array import array
+from datetime import datetime
+from itertools import starmap
+from math import isnan, nan
+
+
+class _Registro:
+    """Base de los registros: igualdad, representación y conversión a tupla a partir de los slots."""
+
+    __slots__ = ()
+    COLUMNAS = ""
+
+    @classmethod
+    def desde_filas(cls, filas):
+        """
+        Construye un registro por cada fila (tuplas en el orden de COLUMNAS).
+        Acepta una lista o un iterable perezoso, como el propio cursor.
+
+        Returns:
+            list: Registros, en el mismo orden que las filas.
+        """
+        return list(starmap(cls, filas))
+
+    def como_tupla(self):
+        return tuple(getattr(self, campo) for campo in self.__slots__)
+
+    def __iter__(self):
+        return iter(self.como_tupla())
+
+    def __eq__(self, otro):
+        return type(self) is type(otro) and self.como_tupla() == otro.como_tupla()
+
+    def __hash__(self):
+        return hash(self.como_tupla())
+
+    def __repr__(self):
+        valores = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.__slots__)
+        return f"{type(self).__name__}({valores})"
+
+
+class Cliente(_Registro):
+    """Fila de la tabla 'clientes'."""
+
+    __slots__ = ("id_cliente", "dni_cliente", "dir_cliente", "nombre_cliente", "apellido_cliente",
+                 "email_cliente", "estado_de_cliente")
+    COLUMNAS = ("id_cliente, dni_cliente, dir_cliente, nombre_cliente, apellido_cliente, "
+                "email_cliente, estado_de_cliente")
+
+    def __init__(self, id_cliente, dni_cliente, dir_cliente, nombre_cliente, apellido_cliente,
+                 email_cliente, estado_de_cliente):
+        self.id_cliente = id_cliente
+        self.dni_cliente = dni_cliente
+        self.dir_cliente = dir_cliente
+        self.nombre_cliente = nombre_cliente
+        self.apellido_cliente = apellido_cliente
+        self.email_cliente = email_cliente
+        self.estado_de_cliente = estado_de_cliente
+
+    @property
+    def activo(self):
+        return self.estado_de_cliente == "Activo"
+
+
+class Telefono(_Registro):
+    """Fila de la tabla 'telefonos'."""
+
+    __slots__ = ("id_telefono", "tel_cliente", "dni_cliente")
+    COLUMNAS = "id_telefono, tel_cliente, dni_cliente"
+
+    def __init__(self, id_telefono, tel_cliente, dni_cliente):
+        self.id_telefono = id_telefono
+        self.tel_cliente = tel_cliente
+        self.dni_cliente = dni_cliente
+
+
+class Ciudad(_Registro):
+    """Fila de la tabla 'ciudades'."""
+
+    __slots__ = ("id_ciudad", "nombre_ciudad", "provincia", "pais", "costo_base")
+    COLUMNAS = "id_ciudad, nombre_ciudad, provincia, pais, costo_base"
+
+    def __init__(self, id_ciudad, nombre_ciudad, provincia, pais, costo_base):
+        self.id_ciudad = id_ciudad
+        self.nombre_ciudad = nombre_ciudad
+        self.provincia = provincia
+        self.pais = pais
+        self.costo_base = costo_base
+
+
+class Destino(_Registro):
+    """
+    Destino junto con los datos de su ciudad (fila de 'destinos' unida a 'ciudades'),
+    tal como lo guarda el catálogo de 'cache_destinos'.
+    """
+
+    __slots__ = ("id_destino", "nombre_ciudad", "provincia", "pais", "costo_base", "id_ciudad")
+    COLUMNAS = "d.id_destino, c.nombre_ciudad, c.provincia, c.pais, c.costo_base, c.id_ciudad"
+
+    def __init__(self, id_destino, nombre_ciudad, provincia, pais, costo_base, id_ciudad):
+        self.id_destino = id_destino
+        self.nombre_ciudad = nombre_ciudad
+        self.provincia = provincia
+        self.pais = pais
+        self.costo_base = costo_base
+        self.id_ciudad = id_ciudad
+
+
+class Venta(_Registro):
+    """Fila de la tabla 'ventas'."""
+
+    __slots__ = ("id_venta", "fecha_de_compra", "id_destino", "cantidad_de_tickets",
+                 "estado_de_venta", "dni_cliente", "total_venta")
+    COLUMNAS = ("id_venta, fecha_de_compra, id_destino, cantidad_de_tickets, estado_de_venta, dni_cliente, "
+                "total_venta")
+
+    def __init__(self, id_venta, fecha_de_compra, id_destino, cantidad_de_tickets, estado_de_venta,
+                 dni_cliente, total_venta=None):
+        self.id_venta = id_venta
+        self.fecha_de_compra = fecha_de_compra
+        self.id_destino = id_destino
+        self.cantidad_de_tickets = cantidad_de_tickets
+        self.estado_de_venta = estado_de_venta
+        self.dni_cliente = dni_cliente
+        self.total_venta = total_venta
+
+
+class Arrepentimiento(_Registro):
+    """Fila de la tabla 'arrepentimientos'."""
+
+    __slots__ = ("id_arrepentimiento", "fecha_hora_arrepentimiento", "motivo_arrepentimiento", "id_venta")
+    COLUMNAS = "id_arrepentimiento, fecha_hora_arrepentimiento, motivo_arrepentimiento, id_venta"
+
+    def __init__(self, id_arrepentimiento, fecha_hora_arrepentimiento, motivo_arrepentimiento, id_venta):
+        self.id_arrepentimiento = id_arrepentimiento
+        self.fecha_hora_arrepentimiento = fecha_hora_arrepentimiento
+        self.motivo_arrepentimiento = motivo_arrepentimiento
+        self.id_venta = id_venta
+
+
+class VentasEnColumnas:
+    """
+    Conjunto de ventas guardado por columnas, para resultados de cientos de miles de filas.
+
+    Los números y las fechas (como segundos desde 1970) se guardan en arreglos de tipo fijo (un
+    total desconocido, como NaN), el estado como un código de un byte y los DNI como referencias a
+    una única cadena por cliente.
+    Cada venta se reconstruye como 'Venta' solo al accederla.
+    """
+
+    ESTADOS = ("Activa", "Cerrada", "Anulada")
+
+    __slots__ = ("ids", "fechas", "ids_destino", "cantidades", "estados", "dnis", "totales", "_dnis_unicos")
+
+    def __init__(self, filas=()):
+        self.ids = array("q")
+        self.fechas = array("d")
+        self.ids_destino = array("l")
+        self.cantidades = array("l")
+        self.estados = array("b")
+        self.dnis = []
+        self.totales = array("d")
+        self._dnis_unicos = {}
+        self.extender(filas)
+
+    def agregar(self, fila):
+        """Agrega una fila en el orden de Venta.COLUMNAS."""
+        id_venta, fecha, id_destino, cantidad, estado, dni, total = fila
+        self.ids.append(id_venta)
+        self.fechas.append(fecha.timestamp())
+        self.ids_destino.append(id_destino)
+        self.cantidades.append(cantidad or 0)
+        self.estados.append(self.ESTADOS.index(estado))
+        self.dnis.append(self._dnis_unicos.setdefault(dni, dni))
+        self.totales.append(nan if total is None else total)
+
+    def extender(self, filas):
+        for fila in filas:
+            self.agregar(fila)
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, posicion):
+        return Venta(self.ids[posicion], datetime.fromtimestamp(self.fechas[posicion]),
+                     self.ids_destino[posicion], self.cantidades[posicion],
+                     self.ESTADOS[self.estados[posicion]], self.dnis[posicion],
+                     None if isnan(self.totales[posicion]) else self.totales[posicion])
+
+    def __iter__(self):
+        for posicion in range(len(self.ids)):
+            yield self[posicion]
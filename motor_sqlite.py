@@ -0,0 +1,197 @@
+"""
+Módulo: motor_sqlite.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y permite ejecutar el sistema sobre una base
+de datos SQLite embebida, sin servidor MySQL. Es útil para pruebas, demostraciones, mediciones
+de rendimiento e instalaciones pequeñas de un solo puesto.
+
+Las conexiones de este módulo imitan la interfaz de mysql.connector que usan los demás módulos
+(cursor, commit, rollback, ping, lastrowid, rowcount...) y traducen al vuelo las diferencias de
+dialecto: marcadores '%s', NOW(), NOW() - INTERVAL n MINUTE (o DAY), LAST_INSERT_ID(),
+INSERT IGNORE, ON DUPLICATE KEY UPDATE, etc.
+
+El esquema se crea automáticamente la primera vez, a partir de
+'base_de_datos/estructura_tablas_sqlite.sql', y luego se aplican las migraciones pendientes.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+
+RUTA_ESQUEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                            "base_de_datos", "estructura_tablas_sqlite.sql")
+
+# Segundos que una conexión espera a que otra libere la base antes de fallar.
+TIMEOUT_BLOQUEO = 30
+
+def _traducir_actualizacion_duplicada(coincidencia):
+    """'ON DUPLICATE KEY UPDATE c = c + VALUES(c)' -> 'ON CONFLICT DO UPDATE SET c = c + excluded.c'."""
+    return "ON CONFLICT DO UPDATE SET" + re.sub(r"\bVALUES\((\w+)\)", r"excluded.\1", coincidencia.group(1))
+
+
+# Reglas de traducción de MySQL a SQLite, aplicadas en orden.
+REGLAS_DIALECTO = [
+    (re.compile(r"\bNOW\(\)\s*-\s*INTERVAL\s+%s\s+(MINUTE|DAY)\b", re.IGNORECASE),
+     r"datetime('now', 'localtime', '-' || ? || ' \1s')"),
+    (re.compile(r"\bNOW\(\)\s*-\s*INTERVAL\s+(\d+)\s+(MINUTE|DAY)\b", re.IGNORECASE),
+     r"datetime('now', 'localtime', '-\1 \2s')"),
+    (re.compile(r"%s"), "?"),
+    (re.compile(r"\bNOW\(\)", re.IGNORECASE), "datetime('now', 'localtime')"),
+    (re.compile(r"\bLAST_INSERT_ID\(\)", re.IGNORECASE), "last_insert_rowid()"),
+    (re.compile(r"\bINSERT\s+IGNORE\b", re.IGNORECASE), "INSERT OR IGNORE"),
+    (re.compile(r"\s+FOR\s+UPDATE\b", re.IGNORECASE), ""),
+    (re.compile(r"\bON\s+DUPLICATE\s+KEY\s+UPDATE\b(.*)", re.IGNORECASE | re.DOTALL), _traducir_actualizacion_duplicada),
+]
+
+sqlite3.register_adapter(datetime, lambda valor: valor.strftime("%Y-%m-%d %H:%M:%S"))
+sqlite3.register_converter("DATETIME", lambda valor: datetime.fromisoformat(valor.decode()))
+
+_inicializadas = set()
+_bloqueo_inicializacion = threading.Lock()
+
+
+@lru_cache(maxsize=1024)
+def traducir_sql(sql):
+    """
+    Traduce una sentencia escrita para MySQL al dialecto de SQLite.
+    El resultado se memoriza, ya que los módulos reutilizan siempre las mismas sentencias.
+    """
+    for patron, reemplazo in REGLAS_DIALECTO:
+        sql = patron.sub(reemplazo, sql)
+    return sql
+
+
+class CursorSQLite:
+    """Cursor de SQLite con la interfaz del cursor de mysql.connector."""
+
+    def __init__(self, cursor):
+        self._cursor = cursor
+        self._es_consulta = False
+        self._leidas = 0
+
+    def execute(self, sql, parametros=()):
+        self._cursor.execute(traducir_sql(sql), tuple(parametros or ()))
+        self._es_consulta = self._cursor.description is not None
+        self._leidas = 0
+        return None
+
+    def executemany(self, sql, secuencia_parametros):
+        self._cursor.executemany(traducir_sql(sql), [tuple(p) for p in secuencia_parametros])
+        self._es_consulta = False
+        return None
+
+    def fetchone(self):
+        fila = self._cursor.fetchone()
+        if fila is not None:
+            self._leidas += 1
+        return fila
+
+    def fetchmany(self, cantidad=1):
+        filas = self._cursor.fetchmany(cantidad)
+        self._leidas += len(filas)
+        return filas
+
+    def fetchall(self):
+        filas = self._cursor.fetchall()
+        self._leidas += len(filas)
+        return filas
+
+    def __iter__(self):
+        return iter(self.fetchone, None)
+
+    @property
+    def rowcount(self):
+        # En mysql.connector, tras un SELECT rowcount indica las filas leídas hasta el momento.
+        return self._leidas if self._es_consulta else self._cursor.rowcount
+
+    @property
+    def lastrowid(self):
+        return self._cursor.lastrowid
+
+    @property
+    def description(self):
+        return self._cursor.description
+
+    def close(self):
+        self._cursor.close()
+
+
+class ConexionSQLite:
+    """Conexión a SQLite con la interfaz de conexión de mysql.connector."""
+
+    motor = "sqlite"
+
+    def __init__(self, conexion):
+        self._conexion = conexion
+
+    def cursor(self, **opciones):
+        # Opciones propias de mysql.connector (buffered, prepared...) no aplican en SQLite.
+        return CursorSQLite(self._conexion.cursor())
+
+    def commit(self):
+        self._conexion.commit()
+
+    def rollback(self):
+        self._conexion.rollback()
+
+    @property
+    def in_transaction(self):
+        return self._conexion.in_transaction
+
+    def ping(self, reconnect=False):
+        self._conexion.execute("SELECT 1;")
+
+    def is_connected(self):
+        try:
+            self.ping()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def close(self):
+        self._conexion.close()
+
+
+def _conectar_sin_inicializar(ruta):
+    conexion = sqlite3.connect(ruta, timeout=TIMEOUT_BLOQUEO, check_same_thread=False,
+                               detect_types=sqlite3.PARSE_DECLTYPES)
+    conexion.execute("PRAGMA foreign_keys = ON;")
+    conexion.execute("PRAGMA journal_mode = WAL;")
+    conexion.execute("PRAGMA synchronous = NORMAL;")
+    return ConexionSQLite(conexion)
+
+
+def inicializar_base(ruta):
+    """
+    Crea las tablas si la base está vacía y aplica las migraciones pendientes.
+    Se ejecuta una sola vez por proceso y por archivo.
+    """
+    from migraciones import aplicar_migraciones
+
+    clave = os.path.abspath(ruta)
+    with _bloqueo_inicializacion:
+        if clave in _inicializadas:
+            return
+        conexion = _conectar_sin_inicializar(ruta)
+        try:
+            with open(RUTA_ESQUEMA, encoding="utf-8") as archivo:
+                conexion._conexion.executescript(archivo.read())
+            aplicar_migraciones(conexion)
+        finally:
+            conexion.close()
+        _inicializadas.add(clave)
+
+
+def conectar(ruta):
+    """
+    Abre una conexión al archivo SQLite indicado, creando el esquema si hace falta.
+
+    Returns:
+        ConexionSQLite: Conexión con la interfaz de mysql.connector.
+    """
+    inicializar_base(ruta)
+    return _conectar_sin_inicializar(ruta)
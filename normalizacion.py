@@ -0,0 +1,23 @@
+"""
+Módulo: normalizacion.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y reúne la normalización de texto que usan las
+búsquedas ('busqueda_clientes', 'busqueda_destinos'), para que ambas comparen las palabras de la
+misma forma: sin distinguir mayúsculas ni acentos.
+"""
+
+import re
+import unicodedata
+
+
+# Palabras alfanuméricas: 'juan.perez@mail.com' -> juan, perez, mail, com.
+PATRON_PALABRA = re.compile(r"[^\W_]+")
+
+
+def normalizar_texto(texto):
+    """Pasa a minúsculas y quita acentos y diacríticos ('Núñez' -> 'nunez')."""
+    texto = texto.lower()
+    if texto.isascii():
+        return texto
+    descompuesto = unicodedata.normalize("NFKD", texto)
+    return "".join(caracter for caracter in descompuesto if not unicodedata.combining(caracter))
@@ -0,0 +1,268 @@
+"""
+Módulo: purga.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y elimina un cliente o un destino junto con
+todas sus ventas sin bloquear al resto de los agentes mientras tanto.
+
+Eliminar directamente el cliente o el destino deja que 'ON DELETE CASCADE' borre todas sus ventas
+y arrepentimientos en una sola transacción, que para un cliente o un destino con mucha historia
+retiene los bloqueos el tiempo suficiente para frenar las ventas en curso. En cambio, la purga:
+
+1. Registra la eliminación en 'purgas_pendientes'. Mientras la fila exista, la base de datos
+   rechaza las ventas nuevas del cliente o del destino (la condición está en la sentencia
+   'registrar_venta' y en la importación de ventas) y las anulaciones no devuelven asientos al
+   cupo del destino. El cliente, además, pasa a 'Inactivo'.
+2. Borra las ventas, primero las de la tabla en uso y luego las archivadas, por lotes de
+   'tamanio_lote': en cada lote, los arrepentimientos, después las ventas y el descuento en los
+   resúmenes de ventas, con un commit por lote y una pausa entre lotes.
+3. Elimina el cliente o el destino, cuyos dependientes restantes (teléfonos, asientos,
+   resúmenes) son pocas filas, y quita el registro de 'purgas_pendientes'.
+
+Si el proceso se interrumpe, volver a purgar el mismo cliente o destino, o ejecutar
+'reanudar_purgas', continúa desde donde quedó.
+
+Uso:
+    python purga.py --cliente 111.111.111 [--lote 500] [--pausa 0.05]
+    python purga.py --destino 12
+    python purga.py --reanudar
+"""
+
+import argparse
+import time
+
+import busqueda_clientes
+from cache_clientes import invalidar_cliente
+from cache_destinos import invalidar_catalogo
+from conexion_base_de_datos import obtener_conexion
+from resumen_ventas import registrar_lote_en_resumen
+from sentencias import ejecutar
+
+
+# Ventas eliminadas por transacción y segundos de espera entre transacciones.
+TAMANIO_LOTE_PURGA = 500
+PAUSA_PURGA = 0.05
+
+# Tablas de ventas y de sus arrepentimientos, en el orden en que se purgan.
+_TABLAS_DE_VENTAS = (("ventas", "arrepentimientos"), ("ventas_archivo", "arrepentimientos_archivo"))
+
+# La ciudad de un destino purgado se elimina solo si no le quedan otros destinos.
+_BORRAR_CIUDAD = """
+    DELETE FROM ciudades
+    WHERE id_ciudad = %s AND NOT EXISTS (SELECT 1 FROM destinos WHERE id_ciudad = %s);
+"""
+
+
+def _consulta_lote(tabla_ventas, columna):
+    """Consulta de un lote de ventas a purgar de 'tabla_ventas', por cliente o por destino."""
+    return f"""
+        SELECT id_venta, dni_cliente, id_destino, cantidad_de_tickets, estado_de_venta
+        FROM {tabla_ventas}
+        WHERE {columna} = %s
+        LIMIT %s
+        FOR UPDATE;
+    """
+
+
+def _borrar_por_venta(tabla, cantidad):
+    """Sentencia que borra de 'tabla' las filas de 'cantidad' ventas, por ID."""
+    return f"DELETE FROM {tabla} WHERE id_venta IN ({', '.join(['%s'] * cantidad)});"
+
+
+def _purgar_ventas(conexion, tipo, clave, columna, tamanio_lote, pausa, al_avanzar):
+    """
+    Borra por lotes las ventas con 'columna' = 'clave' y sus arrepentimientos.
+
+    Returns:
+        int: Cantidad de ventas eliminadas.
+    """
+    cursor = conexion.cursor()
+    eliminadas = 0
+
+    try:
+        for tabla_ventas, tabla_arrepentimientos in _TABLAS_DE_VENTAS:
+            while True:
+                cursor.execute(_consulta_lote(tabla_ventas, columna), (clave, tamanio_lote))
+                filas = cursor.fetchall()
+                if not filas:
+                    break
+
+                ids = [fila[0] for fila in filas]
+                cursor.execute(_borrar_por_venta(tabla_arrepentimientos, len(ids)), ids)
+                cursor.execute(_borrar_por_venta(tabla_ventas, len(ids)), ids)
+                registrar_lote_en_resumen(conexion, [(dni, id_destino, cantidad or 0, estado)
+                                                     for _, dni, id_destino, cantidad, estado in filas], signo=-1)
+                cursor.execute("""
+                    UPDATE purgas_pendientes SET ventas_eliminadas = ventas_eliminadas + %s
+                    WHERE tipo = %s AND clave = %s;
+                """, (len(ids), tipo, str(clave)))
+                conexion.commit()
+
+                eliminadas += len(ids)
+                if al_avanzar:
+                    al_avanzar(eliminadas)
+                if len(ids) < tamanio_lote:
+                    break
+                if pausa:
+                    time.sleep(pausa)
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    return eliminadas
+
+
+def _registrar_inicio(cursor, tipo, clave):
+    cursor.execute("""
+        INSERT IGNORE INTO purgas_pendientes (tipo, clave, fecha_inicio)
+        VALUES (%s, %s, NOW());
+    """, (tipo, str(clave)))
+
+
+def purgar_cliente(dni_cliente, tamanio_lote=TAMANIO_LOTE_PURGA, pausa=PAUSA_PURGA, al_avanzar=None, conexion=None):
+    """
+    Elimina un cliente con sus teléfonos, ventas (incluidas las archivadas) y arrepentimientos,
+    borrando las ventas por lotes.
+
+    Args:
+        dni_cliente (str): DNI del cliente.
+        tamanio_lote (int): Ventas eliminadas por transacción.
+        pausa (float): Segundos de espera entre lotes.
+        al_avanzar (callable | None): Se llama después de cada lote con las ventas eliminadas hasta el momento.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        int: Cantidad de ventas eliminadas.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        _registrar_inicio(cursor, "cliente", dni_cliente)
+        cursor.execute("UPDATE clientes SET estado_de_cliente = 'Inactivo' WHERE dni_cliente = %s;", (dni_cliente,))
+        conexion.commit()
+        invalidar_cliente(dni_cliente)
+
+        eliminadas = _purgar_ventas(conexion, "cliente", dni_cliente, "dni_cliente", tamanio_lote, pausa, al_avanzar)
+
+        ejecutar(conexion, "eliminar_cliente", (dni_cliente,))
+        cursor.execute("DELETE FROM purgas_pendientes WHERE tipo = 'cliente' AND clave = %s;", (dni_cliente,))
+        conexion.commit()
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    invalidar_cliente(dni_cliente)
+    busqueda_clientes.quitar_cliente(dni_cliente)
+    return eliminadas
+
+
+def purgar_destino(id_destino, tamanio_lote=TAMANIO_LOTE_PURGA, pausa=PAUSA_PURGA, al_avanzar=None, conexion=None):
+    """
+    Elimina un destino con sus ventas (incluidas las archivadas), arrepentimientos y cupo de
+    asientos, borrando las ventas por lotes. La ciudad del destino también se elimina si no
+    quedan otros destinos en ella.
+
+    Args:
+        id_destino (int): ID del destino.
+        tamanio_lote (int): Ventas eliminadas por transacción.
+        pausa (float): Segundos de espera entre lotes.
+        al_avanzar (callable | None): Se llama después de cada lote con las ventas eliminadas hasta el momento.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        int: Cantidad de ventas eliminadas.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        _registrar_inicio(cursor, "destino", id_destino)
+        conexion.commit()
+
+        eliminadas = _purgar_ventas(conexion, "destino", id_destino, "id_destino", tamanio_lote, pausa, al_avanzar)
+
+        cursor.execute("SELECT id_ciudad FROM destinos WHERE id_destino = %s;", (id_destino,))
+        ciudad = cursor.fetchone()
+        cursor.execute("DELETE FROM destinos WHERE id_destino = %s;", (id_destino,))
+        if ciudad:
+            cursor.execute(_BORRAR_CIUDAD, (ciudad[0], ciudad[0]))
+        cursor.execute("DELETE FROM purgas_pendientes WHERE tipo = 'destino' AND clave = %s;", (str(id_destino),))
+        conexion.commit()
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    invalidar_catalogo()
+    return eliminadas
+
+
+def reanudar_purgas(tamanio_lote=TAMANIO_LOTE_PURGA, pausa=PAUSA_PURGA, al_avanzar=None):
+    """
+    Completa las purgas que quedaron interrumpidas, en el orden en que comenzaron.
+
+    Returns:
+        list[tuple]: (tipo, clave, ventas eliminadas en esta ejecución) de cada purga completada.
+    """
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    try:
+        cursor.execute("SELECT tipo, clave FROM purgas_pendientes ORDER BY fecha_inicio;")
+        pendientes = cursor.fetchall()
+    finally:
+        cursor.close()
+        conexion.close()
+
+    completadas = []
+    for tipo, clave in pendientes:
+        if tipo == "cliente":
+            eliminadas = purgar_cliente(clave, tamanio_lote, pausa, al_avanzar)
+        else:
+            eliminadas = purgar_destino(int(clave), tamanio_lote, pausa, al_avanzar)
+        completadas.append((tipo, clave, eliminadas))
+    return completadas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Eliminación por lotes de un cliente o un destino con sus ventas.")
+    objetivo = parser.add_mutually_exclusive_group(required=True)
+    objetivo.add_argument("--cliente", metavar="DNI", help="DNI del cliente a eliminar.")
+    objetivo.add_argument("--destino", type=int, metavar="ID", help="ID del destino a eliminar.")
+    objetivo.add_argument("--reanudar", action="store_true", help="Completa las purgas interrumpidas.")
+    parser.add_argument("--lote", type=int, default=TAMANIO_LOTE_PURGA, help="Ventas eliminadas por transacción.")
+    parser.add_argument("--pausa", type=float, default=PAUSA_PURGA, help="Segundos de espera entre lotes.")
+    argumentos = parser.parse_args()
+
+    def informar(eliminadas):
+        print(f"{eliminadas} ventas eliminadas...")
+
+    try:
+        if argumentos.cliente:
+            completadas = [("cliente", argumentos.cliente,
+                            purgar_cliente(argumentos.cliente, argumentos.lote, argumentos.pausa, informar))]
+        elif argumentos.destino is not None:
+            completadas = [("destino", argumentos.destino,
+                            purgar_destino(argumentos.destino, argumentos.lote, argumentos.pausa, informar))]
+        else:
+            completadas = reanudar_purgas(argumentos.lote, argumentos.pausa, informar)
+    except Exception as e:
+        print(f"Error al purgar: {e}")
+        raise SystemExit(1)
+
+    for tipo, clave, eliminadas in completadas:
+        print(f"Se eliminó el {tipo} {clave} con {eliminadas} venta(s).")
+    if not completadas:
+        print("No hay purgas pendientes.")
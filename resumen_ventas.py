@@ -0,0 +1,235 @@
+"""
+Módulo: resumen_ventas.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y mantiene, por cliente y por destino, la
+cantidad de ventas y de tickets vigentes (Activa o Cerrada) y anulados, incluidas las ventas
+archivadas. Así los totales se leen con una consulta por clave primaria, sin recorrer las ventas.
+
+Los resúmenes se actualizan en la misma transacción que cada venta ('registrar_venta'), anulación
+('cancelar_venta'), lote importado ('importacion_ventas') o lote eliminado ('purga'), sumando la
+diferencia con 'INSERT ... ON DUPLICATE KEY UPDATE'. El resumen de un destino se reparte en
+tramos, como el cupo de asientos, para que las ventas simultáneas de un mismo destino no esperen
+por una única fila. Un lote importado suma en el tramo del que tomó los asientos.
+
+'verificar_resumenes' recalcula los totales desde las ventas y devuelve las diferencias, y
+'reconstruir_resumenes' además los vuelve a cargar desde cero.
+
+Uso:
+    python resumen_ventas.py --verificar      # código de salida 1 si hay diferencias
+    python resumen_ventas.py --reconstruir
+"""
+
+import argparse
+import random
+from collections import defaultdict
+
+from conexion_base_de_datos import obtener_conexion
+from sentencias import SENTENCIAS, ejecutar, obtener_uno
+
+
+# Cantidad de tramos en que se reparte el resumen de un destino.
+TRAMOS_RESUMEN_DESTINO = 8
+
+CAMPOS = ("ventas_vigentes", "ventas_anuladas", "tickets_vigentes", "tickets_anulados")
+
+# Totales por clave calculados desde las ventas, en el orden de CAMPOS ('tramo' agrega una columna fija).
+_CALCULO = """
+    SELECT v.{clave}{tramo},
+           SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 0 ELSE 1 END),
+           SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 1 ELSE 0 END),
+           SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN 0 ELSE COALESCE(v.cantidad_de_tickets, 0) END),
+           SUM(CASE WHEN v.estado_de_venta = 'Anulada' THEN COALESCE(v.cantidad_de_tickets, 0) ELSE 0 END)
+    FROM (SELECT {clave}, estado_de_venta, cantidad_de_tickets FROM ventas
+          UNION ALL
+          SELECT {clave}, estado_de_venta, cantidad_de_tickets FROM ventas_archivo) v
+    JOIN {tabla} p ON p.{clave} = v.{clave}
+    GROUP BY v.{clave}
+"""
+_CALCULO_CLIENTES = _CALCULO.format(clave="dni_cliente", tabla="clientes", tramo="")
+_CALCULO_DESTINOS = _CALCULO.format(clave="id_destino", tabla="destinos", tramo="")
+
+
+def _diferencia(estado_de_venta, cantidad_de_tickets):
+    """Lo que una venta en ese estado suma a cada campo del resumen."""
+    if estado_de_venta == "Anulada":
+        return 0, 1, 0, cantidad_de_tickets
+    return 1, 0, cantidad_de_tickets, 0
+
+
+def _sumar(conexion, dni_cliente, id_destino, diferencia):
+    ejecutar(conexion, "sumar_resumen_cliente", (dni_cliente, *diferencia))
+    ejecutar(conexion, "sumar_resumen_destino", (id_destino, random.randrange(TRAMOS_RESUMEN_DESTINO), *diferencia))
+
+
+def registrar_en_resumen(conexion, dni_cliente, id_destino, cantidad_de_tickets, estado_de_venta="Activa"):
+    """Suma una venta nueva a los resúmenes, dentro de la transacción en curso (sin confirmar)."""
+    _sumar(conexion, dni_cliente, id_destino, _diferencia(estado_de_venta, cantidad_de_tickets))
+
+
+def anular_en_resumen(conexion, dni_cliente, id_destino, cantidad_de_tickets):
+    """Pasa una venta de vigente a anulada en los resúmenes, dentro de la transacción en curso."""
+    _sumar(conexion, dni_cliente, id_destino, (-1, 1, -cantidad_de_tickets, cantidad_de_tickets))
+
+
+def _tramo_de_resumen(id_destino, tramos):
+    tramo = (tramos or {}).get(id_destino)
+    return random.randrange(TRAMOS_RESUMEN_DESTINO) if tramo is None else tramo % TRAMOS_RESUMEN_DESTINO
+
+
+def registrar_lote_en_resumen(conexion, ventas, signo=1, tramos=None):
+    """
+    Suma un lote de ventas nuevas a los resúmenes, con una fila por cliente y por destino del lote,
+    dentro de la transacción en curso (sin confirmar).
+
+    Args:
+        ventas (iterable[tuple]): (dni_cliente, id_destino, cantidad_de_tickets, estado_de_venta).
+        signo (int): 1 para sumar las ventas, -1 para descontar ventas eliminadas.
+        tramos (dict | None): Tramo del cupo de asientos del que cada destino tomó los asientos del
+            lote; el resumen del destino se suma en ese mismo tramo. Los destinos que no figuran
+            usan un tramo al azar.
+    """
+    por_cliente = defaultdict(lambda: [0, 0, 0, 0])
+    por_destino = defaultdict(lambda: [0, 0, 0, 0])
+    for dni_cliente, id_destino, cantidad_de_tickets, estado_de_venta in ventas:
+        diferencia = _diferencia(estado_de_venta, cantidad_de_tickets)
+        for totales in (por_cliente[dni_cliente], por_destino[id_destino]):
+            for posicion, valor in enumerate(diferencia):
+                totales[posicion] += signo * valor
+    if not por_cliente:
+        return
+
+    # Las filas se actualizan en orden de clave, para no bloquearse en cruz con otro lote.
+    cursor = conexion.cursor()
+    try:
+        cursor.executemany(SENTENCIAS["sumar_resumen_cliente"],
+                           [(dni, *totales) for dni, totales in sorted(por_cliente.items())])
+        cursor.executemany(SENTENCIAS["sumar_resumen_destino"],
+                           [(id_destino, _tramo_de_resumen(id_destino, tramos), *totales)
+                            for id_destino, totales in sorted(por_destino.items())])
+    finally:
+        cursor.close()
+
+
+def _leer(nombre, clave, conexion):
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    try:
+        fila = obtener_uno(conexion, nombre, (clave,))
+    finally:
+        if propia:
+            conexion.close()
+    return dict(zip(CAMPOS, (int(valor or 0) for valor in (fila or (0, 0, 0, 0)))))
+
+
+def resumen_de_cliente(dni_cliente, conexion=None):
+    """
+    Devuelve los totales de ventas de un cliente.
+
+    Returns:
+        dict: ventas_vigentes, ventas_anuladas, tickets_vigentes y tickets_anulados (en cero si no
+        tiene ventas).
+    """
+    return _leer("resumen_de_cliente", dni_cliente, conexion)
+
+
+def resumen_de_destino(id_destino, conexion=None):
+    """
+    Devuelve los totales de ventas de un destino.
+
+    Returns:
+        dict: ventas_vigentes, ventas_anuladas, tickets_vigentes y tickets_anulados (en cero si no
+        tiene ventas).
+    """
+    return _leer("resumen_de_destino", id_destino, conexion)
+
+
+def verificar_resumenes(conexion=None):
+    """
+    Recalcula los resúmenes desde las ventas (incluidas las archivadas) y los compara con los guardados.
+
+    Returns:
+        list[tuple]: ('cliente' | 'destino', clave, totales guardados, totales calculados) por cada
+        clave con diferencias.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    campos = ", ".join(f"SUM({campo})" for campo in CAMPOS)
+
+    try:
+        diferencias = []
+        for tipo, calculo, guardado in (
+                ("cliente", _CALCULO_CLIENTES,
+                 f"SELECT dni_cliente, {campos} FROM resumen_ventas_cliente GROUP BY dni_cliente"),
+                ("destino", _CALCULO_DESTINOS,
+                 f"SELECT id_destino, {campos} FROM resumen_ventas_destino GROUP BY id_destino")):
+            cursor.execute(calculo)
+            calculados = {fila[0]: tuple(int(valor) for valor in fila[1:]) for fila in cursor.fetchall()}
+            cursor.execute(guardado)
+            guardados = {fila[0]: tuple(int(valor) for valor in fila[1:]) for fila in cursor.fetchall()}
+            for clave in sorted(calculados.keys() | guardados.keys(), key=str):
+                esperado = calculados.get(clave, (0, 0, 0, 0))
+                actual = guardados.get(clave, (0, 0, 0, 0))
+                if actual != esperado:
+                    diferencias.append((tipo, clave, dict(zip(CAMPOS, actual)), dict(zip(CAMPOS, esperado))))
+        return diferencias
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+def reconstruir_resumenes(conexion=None):
+    """
+    Vuelve a cargar los resúmenes desde las ventas, en una sola transacción. Conviene ejecutarlo
+    con poca actividad: las ventas que se confirmen mientras tanto pueden no quedar reflejadas.
+
+    Returns:
+        list[tuple]: Diferencias encontradas antes de reconstruir (ver 'verificar_resumenes').
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        diferencias = verificar_resumenes(conexion)
+        cursor.execute("DELETE FROM resumen_ventas_cliente;")
+        cursor.execute(f"INSERT INTO resumen_ventas_cliente (dni_cliente, {', '.join(CAMPOS)}) {_CALCULO_CLIENTES};")
+        cursor.execute("DELETE FROM resumen_ventas_destino;")
+        cursor.execute(f"INSERT INTO resumen_ventas_destino (id_destino, tramo, {', '.join(CAMPOS)}) "
+                       f"{_CALCULO.format(clave='id_destino', tabla='destinos', tramo=', 0')};")
+        conexion.commit()
+        return diferencias
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica o reconstruye los resúmenes de ventas.")
+    accion = parser.add_mutually_exclusive_group(required=True)
+    accion.add_argument("--verificar", action="store_true", help="Informa las diferencias sin corregirlas.")
+    accion.add_argument("--reconstruir", action="store_true", help="Informa las diferencias y recarga los resúmenes.")
+    argumentos = parser.parse_args()
+
+    try:
+        diferencias = reconstruir_resumenes() if argumentos.reconstruir else verificar_resumenes()
+    except Exception as e:
+        print(f"Error al procesar los resúmenes de ventas: {e}")
+        raise SystemExit(1)
+
+    for tipo, clave, guardado, calculado in diferencias:
+        print(f"Diferencia en el {tipo} {clave}: guardado {guardado}, calculado {calculado}")
+    if not diferencias:
+        print("Los resúmenes coinciden con las ventas.")
+    elif argumentos.reconstruir:
+        print(f"Resúmenes reconstruidos ({len(diferencias)} diferencia(s) corregida(s)).")
+    else:
+        raise SystemExit(1)
@@ -0,0 +1,248 @@
+"""
+Módulo: sentencias.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y reúne, con un nombre cada una, las sentencias
+parametrizadas que más se repiten en el sistema (búsqueda de clientes por DNI, actualizaciones de
+clientes, registro y anulación de ventas...).
+
+Con MySQL cada sentencia se prepara en el servidor (cursor 'prepared=True') una sola vez por
+conexión física del pool: las ejecuciones siguientes solo envían los parámetros, sin que el
+servidor vuelva a analizar el SQL. Si la conexión se restablece (cambia su 'connection_id') o el
+servidor ya no reconoce la sentencia preparada, se prepara de nuevo. Con SQLite se aprovecha la
+caché de sentencias del propio módulo sqlite3, que también evita volver a compilarlas.
+
+Uso:
+    cliente = obtener_uno(conexion, "cliente_por_dni", (dni,))
+    cursor = ejecutar(conexion, "eliminar_cliente", (dni,))   # rowcount, lastrowid
+
+Los cursores pertenecen al registro: quien los recibe no debe cerrarlos.
+"""
+
+import threading
+import weakref
+
+from modelos import Cliente
+
+
+SENTENCIAS = {
+    # Clientes
+    "cliente_por_dni": f"SELECT {Cliente.COLUMNAS} FROM clientes WHERE dni_cliente = %s",
+    "estado_de_cliente": "SELECT estado_de_cliente FROM clientes WHERE dni_cliente = %s",
+    "actualizar_cliente_nombre": "UPDATE clientes SET nombre_cliente = %s WHERE dni_cliente = %s",
+    "actualizar_cliente_apellido": "UPDATE clientes SET apellido_cliente = %s WHERE dni_cliente = %s",
+    "actualizar_cliente_dni": "UPDATE clientes SET dni_cliente = %s WHERE dni_cliente = %s",
+    "actualizar_cliente_email": "UPDATE clientes SET email_cliente = %s WHERE dni_cliente = %s",
+    "actualizar_cliente_direccion": "UPDATE clientes SET dir_cliente = %s WHERE dni_cliente = %s",
+    "desactivar_cliente": "UPDATE clientes SET estado_de_cliente = 'Inactivo' WHERE id_cliente = %s",
+    "eliminar_cliente": "DELETE FROM clientes WHERE dni_cliente = %s",
+
+    # Ventas
+    "registrar_venta": """
+        INSERT INTO ventas (fecha_de_compra, id_destino, cantidad_de_tickets, total_venta, dni_cliente)
+        SELECT NOW(), d.id_destino, %s, %s, c.dni_cliente
+        FROM clientes c
+        JOIN destinos d ON d.id_destino = %s
+        WHERE c.dni_cliente = %s AND c.estado_de_cliente = 'Activo'
+          AND NOT EXISTS (SELECT 1 FROM purgas_pendientes WHERE tipo = 'cliente' AND clave = c.dni_cliente)
+          AND NOT EXISTS (SELECT 1 FROM purgas_pendientes WHERE tipo = 'destino' AND clave = %s)
+    """,
+    "anular_venta": """
+        UPDATE ventas SET estado_de_venta = 'Anulada'
+        WHERE id_venta = %s AND dni_cliente = %s AND estado_de_venta = 'Activa'
+          AND fecha_de_compra >= NOW() - INTERVAL %s MINUTE
+    """,
+    "estado_de_venta": "SELECT estado_de_venta FROM ventas WHERE id_venta = %s AND dni_cliente = %s",
+    "detalle_de_venta": "SELECT id_destino, cantidad_de_tickets FROM ventas WHERE id_venta = %s",
+    "registrar_arrepentimiento": """
+        INSERT INTO arrepentimientos (fecha_hora_arrepentimiento, motivo_arrepentimiento, id_venta)
+        VALUES (NOW(), %s, %s)
+    """,
+
+    # Resúmenes de ventas
+    "sumar_resumen_cliente": """
+        INSERT INTO resumen_ventas_cliente
+            (dni_cliente, ventas_vigentes, ventas_anuladas, tickets_vigentes, tickets_anulados)
+        VALUES (%s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE ventas_vigentes = ventas_vigentes + VALUES(ventas_vigentes),
+            ventas_anuladas = ventas_anuladas + VALUES(ventas_anuladas),
+            tickets_vigentes = tickets_vigentes + VALUES(tickets_vigentes),
+            tickets_anulados = tickets_anulados + VALUES(tickets_anulados)
+    """,
+    "sumar_resumen_destino": """
+        INSERT INTO resumen_ventas_destino
+            (id_destino, tramo, ventas_vigentes, ventas_anuladas, tickets_vigentes, tickets_anulados)
+        VALUES (%s, %s, %s, %s, %s, %s)
+        ON DUPLICATE KEY UPDATE ventas_vigentes = ventas_vigentes + VALUES(ventas_vigentes),
+            ventas_anuladas = ventas_anuladas + VALUES(ventas_anuladas),
+            tickets_vigentes = tickets_vigentes + VALUES(tickets_vigentes),
+            tickets_anulados = tickets_anulados + VALUES(tickets_anulados)
+    """,
+    "resumen_de_cliente": """
+        SELECT ventas_vigentes, ventas_anuladas, tickets_vigentes, tickets_anulados
+        FROM resumen_ventas_cliente WHERE dni_cliente = %s
+    """,
+    "resumen_de_destino": """
+        SELECT SUM(ventas_vigentes), SUM(ventas_anuladas), SUM(tickets_vigentes), SUM(tickets_anulados)
+        FROM resumen_ventas_destino WHERE id_destino = %s
+    """,
+
+    # Asientos
+    "reservar_asientos": """
+        UPDATE asientos SET disponibles = disponibles - %s
+        WHERE id_destino = %s AND tramo = %s AND disponibles >= %s
+    """,
+    "liberar_asientos": "UPDATE asientos SET disponibles = disponibles + %s WHERE id_destino = %s AND tramo = %s",
+    "tramos_de_destino": "SELECT tramo, disponibles FROM asientos WHERE id_destino = %s ORDER BY tramo FOR UPDATE",
+
+    # Purgas
+    "purga_pendiente": "SELECT 1 FROM purgas_pendientes WHERE tipo = %s AND clave = %s",
+}
+
+# Código de error de MySQL cuando el servidor no reconoce una sentencia preparada
+# (ER_UNKNOWN_STMT_HANDLER), por ejemplo tras reiniciarse la sesión.
+_ERROR_SENTENCIA_DESCONOCIDA = 1243
+
+_bloqueo = threading.Lock()
+_estadisticas = {"preparaciones": 0, "reutilizaciones": 0, "repreparaciones": 0}
+_por_sentencia = {}
+
+# Datos de las conexiones que no provienen del pool (por ejemplo, abiertas a mano).
+_registros_sin_pool = weakref.WeakKeyDictionary()
+
+
+class _RegistroConexion:
+    """Cursores preparados de una conexión física, junto con la sesión en la que se prepararon."""
+
+    __slots__ = ("sesion", "cursores")
+
+    def __init__(self, sesion):
+        self.sesion = sesion
+        self.cursores = {}
+
+    def descartar(self):
+        for cursor in self.cursores.values():
+            try:
+                cursor.close()
+            except Exception:
+                pass
+        self.cursores.clear()
+
+
+def _sesion(conexion):
+    """Identifica la sesión del servidor; cambia si la conexión se restableció."""
+    return getattr(conexion, "connection_id", None)
+
+
+def _registro(conexion):
+    """Devuelve el registro de cursores preparados de la conexión física subyacente."""
+    # Las conexiones del pool conservan sus datos entre préstamos, mientras la conexión física viva.
+    datos = getattr(conexion, "datos_de_conexion", None)
+    if datos is None:
+        datos = _registros_sin_pool.setdefault(conexion, {})
+    registro = datos.get("sentencias")
+    if registro is None:
+        registro = datos["sentencias"] = _RegistroConexion(_sesion(conexion))
+    return registro
+
+
+def _contar(clave, nombre):
+    with _bloqueo:
+        _estadisticas[clave] += 1
+        contadores = _por_sentencia.setdefault(nombre, {"preparaciones": 0, "reutilizaciones": 0})
+        contadores[clave] += 1
+
+
+def _cursor_preparado(conexion, registro, nombre):
+    sesion = _sesion(conexion)
+    if sesion != registro.sesion:
+        # La conexión se restableció: las sentencias preparadas de la sesión anterior ya no existen.
+        repreparar = bool(registro.cursores)
+        registro.descartar()
+        registro.sesion = sesion
+        if repreparar:
+            with _bloqueo:
+                _estadisticas["repreparaciones"] += 1
+
+    cursor = registro.cursores.get(nombre)
+    if cursor is None:
+        cursor = registro.cursores[nombre] = conexion.cursor(prepared=True)
+        _contar("preparaciones", nombre)
+    else:
+        _contar("reutilizaciones", nombre)
+    return cursor
+
+
+def ejecutar(conexion, nombre, parametros=()):
+    """
+    Ejecuta una sentencia registrada, preparándola si es la primera vez en esta conexión.
+
+    Args:
+        conexion: Conexión abierta (del pool o no).
+        nombre (str): Nombre de la sentencia en SENTENCIAS.
+        parametros (tuple): Valores de los marcadores '%s'.
+
+    Returns:
+        Cursor con el resultado (rowcount, lastrowid, filas). No debe cerrarse.
+
+    Raises:
+        KeyError: Si no hay una sentencia registrada con ese nombre.
+    """
+    sql = SENTENCIAS[nombre]
+    registro = _registro(conexion)
+    cursor = _cursor_preparado(conexion, registro, nombre)
+    try:
+        cursor.execute(sql, parametros)
+    except Exception as error:
+        if getattr(error, "errno", None) != _ERROR_SENTENCIA_DESCONOCIDA:
+            raise
+        # El servidor descartó la sentencia: se prepara de nuevo y se reintenta una sola vez.
+        registro.cursores.pop(nombre, None)
+        with _bloqueo:
+            _estadisticas["repreparaciones"] += 1
+        cursor = _cursor_preparado(conexion, registro, nombre)
+        cursor.execute(sql, parametros)
+    return cursor
+
+
+def obtener_uno(conexion, nombre, parametros=()):
+    """
+    Ejecuta una consulta registrada y devuelve su primera fila.
+    Lee el resultado completo para dejar la conexión lista para otra sentencia.
+
+    Returns:
+        tuple | None: Primera fila, o None si no hay resultados.
+    """
+    filas = ejecutar(conexion, nombre, parametros).fetchall()
+    return filas[0] if filas else None
+
+
+def obtener_todos(conexion, nombre, parametros=()):
+    """
+    Ejecuta una consulta registrada y devuelve todas sus filas.
+
+    Returns:
+        list[tuple]: Filas del resultado.
+    """
+    return ejecutar(conexion, nombre, parametros).fetchall()
+
+
+def estadisticas_sentencias():
+    """
+    Devuelve los contadores del registro de sentencias.
+
+    Returns:
+        dict: Preparaciones, reutilizaciones (preparaciones evitadas), repreparaciones tras un
+        restablecimiento de la conexión y el detalle por sentencia.
+    """
+    with _bloqueo:
+        datos = dict(_estadisticas)
+        datos["por_sentencia"] = {nombre: dict(contadores) for nombre, contadores in _por_sentencia.items()}
+    return datos
+
+
+def reiniciar_estadisticas():
+    """Pone en cero los contadores del registro. Las sentencias ya preparadas se conservan."""
+    with _bloqueo:
+        for clave in _estadisticas:
+            _estadisticas[clave] = 0
+        _por_sentencia.clear()
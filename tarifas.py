@@ -0,0 +1,130 @@
+"""
+Módulo: tarifas.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y calcula el precio total de una compra de
+pasajes a partir del costo base de la ciudad de destino, la cantidad de tickets y la fecha.
+
+El total se obtiene aplicando, en este orden:
+
+1. el factor de temporada del mes de la fecha (FACTOR_POR_MES);
+2. el descuento por volumen según la cantidad de tickets (DESCUENTOS_POR_VOLUMEN);
+3. los impuestos del país de destino (IMPUESTOS_POR_PAIS, o IMPUESTO_POR_DEFECTO).
+
+La tabla de tarifas se arma con el catálogo de 'cache_destinos', como arreglos de NumPy indexados
+por 'id_destino', y se vuelve a armar cuando el catálogo se recarga o se invalida. Así
+'cotizar_lote' calcula miles de cotizaciones (destino, cantidad, fecha) en una sola pasada
+vectorizada, sin recorrerlas una por una en Python.
+"""
+
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from cache_destinos import obtener_catalogo, obtener_destino
+
+
+# Factor de temporada por mes (enero a diciembre): alta en verano, receso invernal y fiestas.
+FACTOR_POR_MES = (1.25, 1.20, 1.00, 0.90, 0.85, 0.90, 1.20, 1.10, 0.90, 0.95, 1.00, 1.15)
+
+# Descuento por volumen: (cantidad mínima de tickets, descuento), en orden creciente de cantidad.
+DESCUENTOS_POR_VOLUMEN = ((1, 0.00), (4, 0.05), (10, 0.10), (20, 0.15))
+
+# Impuestos sobre el precio con descuento, según el país de destino.
+IMPUESTOS_POR_PAIS = {"Argentina": 0.21}
+IMPUESTO_POR_DEFECTO = 0.30
+
+_bloqueo = threading.Lock()
+_catalogo_tarifado = None
+_tabla = None
+
+
+class _TablaDeTarifas:
+    """Costo base e impuesto de cada destino, en arreglos indexados por 'id_destino'."""
+
+    __slots__ = ("posicion_por_id", "costos", "impuestos")
+
+    def __init__(self, catalogo):
+        maximo = max(catalogo, default=0)
+        self.posicion_por_id = np.full(maximo + 1, -1, dtype=np.int64)
+        self.costos = np.empty(len(catalogo), dtype=np.float64)
+        self.impuestos = np.empty(len(catalogo), dtype=np.float64)
+        for posicion, destino in enumerate(catalogo.values()):
+            self.posicion_por_id[destino.id_destino] = posicion
+            self.costos[posicion] = destino.costo_base if destino.costo_base is not None else np.nan
+            self.impuestos[posicion] = IMPUESTOS_POR_PAIS.get(destino.pais, IMPUESTO_POR_DEFECTO)
+
+    def posiciones(self, ids_destino):
+        """Posición de cada destino en los arreglos, o -1 si no existe."""
+        dentro = (ids_destino >= 0) & (ids_destino < len(self.posicion_por_id))
+        posiciones = np.full(ids_destino.shape, -1, dtype=np.int64)
+        posiciones[dentro] = self.posicion_por_id[ids_destino[dentro]]
+        return posiciones
+
+
+def _obtener_tabla(conexion):
+    """Devuelve la tabla de tarifas, rearmándola si el catálogo cambió desde la última vez."""
+    global _catalogo_tarifado, _tabla
+    catalogo = obtener_catalogo(conexion)
+    with _bloqueo:
+        if catalogo is not _catalogo_tarifado:
+            _tabla = _TablaDeTarifas(catalogo)
+            _catalogo_tarifado = catalogo
+        return _tabla
+
+
+def cotizar_lote(ids_destino, cantidades, fechas=None, conexion=None):
+    """
+    Calcula el total de varias compras en una sola pasada.
+
+    Args:
+        ids_destino (array-like[int]): Destino de cada compra.
+        cantidades (array-like[int]): Cantidad de tickets de cada compra.
+        fechas (array-like[datetime | date | datetime64] | None): Fecha de cada compra; hoy si se omite.
+        conexion: Conexión a reutilizar si hay que cargar el catálogo.
+
+    Returns:
+        numpy.ndarray: Total de cada compra redondeado a centavos, o NaN si el destino no existe,
+        no tiene costo base o la cantidad es menor a 1.
+    """
+    ids_destino = np.asarray(ids_destino, dtype=np.int64)
+    cantidades = np.asarray(cantidades, dtype=np.int64)
+    if fechas is None:
+        meses = np.full(ids_destino.shape, datetime.now().month - 1, dtype=np.int64)
+    else:
+        meses = np.asarray(fechas, dtype="datetime64[M]").astype(np.int64) % 12
+
+    tabla = _obtener_tabla(conexion)
+    posiciones = tabla.posiciones(ids_destino)
+    # Un destino ausente puede haberlo creado otro proceso después de cargado el catálogo:
+    # si alguno existe en la base, 'obtener_destino' invalida el catálogo y la tabla se rearma.
+    ausentes = np.unique(ids_destino[posiciones < 0])
+    if len(ausentes) and any([obtener_destino(int(id_destino), conexion) for id_destino in ausentes]):
+        tabla = _obtener_tabla(conexion)
+        posiciones = tabla.posiciones(ids_destino)
+    if not len(tabla.costos):
+        return np.full(ids_destino.shape, np.nan)
+    existe = posiciones >= 0
+    posiciones = np.where(existe, posiciones, 0)
+
+    minimos, descuentos = zip(*DESCUENTOS_POR_VOLUMEN)
+    escalon = np.searchsorted(np.array(minimos), cantidades, side="right") - 1
+    descuento = np.array(descuentos)[np.maximum(escalon, 0)]
+
+    totales = (tabla.costos[posiciones] * cantidades
+               * np.array(FACTOR_POR_MES)[meses]
+               * (1 - descuento)
+               * (1 + tabla.impuestos[posiciones]))
+    totales[~existe | (cantidades < 1)] = np.nan
+    return np.round(totales, 2)
+
+
+def cotizar(id_destino, cantidad_de_tickets, fecha=None, conexion=None):
+    """
+    Calcula el total de una compra.
+
+    Returns:
+        float | None: Total redondeado a centavos, o None si el destino no existe o no tiene costo.
+    """
+    total = cotizar_lote([id_destino], [cantidad_de_tickets], None if fecha is None else [fecha], conexion)[0]
+    return None if np.isnan(total) else float(total)
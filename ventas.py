@@ -5,12 +5,59 @@ Este módulo gestiona las operaciones de venta de pasajes dentro del sistema Sky
 Permite registrar nuevas ventas, anular ventas recientes, y listar ventas activas o anuladas
 de acuerdo al cliente. También registra los arrepentimientos de compra asociados a anulaciones.
 
+La ventana de anulación se evalúa en la base de datos (con su reloj), no en la aplicación.
+Un barredor en segundo plano ('iniciar_barredor') marca como 'Cerrada' las ventas activas cuya
+ventana ya venció, de modo que las candidatas a anulación sean siempre pocas.
+
 Cada operación se conecta a la base de datos relacional mediante el módulo de conexión.
 """
 
-from datetime import datetime, timedelta
-import re
+import logging
+import random
+import threading
+import time
+
 from conexion_base_de_datos import obtener_conexion
+from clientes import es_dni_valido
+from destinos import seleccionar_destino
+from sentencias import ejecutar, obtener_uno
+from cache_clientes import obtener_cliente
+from modelos import Venta
+from tarifas import cotizar
+from asientos import AsientosInsuficientesError, liberar_asientos, reservar_asientos
+from resumen_ventas import anular_en_resumen, registrar_en_resumen, resumen_de_cliente
+
+
+# Minutos durante los cuales una venta puede anularse.
+MINUTOS_DE_ANULACION = 2
+
+# Estados de las ventas que siguen en pie: anulables ('Activa') o con la ventana vencida ('Cerrada').
+ESTADOS_VIGENTES = ("Activa", "Cerrada")
+
+# Segundos entre pasadas del barredor y ventas que cierra por transacción.
+INTERVALO_BARREDOR = 30
+TAMANIO_LOTE_BARREDOR = 1000
+
+# Reintentos de una venta cancelada por un bloqueo mutuo (ER_LOCK_DEADLOCK de MySQL).
+REINTENTOS_POR_BLOQUEO = 3
+_ERROR_BLOQUEO_MUTUO = 1213
+
+# Consultas de este módulo que no están en 'sentencias'; 'verificar_planes' revisa sus planes.
+_CONSULTA_ANULABLES = f"""
+    SELECT {Venta.COLUMNAS}
+    FROM ventas
+    WHERE dni_cliente = %s AND estado_de_venta = 'Activa'
+      AND fecha_de_compra >= NOW() - INTERVAL %s MINUTE;
+"""
+_CONSULTA_VENCIDAS = """
+    SELECT id_venta FROM ventas
+    WHERE estado_de_venta = 'Activa' AND fecha_de_compra < NOW() - INTERVAL %s MINUTE
+    LIMIT %s;
+"""
+
+# Los errores del barredor se registran aquí en lugar de imprimirse en medio del menú.
+registro = logging.getLogger("skyroute.ventas")
+registro.addHandler(logging.NullHandler())
 
 
 def gestion_de_ventas():
@@ -47,127 +94,233 @@ def gestion_de_ventas():
             print(f"Error en la gestión de ventas: {e}")
 
 
+class VentaRechazadaError(Exception):
+    """Se lanza cuando una venta no puede registrarse por una regla de negocio."""
+
+
+def registrar_venta(dni_cliente, id_destino, cantidad_de_tickets, conexion=None, total_venta=None):
+    """
+    Registra una venta sin interacción con el usuario.
+
+    La verificación del cliente (existente y activo), la del destino y la inserción se hacen
+    en una única sentencia INSERT ... SELECT dentro de una transacción: si alguna condición
+    no se cumple no se inserta ninguna fila, y solo en ese caso se consulta el motivo.
+    En la misma transacción, y antes de insertar, se descuentan los asientos del cupo del
+    destino (ver 'asientos.reservar_asientos'), y después se suma la venta a los resúmenes del
+    cliente y del destino (ver 'resumen_ventas'). Si la base de datos la cancela por un bloqueo
+    mutuo con otra venta, la transacción se reintenta hasta REINTENTOS_POR_BLOQUEO veces.
+
+    Args:
+        dni_cliente (str): DNI del cliente comprador.
+        id_destino (int): ID del destino.
+        cantidad_de_tickets (int): Cantidad de pasajes (al menos 1).
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+        total_venta (float | None): Total ya cotizado. Si se omite, se calcula con 'tarifas.cotizar'.
+
+    Returns:
+        int: ID de la venta registrada.
+
+    Raises:
+        VentaRechazadaError: Si el cliente no existe o está inactivo, si el destino no existe
+            o no tiene asientos suficientes, o si la cantidad de tickets no es válida.
+    """
+    if cantidad_de_tickets < 1:
+        raise VentaRechazadaError("La cantidad de tickets debe ser al menos 1.")
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+
+    try:
+        if total_venta is None:
+            total_venta = cotizar(id_destino, cantidad_de_tickets, conexion=conexion)
+        for intento in range(REINTENTOS_POR_BLOQUEO + 1):
+            try:
+                return _registrar_venta(conexion, dni_cliente, id_destino, cantidad_de_tickets, total_venta)
+            except VentaRechazadaError:
+                raise
+            except Exception as error:
+                conexion.rollback()
+                if getattr(error, "errno", None) != _ERROR_BLOQUEO_MUTUO or intento == REINTENTOS_POR_BLOQUEO:
+                    raise
+                # Una espera breve y al azar evita que las mismas ventas vuelvan a chocar.
+                time.sleep(random.uniform(0, 0.005 * (intento + 1)))
+    finally:
+        if propia:
+            conexion.close()
+
+
+def _registrar_venta(conexion, dni_cliente, id_destino, cantidad_de_tickets, total_venta):
+    """Un intento de 'registrar_venta': reserva los asientos, inserta la venta y confirma."""
+    try:
+        reservar_asientos(conexion, id_destino, cantidad_de_tickets)
+    except AsientosInsuficientesError as e:
+        conexion.rollback()
+        raise VentaRechazadaError(str(e)) from None
+
+    cursor = ejecutar(conexion, "registrar_venta",
+                      (cantidad_de_tickets, total_venta, id_destino, dni_cliente, str(id_destino)))
+    if cursor.rowcount == 1:
+        id_venta = cursor.lastrowid
+        registrar_en_resumen(conexion, dni_cliente, id_destino, cantidad_de_tickets)
+        conexion.commit()
+        return id_venta
+
+    # Al deshacer la transacción también se devuelven los asientos reservados.
+    conexion.rollback()
+    cliente = obtener_uno(conexion, "estado_de_cliente", (dni_cliente,))
+    if not cliente:
+        raise VentaRechazadaError(f"No existe un cliente con DNI {dni_cliente}.")
+    if obtener_uno(conexion, "purga_pendiente", ("cliente", dni_cliente)):
+        raise VentaRechazadaError(f"El cliente con DNI {dni_cliente} se está eliminando.")
+    if cliente[0] != "Activo":
+        raise VentaRechazadaError(f"El cliente con DNI {dni_cliente} está inactivo.")
+    if obtener_uno(conexion, "purga_pendiente", ("destino", str(id_destino))):
+        raise VentaRechazadaError(f"El destino con ID {id_destino} se está eliminando.")
+    raise VentaRechazadaError(f"No existe un destino con ID {id_destino}.")
+
+
 def agregar_venta():
     """
     Registra una nueva venta en el sistema.
 
     Pasos:
-    - Muestra los destinos disponibles.
     - Solicita y valida el DNI del cliente.
     - Verifica que el cliente exista y esté activo.
-    - Solicita la cantidad de tickets y el ID del destino.
+    - Solicita la cantidad de tickets.
+    - Permite buscar el destino por ciudad, provincia o país y elegirlo por su ID.
     - Registra la venta en la base de datos.
     """
     try:
         conexion = obtener_conexion()
-        cursor = conexion.cursor()
-
-        print("A continuación se muestra la lista de destinos y sus precios.")
-        cursor.execute("""
-            SELECT ciudades.nombre_ciudad AS Ciudad, ciudades.pais AS Pais, ciudades.costo_base AS Precio, destinos.id_destino 
-            FROM destinos 
-            JOIN ciudades ON ciudades.id_ciudad = destinos.id_ciudad;
-        """)
-        destinos = cursor.fetchall()
-        for destino in destinos:
-            print(f"ID Destino: {destino[3]}, Ciudad: {destino[0]}, País: {destino[1]}, Precio: {destino[2]}")
-
-        if not destinos:
-            print("\nNo hay destinos registrados.")
-            return
 
-        print("\nA continuación se muestra el formulario para agregar una venta.")
+        print("A continuación se muestra el formulario para agregar una venta.")
 
         while True:
             dni_cliente = input("Ingrese el DNI del cliente (formato 111.111.111): ")
-            if re.match(r'^\d{3}\.\d{3}\.\d{3}$', dni_cliente):
+            if es_dni_valido(dni_cliente):
                 break
             print("DNI inválido. Debe ser en formato 111.111.111")
 
-        cursor.execute("SELECT * FROM clientes WHERE dni_cliente = %s;", (dni_cliente,))
-        cliente = cursor.fetchone()
+        cliente = obtener_cliente(dni_cliente, conexion)
 
         if not cliente:
             print("\nCliente no encontrado. Por favor, registre al cliente antes de agregar una venta.")
             return
-        elif cliente[6] == "Inactivo":
+        elif cliente.estado_de_cliente == "Inactivo":
             print("\nEl cliente está inactivo. No se puede realizar la venta.")
             return
 
         cantidad_de_tickets = int(input("\nIngrese la cantidad de tickets por comprar: "))
-        id_destino = int(input("\nIngrese el ID del destino: "))
 
-        cursor.execute("""
-            INSERT INTO ventas (fecha_de_compra, id_destino, cantidad_de_tickets, dni_cliente)
-            VALUES (NOW(), %s, %s, %s);
-        """, (id_destino, cantidad_de_tickets, dni_cliente))
-        conexion.commit()
+        destino = seleccionar_destino("comprar", conexion)
+        if not destino:
+            return
+
+        total_venta = cotizar(destino.id_destino, cantidad_de_tickets, conexion=conexion)
+        if total_venta is not None:
+            print(f"\nTotal a pagar por {cantidad_de_tickets} ticket(s): ${total_venta:,.2f}")
 
-        print("\nVenta agregada correctamente.")
+        id_venta = registrar_venta(dni_cliente, destino.id_destino, cantidad_de_tickets, conexion, total_venta)
+
+        print(f"\nVenta agregada correctamente. ID de venta: {id_venta}")
+
+    except VentaRechazadaError as e:
+        print(f"\nNo se puede realizar la venta: {e}")
 
     except Exception as e:
         print(f"\nError al agregar la venta: {e}")
 
     finally:
-        cursor.close()
         conexion.close()
 
 
+def cancelar_venta(dni_cliente, id_venta, motivo_arrepentimiento, conexion=None):
+    """
+    Anula una venta, devuelve sus asientos al cupo del destino, la pasa a anulada en los
+    resúmenes de ventas y registra el arrepentimiento en una sola transacción, sin interacción.
+
+    Args:
+        dni_cliente (str): DNI del cliente titular de la venta.
+        id_venta (int): ID de la venta a anular.
+        motivo_arrepentimiento (str): Motivo informado por el cliente.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Raises:
+        VentaRechazadaError: Si la venta no existe, no pertenece al cliente, no está activa o
+            ya pasó la ventana de anulación.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+
+    try:
+        # La ventana se comprueba en el mismo UPDATE, con el reloj de la base de datos.
+        cursor = ejecutar(conexion, "anular_venta", (id_venta, dni_cliente, MINUTOS_DE_ANULACION))
+
+        if cursor.rowcount != 1:
+            conexion.rollback()
+            venta = obtener_uno(conexion, "estado_de_venta", (id_venta, dni_cliente))
+            if not venta or venta[0] == "Anulada":
+                raise VentaRechazadaError(f"El cliente con DNI {dni_cliente} no tiene una venta activa con ID {id_venta}.")
+            raise VentaRechazadaError(f"Han pasado más de {MINUTOS_DE_ANULACION} minutos desde la compra.")
+
+        # Los asientos de la venta anulada vuelven al cupo del destino.
+        id_destino, cantidad_de_tickets = obtener_uno(conexion, "detalle_de_venta", (id_venta,))
+        liberar_asientos(conexion, id_destino, cantidad_de_tickets)
+        anular_en_resumen(conexion, dni_cliente, id_destino, cantidad_de_tickets)
+
+        ejecutar(conexion, "registrar_arrepentimiento", (motivo_arrepentimiento, id_venta))
+        conexion.commit()
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        if propia:
+            conexion.close()
+
+
 def anular_venta():
     """
     Permite anular una venta dentro de los primeros 2 minutos posteriores a su creación.
 
     Pasos:
-    - Se solicitan el DNI y el ID de la venta.
-    - Se verifica que la venta sea activa y reciente.
-    - Se actualiza el estado de la venta a 'Anulada'.
-    - Se registra el arrepentimiento en la tabla correspondiente.
+    - Se solicita el DNI y se muestran solo las ventas aún anulables (filtradas en la base).
+    - Se solicita el ID de la venta a anular.
+    - Se solicita el motivo del arrepentimiento.
+    - Se actualiza el estado de la venta a 'Anulada' y se registra el arrepentimiento,
+      ambos en la misma transacción.
     """
     try:
         conexion = obtener_conexion()
         cursor = conexion.cursor()
 
         dni_cliente = input("Ingrese su DNI para verificar si tiene ventas activas (formato 111.111.111): ")
-        cursor.execute("""
-            SELECT id_venta, fecha_de_compra, id_destino, cantidad_de_tickets 
-            FROM ventas 
-            WHERE dni_cliente = %s AND estado_de_venta = 'Activa';
-        """, (dni_cliente,))
-        ventas_activas = cursor.fetchall()
+        cursor.execute(_CONSULTA_ANULABLES, (dni_cliente, MINUTOS_DE_ANULACION))
+        ventas_activas = Venta.desde_filas(cursor.fetchall())
 
         if not ventas_activas:
-            print("No tiene ventas activas para anular.")
+            print(f"No tiene ventas realizadas en los últimos {MINUTOS_DE_ANULACION} minutos para anular.")
             return
 
         print("\nVentas activas:")
         for venta in ventas_activas:
-            print(f"ID Venta: {venta[0]}, Fecha de Compra: {venta[1]}, ID Destino: {venta[2]}, Tickets: {venta[3]}")
+            print(f"ID Venta: {venta.id_venta}, Fecha de Compra: {venta.fecha_de_compra}, ID Destino: {venta.id_destino}, Tickets: {venta.cantidad_de_tickets}")
 
         id_venta_anular = input("\nIngrese el ID de la venta que desea anular: ")
 
-        venta_seleccionada = next((venta for venta in ventas_activas if str(venta[0]) == id_venta_anular), None)
+        venta_seleccionada = next((venta for venta in ventas_activas if str(venta.id_venta) == id_venta_anular), None)
 
         if not venta_seleccionada:
             print("ID de venta no válido.")
             return
 
-        fecha_compra = venta_seleccionada[1]
-        tiempo_transcurrido = datetime.now() - fecha_compra
-
-        if tiempo_transcurrido > timedelta(minutes=2):
-            print("No se puede anular la venta, han pasado más de 2 minutos desde su compra.")
-            return
-
-        cursor.execute("UPDATE ventas SET estado_de_venta = 'Anulada' WHERE id_venta = %s;", (id_venta_anular,))
-        conexion.commit()
+        motivo_arrepentimiento = input("Ingrese el motivo del arrepentimiento: ")
+        cancelar_venta(dni_cliente, venta_seleccionada.id_venta, motivo_arrepentimiento, conexion)
         print("Venta anulada correctamente.")
 
-        motivo_arrepentimiento = input("Ingrese el motivo del arrepentimiento: ")
-        cursor.execute("""
-            INSERT INTO arrepentimientos (fecha_hora_arrepentimiento, motivo_arrepentimiento, id_venta)
-            VALUES (NOW(), %s, %s);
-        """, (motivo_arrepentimiento, id_venta_anular))
-        conexion.commit()
+    except VentaRechazadaError as e:
+        print(f"No se puede anular la venta: {e}")
 
     except Exception as e:
         print(f"Error al anular la venta: {e}")
@@ -177,13 +330,57 @@ def anular_venta():
         conexion.close()
 
 
+def _consulta_de_ventas(dni_cliente, estados, incluir_archivo=False):
+    """Arma la consulta de 'consultar_ventas' y sus parámetros."""
+    marcadores = ", ".join(["%s"] * len(estados))
+    sql = f"SELECT {Venta.COLUMNAS} FROM ventas WHERE dni_cliente = %s AND estado_de_venta IN ({marcadores})"
+    parametros = (dni_cliente, *estados)
+    if incluir_archivo:
+        sql += f" UNION ALL SELECT {Venta.COLUMNAS} FROM ventas_archivo WHERE dni_cliente = %s AND estado_de_venta IN ({marcadores})"
+        parametros *= 2
+    return sql + ";", parametros
+
+
+def consultar_ventas(dni_cliente, estado_de_venta, conexion=None, incluir_archivo=False):
+    """
+    Devuelve las ventas de un cliente con el estado indicado, sin interacción.
+
+    Args:
+        estado_de_venta (str | tuple[str]): 'Activa', 'Cerrada', 'Anulada' o varios de ellos.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+        incluir_archivo (bool): Si es True, también se buscan en las ventas archivadas
+            (ver 'archivo_ventas'), que de lo contrario no se leen.
+
+    Returns:
+        list[Venta]: Ventas del cliente con ese estado.
+    """
+    estados = (estado_de_venta,) if isinstance(estado_de_venta, str) else tuple(estado_de_venta)
+    sql, parametros = _consulta_de_ventas(dni_cliente, estados, incluir_archivo)
+
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+
+    try:
+        cursor.execute(sql, parametros)
+        return Venta.desde_filas(cursor.fetchall())
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+
 def listar_ventas():
     """
     Muestra un listado de las ventas activas o anuladas según indique el usuario.
 
     Pasos:
     - Solicita el DNI del cliente.
-    - Solicita si desea ver ventas 'activas' o 'anuladas'.
+    - Solicita si desea ver ventas 'activas' (incluye las cerradas, cuya ventana de anulación
+      ya venció) o 'anuladas'.
+    - Muestra los totales del cliente (desde los resúmenes de ventas).
+    - Pregunta si se incluyen las ventas archivadas.
     - Recupera y muestra las ventas correspondientes desde la base de datos.
     """
     try:
@@ -194,14 +391,19 @@ def listar_ventas():
         opcion = input("¿Desea listar las ventas activas o anuladas?: ").strip().lower()
 
         if opcion in ["activa", "activas"]:
-            cursor.execute("SELECT * FROM ventas WHERE estado_de_venta = 'Activa' AND dni_cliente = %s;", (dni_cliente,))
+            estados = ESTADOS_VIGENTES
         elif opcion in ["anulada", "anuladas"]:
-            cursor.execute("SELECT * FROM ventas WHERE estado_de_venta = 'Anulada' AND dni_cliente = %s;", (dni_cliente,))
+            estados = "Anulada"
         else:
             print("Opción no válida. Por favor, ingrese 'activa' o 'anulada'.")
             return
 
-        ventas = cursor.fetchall()
+        resumen = resumen_de_cliente(dni_cliente, conexion)
+        print(f"Ventas vigentes: {resumen['ventas_vigentes']} ({resumen['tickets_vigentes']} ticket(s)). "
+              f"Ventas anuladas: {resumen['ventas_anuladas']} ({resumen['tickets_anulados']} ticket(s)).")
+
+        incluir_archivo = input("¿Incluir las ventas archivadas? (s/n): ").strip().lower() in ["s", "si"]
+        ventas = consultar_ventas(dni_cliente, estados, conexion, incluir_archivo)
 
         if not ventas:
             print(f"No hay ventas {opcion}.")
@@ -209,7 +411,7 @@ def listar_ventas():
 
         print(f"A continuación se muestran las ventas {opcion}:")
         for venta in ventas:
-            print(f"ID Venta: {venta[0]}, Fecha de Compra: {venta[1]}, ID Destino: {venta[2]}, Cantidad de Tickets: {venta[3]}, Estado de venta: {venta[4]}, DNI Cliente: {venta[5]}")
+            print(f"ID Venta: {venta.id_venta}, Fecha de Compra: {venta.fecha_de_compra}, ID Destino: {venta.id_destino}, Cantidad de Tickets: {venta.cantidad_de_tickets}, Total: {venta.total_venta}, Estado de venta: {venta.estado_de_venta}, DNI Cliente: {venta.dni_cliente}")
 
     except Exception as e:
         print(f"Error al listar las ventas {opcion}: {e}")
@@ -217,3 +419,99 @@ def listar_ventas():
     finally:
         cursor.close()
         conexion.close()
+
+
+def _cerrar_ventas(cantidad):
+    """Sentencia que cierra 'cantidad' ventas por ID."""
+    # Se repite la condición de estado por si alguna venta se anuló después de leerlas.
+    return f"""
+        UPDATE ventas SET estado_de_venta = 'Cerrada'
+        WHERE id_venta IN ({", ".join(["%s"] * cantidad)}) AND estado_de_venta = 'Activa';
+    """
+
+
+def cerrar_ventas_vencidas(tamanio_lote=TAMANIO_LOTE_BARREDOR, conexion=None):
+    """
+    Marca como 'Cerrada' las ventas activas cuya ventana de anulación ya venció.
+
+    Trabaja por lotes de 'tamanio_lote' ventas, con una transacción corta por lote, para no
+    bloquear la tabla mientras se registran o anulan ventas.
+
+    Args:
+        tamanio_lote (int): Ventas cerradas por transacción.
+        conexion: Conexión abierta a reutilizar. Si se omite, se toma una del pool.
+
+    Returns:
+        int: Cantidad de ventas cerradas.
+    """
+    propia = conexion is None
+    if propia:
+        conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    cerradas = 0
+
+    try:
+        while True:
+            cursor.execute(_CONSULTA_VENCIDAS, (MINUTOS_DE_ANULACION, tamanio_lote))
+            ids = [fila[0] for fila in cursor.fetchall()]
+            if not ids:
+                break
+
+            cursor.execute(_cerrar_ventas(len(ids)), ids)
+            cerradas += cursor.rowcount
+            conexion.commit()
+
+            if len(ids) < tamanio_lote:
+                break
+    except Exception:
+        conexion.rollback()
+        raise
+    finally:
+        cursor.close()
+        if propia:
+            conexion.close()
+
+    return cerradas
+
+
+_barredor = None
+_detener_barredor = threading.Event()
+
+
+def _ejecutar_barredor(intervalo):
+    while not _detener_barredor.is_set():
+        conexion = obtener_conexion()
+        if conexion is not None:
+            try:
+                cerrar_ventas_vencidas(conexion=conexion)
+            except Exception:
+                registro.exception("Error al cerrar las ventas vencidas.")
+            finally:
+                conexion.close()
+        _detener_barredor.wait(intervalo)
+
+
+def iniciar_barredor(intervalo=INTERVALO_BARREDOR):
+    """
+    Inicia, en un hilo en segundo plano, el cierre periódico de ventas vencidas.
+    Si el barredor ya está en marcha, no hace nada.
+
+    Args:
+        intervalo (float): Segundos entre pasadas.
+    """
+    global _barredor
+    if _barredor is not None and _barredor.is_alive():
+        return
+    _detener_barredor.clear()
+    _barredor = threading.Thread(target=_ejecutar_barredor, args=(intervalo,),
+                                 name="barredor_de_ventas", daemon=True)
+    _barredor.start()
+
+
+def detener_barredor():
+    """Detiene el barredor de ventas vencidas y espera a que termine su pasada actual."""
+    global _barredor
+    _detener_barredor.set()
+    if _barredor is not None:
+        _barredor.join()
+        _barredor = None
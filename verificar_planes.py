@@ -0,0 +1,243 @@
+"""
+Módulo: verificar_planes.py
+
+Este módulo forma parte del sistema SkyRoute S.A. y detecta regresiones en los planes de
+ejecución: ejecuta EXPLAIN sobre cada consulta que emiten los módulos del sistema y falla si
+alguna recorre una tabla completa.
+
+Una consulta falla cuando el plan indica un recorrido completo ('type' = ALL) sobre una tabla
+que no tiene ningún índice aplicable. Con '--estricto' falla ante cualquier recorrido completo,
+aunque exista un índice que el optimizador haya descartado; conviene usarlo contra una base con
+volumen de datos representativo, ya que en tablas casi vacías MySQL suele preferir el recorrido.
+
+Con el motor SQLite se usa EXPLAIN QUERY PLAN: un paso 'SCAN tabla' sin índice equivale a un
+recorrido completo. Como SQLite no informa índices descartados, ahí ambos modos son equivalentes.
+
+Las consultas se toman del mismo SQL que ejecutan los módulos: todas las sentencias registradas
+en 'sentencias' y las constantes y funciones que arman el resto ('clientes._CONSULTA_LISTADO',
+'exportacion_ventas._consulta'...). Al cambiar una consulta se verifica la versión nueva.
+
+Las consultas que recorren tablas completas por diseño (los listados completos) se declaran
+con 'permite_recorrido=True' y se informan sin fallar.
+
+Uso:
+    python verificar_planes.py [--estricto]
+"""
+
+import argparse
+from collections import namedtuple
+
+import archivo_ventas
+import asientos
+import busqueda_clientes
+import cache_destinos
+import clientes
+import destinos
+import exportacion_ventas
+import importacion_clientes
+import importacion_destinos
+import importacion_ventas
+import purga
+import resumen_ventas
+import ventas
+from conexion_base_de_datos import obtener_conexion, motor_actual
+from sentencias import SENTENCIAS
+
+
+Consulta = namedtuple("Consulta", "origen sql parametros permite_recorrido")
+
+DNI_EJEMPLO = "111.111.111"
+DNIS_EJEMPLO = (DNI_EJEMPLO, "222.222.222")
+
+# Parámetros de ejemplo de cada sentencia registrada en 'sentencias'. Una sentencia registrada
+# sin parámetros de ejemplo se informa como falla, para que ninguna quede sin revisar.
+PARAMETROS_DE_SENTENCIAS = {
+    "cliente_por_dni": (DNI_EJEMPLO,),
+    "estado_de_cliente": (DNI_EJEMPLO,),
+    "actualizar_cliente_nombre": ("Nombre", DNI_EJEMPLO),
+    "actualizar_cliente_apellido": ("Apellido", DNI_EJEMPLO),
+    "actualizar_cliente_dni": ("222.222.222", DNI_EJEMPLO),
+    "actualizar_cliente_email": ("cliente@correo.com", DNI_EJEMPLO),
+    "actualizar_cliente_direccion": ("Calle 1", DNI_EJEMPLO),
+    "desactivar_cliente": (1,),
+    "eliminar_cliente": (DNI_EJEMPLO,),
+    "registrar_venta": (1, 100.0, 1, DNI_EJEMPLO, "1"),
+    "anular_venta": (1, DNI_EJEMPLO, 2),
+    "estado_de_venta": (1, DNI_EJEMPLO),
+    "detalle_de_venta": (1,),
+    "registrar_arrepentimiento": ("Motivo", 1),
+    "sumar_resumen_cliente": (DNI_EJEMPLO, 1, 0, 1, 0),
+    "sumar_resumen_destino": (1, 0, 1, 0, 1, 0),
+    "resumen_de_cliente": (DNI_EJEMPLO,),
+    "resumen_de_destino": (1,),
+    "reservar_asientos": (1, 1, 0, 1),
+    "liberar_asientos": (1, 1, 0),
+    "tramos_de_destino": (1,),
+    "purga_pendiente": ("destino", "1"),
+}
+
+
+def _consultas_de_sentencias():
+    """Una consulta por cada sentencia registrada en 'sentencias', con el mismo SQL que se ejecuta."""
+    return [Consulta(nombre, sql, PARAMETROS_DE_SENTENCIAS.get(nombre), False)
+            for nombre, sql in SENTENCIAS.items()]
+
+
+def _consultas_de_modulos():
+    """
+    Las consultas que los módulos ejecutan fuera de 'sentencias', tomadas de sus constantes y de
+    las funciones que las arman, con parámetros de ejemplo.
+    """
+    pagina, filtros = clientes._consulta_de_pagina("Activo", "111")
+    ventas_de_cliente, parametros_de_ventas = ventas._consulta_de_ventas(DNI_EJEMPLO, ("Activa", "Cerrada"),
+                                                                         incluir_archivo=True)
+    exportacion, parametros_de_exportacion = exportacion_ventas._consulta(
+        "2025-01-01", "2025-02-01", ["Activa", "Cerrada"], incluir_archivo=True)
+
+    consultas = [
+        # clientes.py
+        Consulta("listado_clientes", clientes._CONSULTA_LISTADO, (), True),
+        Consulta("iterar_clientes", pagina, (0, *filtros, 500), False),
+        Consulta("buscar_cliente", clientes._consulta_por_dnis(2), DNIS_EJEMPLO, False),
+        Consulta("registrar_telefonos", clientes._CONSULTA_TELEFONOS, (DNI_EJEMPLO,), False),
+        # busqueda_clientes.py
+        Consulta("actualizar_indice", busqueda_clientes._CONSULTA_PAGINA, (0, 5000), False),
+        Consulta("reindexar_cliente", busqueda_clientes._CONSULTA_CLIENTE, (DNI_EJEMPLO,), False),
+        # importacion_clientes.py
+        Consulta("importar_clientes", importacion_clientes._consulta_existentes(2), DNIS_EJEMPLO, False),
+        # importacion_ventas.py
+        Consulta("importar_ventas", importacion_ventas._consulta_estados(2), DNIS_EJEMPLO, False),
+        Consulta("importar_ventas", importacion_ventas._consulta_destinos(2), (1, 2), False),
+        Consulta("importar_ventas", importacion_ventas._consulta_purgas(2, 2), (*DNIS_EJEMPLO, "1", "2"), False),
+        # importacion_destinos.py
+        Consulta("importar_destinos", importacion_destinos._CONSULTA_CIUDADES, (), True),
+        Consulta("importar_destinos", importacion_destinos._consulta_ciudades_por_nombre(2), ("Salta", "Jujuy"), False),
+        # destinos.py / cache_destinos.py
+        Consulta("crear_destino", destinos._CONSULTA_CIUDAD, ("Córdoba", "Córdoba", "Argentina"), False),
+        Consulta("modificar_destino", destinos._ACTUALIZAR_CIUDAD.format(columna="costo_base"), (100.0, 1), False),
+        Consulta("obtener_catalogo", cache_destinos._CONSULTA_CATALOGO, (), True),
+        Consulta("obtener_destino", cache_destinos._CONSULTA_DESTINO, (1,), False),
+        # ventas.py
+        Consulta("anular_venta", ventas._CONSULTA_ANULABLES, (DNI_EJEMPLO, 2), False),
+        Consulta("consultar_ventas", ventas_de_cliente, parametros_de_ventas, False),
+        Consulta("cerrar_ventas_vencidas", ventas._CONSULTA_VENCIDAS, (2, 1000), False),
+        Consulta("cerrar_ventas_vencidas", ventas._cerrar_ventas(2), (1, 2), False),
+        # archivo_ventas.py
+        Consulta("archivar_ventas", archivo_ventas._CONSULTA_RANGO, (30, 365), False),
+        Consulta("archivar_ventas", archivo_ventas._CONSULTA_LOTE, ("Cerrada", 365, 1000), False),
+        Consulta("archivar_ventas", archivo_ventas._consulta_arrepentimientos(2), (1, 2), False),
+        Consulta("actualizar_dni_archivado", archivo_ventas._ACTUALIZAR_DNI, ("222.222.222", DNI_EJEMPLO), False),
+        # asientos.py
+        Consulta("asientos_disponibles", asientos._CONSULTA_DISPONIBLES, (1,), False),
+        # purga.py
+        Consulta("purgar_destino", purga._BORRAR_CIUDAD, (1, 1), False),
+        # resumen_ventas.py (recálculo completo: recorre las tablas por diseño)
+        Consulta("verificar_resumenes", resumen_ventas._CALCULO_CLIENTES, (), True),
+        Consulta("verificar_resumenes", resumen_ventas._CALCULO_DESTINOS, (), True),
+        # exportacion_ventas.py
+        Consulta("exportar_ventas", exportacion, parametros_de_exportacion, False),
+    ]
+    for tabla_ventas, tabla_arrepentimientos in purga._TABLAS_DE_VENTAS:
+        consultas += [
+            Consulta("purgar_cliente", purga._consulta_lote(tabla_ventas, "dni_cliente"), (DNI_EJEMPLO, 500), False),
+            Consulta("purgar_destino", purga._consulta_lote(tabla_ventas, "id_destino"), (1, 500), False),
+            Consulta("purgar_ventas", purga._borrar_por_venta(tabla_arrepentimientos, 2), (1, 2), False),
+        ]
+    return consultas
+
+
+CONSULTAS = _consultas_de_sentencias() + _consultas_de_modulos()
+
+
+def analizar_plan(cursor, consulta):
+    """
+    Ejecuta EXPLAIN sobre una consulta.
+
+    Returns:
+        list[dict]: Una fila del plan por tabla accedida, con las columnas de EXPLAIN de MySQL
+        ('table', 'type', 'possible_keys'...).
+    """
+    if motor_actual() == "sqlite":
+        return _analizar_plan_sqlite(cursor, consulta)
+    cursor.execute("EXPLAIN " + consulta.sql, consulta.parametros)
+    columnas = [descripcion[0] for descripcion in cursor.description]
+    return [dict(zip(columnas, fila)) for fila in cursor.fetchall()]
+
+
+def _analizar_plan_sqlite(cursor, consulta):
+    """Traduce la salida de EXPLAIN QUERY PLAN de SQLite al formato de EXPLAIN de MySQL."""
+    cursor.execute("EXPLAIN QUERY PLAN " + consulta.sql, consulta.parametros)
+    derivadas = set()
+    plan = []
+    for fila in cursor.fetchall():
+        partes = fila[-1].split()
+        if partes[0] in ("CO-ROUTINE", "MATERIALIZE"):
+            derivadas.add(partes[1])
+        elif partes[0] in ("SCAN", "SEARCH") and len(partes) > 1:
+            tabla = partes[1]
+            if tabla in derivadas or tabla.startswith("("):
+                tabla = f"<{tabla}>"
+            recorrido = partes[0] == "SCAN" and "INDEX" not in partes
+            plan.append({"table": tabla, "type": "ALL" if recorrido else "ref", "possible_keys": None})
+    return plan
+
+
+def recorridos_completos(plan, estricto=False):
+    """
+    Devuelve las tablas del plan que se recorren completas.
+    Las tablas derivadas ('<derived2>', etc.) se ignoran: su costo ya se refleja en la subconsulta.
+    """
+    tablas = []
+    for paso in plan:
+        tabla = paso.get("table") or ""
+        if paso.get("type") != "ALL" or tabla.startswith("<"):
+            continue
+        if estricto or not paso.get("possible_keys"):
+            tablas.append(tabla)
+    return tablas
+
+
+def verificar_planes(consultas=CONSULTAS, estricto=False):
+    """
+    Revisa el plan de ejecución de cada consulta e informa los recorridos completos.
+
+    Returns:
+        list[tuple]: (origen, tablas, sql) de cada consulta que no supera la verificación.
+    """
+    conexion = obtener_conexion()
+    cursor = conexion.cursor()
+    fallas = []
+
+    try:
+        for consulta in consultas:
+            sql = " ".join(consulta.sql.split())
+            if consulta.parametros is None:
+                print(f"FALLA     {consulta.origen}: sin parámetros de ejemplo en PARAMETROS_DE_SENTENCIAS")
+                fallas.append((consulta.origen, [], sql))
+                continue
+            tablas = recorridos_completos(analizar_plan(cursor, consulta), estricto)
+            if not tablas:
+                print(f"OK        {consulta.origen}: {sql[:70]}")
+            elif consulta.permite_recorrido:
+                print(f"PERMITIDO {consulta.origen}: recorrido completo de {', '.join(tablas)}")
+            else:
+                print(f"FALLA     {consulta.origen}: recorrido completo de {', '.join(tablas)}")
+                fallas.append((consulta.origen, tablas, sql))
+    finally:
+        cursor.close()
+        conexion.close()
+
+    return fallas
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Verifica que ninguna consulta recorra tablas completas.")
+    parser.add_argument("--estricto", action="store_true",
+                        help="Falla ante cualquier recorrido completo, aunque exista un índice aplicable.")
+    argumentos = parser.parse_args()
+
+    fallas = verificar_planes(estricto=argumentos.estricto)
+    if fallas:
+        print(f"\n{len(fallas)} consulta(s) recorren tablas completas.")
+        raise SystemExit(1)
+    print("\nNinguna consulta recorre tablas completas.")